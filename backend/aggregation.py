@@ -0,0 +1,125 @@
+"""
+우타이테/아티스트 통계 집계
+부른 기록을 한 번만 훑는 group-by로 모든 우타이테와 아티스트의 통계를 함께 계산
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from models import Artist, ArtistWithStats, Performance, SongMaster, Utaite, UtaiteWithStats
+
+def _thumbnail(video_id: str) -> str:
+    return f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
+
+class _Bounds:
+    """정렬 키 기준 최초/최신 부른 기록 추적"""
+    __slots__ = ('first_key', 'first', 'latest_key', 'latest')
+
+    def __init__(self):
+        self.first_key = self.latest_key = None
+        self.first: Optional[Performance] = None
+        self.latest: Optional[Performance] = None
+
+    def update(self, key: Tuple, perf: Performance):
+        if self.first_key is None or key < self.first_key:
+            self.first_key, self.first = key, perf
+        if self.latest_key is None or key > self.latest_key:
+            self.latest_key, self.latest = key, perf
+
+    def merge(self, other: '_Bounds'):
+        if other.first_key is not None:
+            self.update(other.first_key, other.first)
+            self.update(other.latest_key, other.latest)
+
+def aggregate_stats(performances: Iterable[Performance], songs_master: List[SongMaster],
+                    artists: List[Artist], utaites: List[Utaite]) -> Tuple[List[ArtistWithStats], List[UtaiteWithStats]]:
+    """아티스트/우타이테 통계를 한 번에 계산 - O(부른 기록 + 곡 + 아티스트 + 우타이테)
+
+    동점 처리(같은 날짜의 최초/최신 기록, 같은 횟수의 인기 곡 순서)는
+    곡 마스터 순서와 부른 기록 순서를 정렬 키에 넣어 기존 엔드포인트 결과와 같게 맞춘다.
+    """
+    song_index = {song.id: i for i, song in enumerate(songs_master)}
+
+    # 부른 기록 1회 순회
+    song_counts: Dict[str, int] = defaultdict(int)
+    song_bounds: Dict[str, _Bounds] = defaultdict(_Bounds)
+    utaite_counts: Dict[str, int] = defaultdict(int)
+    utaite_bounds: Dict[str, _Bounds] = defaultdict(_Bounds)
+    utaite_songs: Dict[str, set] = defaultdict(set)
+    for perf_index, perf in enumerate(performances):
+        song_counts[perf.song_master_id] += 1
+        song_position = song_index.get(perf.song_master_id)
+        if song_position is not None:
+            song_bounds[perf.song_master_id].update((perf.date, song_position, perf_index), perf)
+
+        utaite_counts[perf.utaite_id] += 1
+        utaite_bounds[perf.utaite_id].update((perf.date, perf_index), perf)
+        utaite_songs[perf.utaite_id].add(perf.song_master_id)
+
+    # 아티스트 이름 -> 곡 (기존 구조 사용 - artist name으로 매칭)
+    songs_by_artist_name: Dict[str, List[SongMaster]] = defaultdict(list)
+    for song in songs_master:
+        songs_by_artist_name[song.artist.get('original')].append(song)
+
+    songs_dict = {song.id: song for song in songs_master}
+
+    def perf_summary(perf: Performance) -> dict:
+        song = songs_dict.get(perf.song_master_id)
+        return {
+            "date": perf.date,
+            "thumbnail": _thumbnail(perf.video_id),
+            "song_title": song.titles.get('original', '') if song else ''
+        }
+
+    artist_stats = []
+    for artist in artists:
+        artist_songs = songs_by_artist_name.get(artist.names.get('original', ''), [])
+        bounds = _Bounds()
+        total = 0
+        top_songs = []
+        for song in artist_songs:
+            count = song_counts.get(song.id, 0)
+            if count > 0:
+                total += count
+                bounds.merge(song_bounds[song.id])
+                top_songs.append({
+                    "id": song.id,
+                    "title": song.titles.get('original', ''),
+                    "performance_count": count
+                })
+        top_songs.sort(key=lambda x: x['performance_count'], reverse=True)
+
+        artist_stats.append(ArtistWithStats(
+            id=artist.id,
+            name=artist.names.get('korean') or artist.names.get('original', ''),
+            names=artist.names,
+            song_count=len(artist_songs),
+            total_performances=total,
+            latest_performance=perf_summary(bounds.latest) if bounds.latest else None,
+            first_performance=perf_summary(bounds.first) if bounds.first else None,
+            top_songs=top_songs
+        ))
+    artist_stats.sort(key=lambda x: x.total_performances, reverse=True)
+
+    utaite_stats = []
+    for utaite in utaites:
+        bounds = utaite_bounds.get(utaite.id)
+        unique_songs = utaite_songs.get(utaite.id, set())
+        unique_artists = set()
+        for song_id in unique_songs:
+            song = songs_dict.get(song_id)
+            if song and song.artist.get('original'):
+                unique_artists.add(song.artist.get('original'))
+
+        utaite_stats.append(UtaiteWithStats(
+            id=utaite.id,
+            name=utaite.names.get('korean') or utaite.names.get('original', ''),
+            names=utaite.names,
+            performance_count=utaite_counts.get(utaite.id, 0),
+            unique_song_count=len(unique_songs),
+            unique_artist_count=len(unique_artists),
+            first_performance=bounds.first.date if bounds else None,
+            latest_performance=bounds.latest.date if bounds else None,
+            latest_thumbnail=_thumbnail(bounds.latest.video_id) if bounds else None
+        ))
+    utaite_stats.sort(key=lambda x: x.performance_count, reverse=True)
+
+    return artist_stats, utaite_stats
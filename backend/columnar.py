@@ -0,0 +1,232 @@
+"""
+부른 기록 컬럼 저장소
+Performance 객체 대신 정수 코드 배열(array)과 문자열 테이블로 부른 기록을 보관해 행당 메모리를 줄이고,
+조회 경로의 필터(우타이테/곡/비디오), 날짜 정렬, 집계를 압축 배열 위에서 수행한다.
+응답에 필요한 행만 PerformanceRow(또는 Performance)로 꺼낸다.
+"""
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from itertools import chain, compress
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from models import Performance, time_to_seconds
+
+class StringTable:
+    """문자열 <-> 정수 코드 인터닝 테이블 (추가 전용)"""
+    __slots__ = ('values', 'codes')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+def date_to_epoch(date: str) -> int:
+    """ISO 날짜 문자열 -> epoch 마이크로초 (시간대 없는 값은 UTC로 간주, 해석할 수 없으면 0)"""
+    try:
+        parsed = datetime.fromisoformat(date.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+class PerformanceRow(NamedTuple):
+    """컬럼 저장소에서 꺼낸 부른 기록 한 건 (Performance와 같은 필드 이름의 읽기 전용 레코드)"""
+    id: str
+    song_master_id: str
+    utaite_id: str
+    video_id: str
+    start_time: str
+    start_time_seconds: int
+    date: str
+
+class PerformanceColumns:
+    """부른 기록 컬럼 저장소
+
+    행 번호 i의 부른 기록은 각 배열의 i번째 값으로 표현된다.
+    곡/우타이테/비디오/날짜/시작 시간 문자열은 테이블에 한 번만 저장하고 배열에는 코드만 둔다.
+    부른 기록 ID는 하나의 UTF-8 바이트열에 이어 붙이고 오프셋 배열로 자른다.
+    우타이테/곡/비디오 필터는 처음 쓸 때 코드별 행 번호 배열(postings)을 만들어 해당 행만 훑는다.
+
+    캐시된 저장소는 읽는 쪽과 공유되므로 고치지 않고, 추가는 with_added로 새 저장소를 만든다.
+    """
+
+    def __init__(self):
+        self.songs = StringTable()
+        self.utaites = StringTable()
+        self.videos = StringTable()
+        self.dates = StringTable()  # 원본 날짜 문자열 (같은 방송의 기록은 날짜를 공유)
+        self.start_times = StringTable()
+        self._date_epochs = array('q')  # dates 코드 -> epoch 마이크로초
+
+        self.song = array('i')
+        self.utaite = array('i')
+        self.video = array('i')
+        self.start_seconds = array('i')
+        self.date = array('q')  # 행별 epoch 마이크로초 (정렬용)
+        self.date_code = array('i')
+        self.start_time_code = array('i')
+
+        self._id_bytes = bytearray()
+        self._id_offsets = array('Q', [0])
+        self._postings: Dict[str, Dict[int, array]] = {}  # 코드 컬럼 이름 -> 코드 -> 행 번호
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> 'PerformanceColumns':
+        """부른 기록 원본 레코드(스트리밍 가능)에서 컬럼 저장소 생성"""
+        columns = cls()
+        for record in records:
+            columns.append(record)
+        return columns
+
+    def append(self, record: dict):
+        """원본 레코드 한 건 추가 (Performance 필드 이름을 키로 사용)"""
+        date_code = self.dates.intern(record['date'])
+        if date_code == len(self._date_epochs):
+            self._date_epochs.append(date_to_epoch(record['date']))
+
+        self.song.append(self.songs.intern(record['song_master_id']))
+        self.utaite.append(self.utaites.intern(record.get('utaite_id', '')))
+        self.video.append(self.videos.intern(record['video_id']))
+        self.start_seconds.append(time_to_seconds(record['start_time']))
+        self.start_time_code.append(self.start_times.intern(record['start_time']))
+        self.date.append(self._date_epochs[date_code])
+        self.date_code.append(date_code)
+
+        self._id_bytes += record['id'].encode('utf-8')
+        self._id_offsets.append(len(self._id_bytes))
+
+    def with_added(self, records: Iterable[dict]) -> 'PerformanceColumns':
+        """레코드를 추가한 새 저장소 (행 배열은 복사하고, 추가 전용인 문자열 테이블은 공유)
+
+        이전 저장소의 행은 새 코드를 참조하지 않으므로 테이블이 늘어나도 이전 스냅샷의 결과는 그대로다.
+        """
+        columns = object.__new__(PerformanceColumns)
+        for name in ('songs', 'utaites', 'videos', 'dates', 'start_times', '_date_epochs'):
+            setattr(columns, name, getattr(self, name))
+        for name in ('song', 'utaite', 'video', 'start_seconds', 'date', 'date_code', 'start_time_code', '_id_offsets'):
+            column = getattr(self, name)
+            setattr(columns, name, array(column.typecode, column))
+        columns._id_bytes = bytearray(self._id_bytes)
+        start = len(self)
+        for record in records:
+            columns.append(record)
+
+        # 이미 만든 postings는 추가된 행이 있는 코드만 새 배열로 만들고 나머지는 공유한다
+        columns._postings = {}
+        for name, postings in list(self._postings.items()):
+            added: Dict[int, List[int]] = defaultdict(list)
+            column = getattr(columns, name)
+            for row in range(start, len(columns)):
+                added[column[row]].append(row)
+            columns._postings[name] = {**postings, **{code: array('i', chain(postings.get(code, ()), rows)) for code, rows in added.items()}}
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.song)
+
+    # === Row Access ===
+    def perf_id(self, row: int) -> str:
+        return self._id_bytes[self._id_offsets[row]:self._id_offsets[row + 1]].decode('utf-8')
+
+    def row(self, row: int) -> PerformanceRow:
+        return PerformanceRow(
+            self.perf_id(row),
+            self.songs[self.song[row]],
+            self.utaites[self.utaite[row]],
+            self.videos[self.video[row]],
+            self.start_times[self.start_time_code[row]],
+            self.start_seconds[row],
+            self.dates[self.date_code[row]]
+        )
+
+    def iter_rows(self, rows: Optional[Iterable[int]] = None) -> Iterator[PerformanceRow]:
+        """행 번호 순서대로 레코드 꺼내기 (rows가 없으면 전체)"""
+        return map(self.row, range(len(self)) if rows is None else rows)
+
+    def performance(self, row: int) -> Performance:
+        """행 하나를 Performance 모델로 복원"""
+        return Performance(**self.row(row)._asdict())
+
+    # === Filters / Sorts ===
+    def _posting(self, name: str) -> Dict[int, array]:
+        """코드 컬럼의 코드별 행 번호 (처음 쓸 때 한 번 구축)"""
+        postings = self._postings.get(name)
+        if postings is None:
+            groups: Dict[int, List[int]] = defaultdict(list)
+            for row, code in enumerate(getattr(self, name)):
+                groups[code].append(row)
+            postings = self._postings[name] = {code: array('i', rows) for code, rows in groups.items()}
+        return postings
+
+    def rows(self, utaite_ids: Optional[Iterable[str]] = None, song_ids: Optional[Iterable[str]] = None,
+             video_id: Optional[str] = None) -> List[int]:
+        """조건에 맞는 행 번호 (여러 조건은 AND, 행 순서 유지)
+
+        첫 조건은 postings로 후보 행을 고르고, 나머지 조건은 후보 행의 코드만 비교한다.
+        """
+        conditions = []
+        if utaite_ids is not None:
+            conditions.append(('utaite', {self.utaites.code(utaite_id) for utaite_id in utaite_ids}))
+        if song_ids is not None:
+            conditions.append(('song', {self.songs.code(song_id) for song_id in song_ids}))
+        if video_id is not None:
+            conditions.append(('video', {self.videos.code(video_id)}))
+
+        result = None
+        for name, codes in conditions:
+            # 존재하지 않는 값이면 코드가 None이라 어떤 행과도 맞지 않는다
+            codes.discard(None)
+            if not codes:
+                return []
+            if result is None:
+                postings = self._posting(name)
+                result = sorted(chain.from_iterable(postings.get(code, ()) for code in codes))
+            else:
+                matches = next(iter(codes)).__eq__ if len(codes) == 1 else codes.__contains__
+                result = list(compress(result, map(matches, map(getattr(self, name).__getitem__, result))))
+        return list(range(len(self))) if result is None else result
+
+    def sort_rows(self, rows: Iterable[int], newest_first: bool = False) -> List[int]:
+        """날짜(epoch) 순 정렬 (같은 날짜는 행 순서 유지)"""
+        return sorted(rows, key=self.date.__getitem__, reverse=newest_first)
+
+    # === Aggregations ===
+    def counts_by_song(self) -> Dict[str, int]:
+        return {self.songs[code]: count for code, count in Counter(self.song).items()}
+
+    def counts_by_utaite(self) -> Dict[str, int]:
+        return {self.utaites[code]: count for code, count in Counter(self.utaite).items()}
+
+    def date_bounds_by_utaite(self) -> Dict[str, Tuple[str, str]]:
+        """우타이테별 (최초, 최신) 날짜 원본 문자열"""
+        first: Dict[int, int] = {}
+        latest: Dict[int, int] = {}
+        epochs = self._date_epochs
+        for utaite, date_code in zip(self.utaite, self.date_code):
+            current = first.get(utaite)
+            if current is None:
+                first[utaite] = latest[utaite] = date_code
+                continue
+            epoch = epochs[date_code]
+            if epoch < epochs[current]:
+                first[utaite] = date_code
+            elif epoch > epochs[latest[utaite]]:
+                latest[utaite] = date_code
+        return {self.utaites[code]: (self.dates[first[code]], self.dates[latest[code]]) for code in first}
@@ -1,5 +1,10 @@
 import requests
 import os
+import time
+import random
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional
 from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv
 
@@ -11,40 +16,120 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 if not YOUTUBE_API_KEY:
     raise ValueError("YOUTUBE_API_KEY가 환경변수에 설정되지 않았습니다. .env 파일을 확인해주세요.")
 
-def find_comment(video_id: str, max_pages=20):
-    """유튜브 비디오의 댓글을 가져오는 함수"""
-    comments = []
-    page_token = None
-    base_url = "https://www.googleapis.com/youtube/v3/commentThreads" 
-    
-    for _ in range(max_pages):
-        params = {
-            "part": "snippet",
-            "videoId": video_id,
-            "key": YOUTUBE_API_KEY,
-            "textFormat": "plainText",
-            "maxResults": 100,
-        }
-        if page_token:
-            params["pageToken"] = page_token
-
-        response = requests.get(base_url, params=params)    
-        if response.status_code == 200:
-            data = response.json()
-            if "error" in data:
-                raise Exception(data["error"]["message"])
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태코드 (일시적 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+@dataclass
+class CrawlStats:
+    """댓글 크롤링 통계"""
+    pages: int = 0
+    retries: int = 0
+    elapsed: float = 0.0  # seconds
+
+@dataclass
+class CommentCrawlResult:
+    """댓글 크롤링 결과 (부분 결과 포함)"""
+    comments: List[str] = field(default_factory=list)
+    next_page_token: Optional[str] = None  # 이어받기용 토큰 (완료 시 None)
+    completed: bool = False
+    error: Optional[str] = None
+    stats: CrawlStats = field(default_factory=CrawlStats)
+
+class CommentCrawlError(Exception):
+    """재시도 후에도 실패한 크롤링 오류 (지금까지 받은 결과를 담고 있음)"""
+    def __init__(self, message: str, result: CommentCrawlResult):
+        super().__init__(message)
+        self.result = result
+
+class _RetryableError(Exception):
+    """재시도 가능한 일시적 오류"""
+
+def _backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """지수 백오프 + full jitter 대기 시간 계산"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+def _fetch_comment_page(params: dict, timeout: float) -> dict:
+    """댓글 한 페이지 요청 (일시적 오류는 _RetryableError로 구분)"""
+    try:
+        response = requests.get("https://www.googleapis.com/youtube/v3/commentThreads", params=params, timeout=timeout)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        raise _RetryableError(f"네트워크 오류: {e}")
+
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise _RetryableError(f"YouTube API 오류: {response.status_code}")
+    if response.status_code != 200:
+        raise Exception(f"YouTube API 오류: {response.status_code}")
+
+    data = response.json()
+    if "error" in data:
+        raise Exception(data["error"]["message"])
+    return data
+
+def crawl_comments(video_id: str, max_pages=20, page_token: Optional[str] = None,
+                   max_retries=5, base_delay=1.0, max_delay=30.0, timeout=10.0,
+                   allow_partial=False) -> CommentCrawlResult:
+    """유튜브 비디오 댓글 크롤링 (재시도/이어받기/부분 결과 지원)
+
+    일시적 오류(5xx, 429, 네트워크)는 페이지 단위로 지수 백오프 재시도한다.
+    재시도를 모두 소진하거나 복구 불가능한 오류가 나면 지금까지 받은 댓글과
+    다음 페이지 토큰을 담아 allow_partial이면 반환, 아니면 CommentCrawlError로 전달한다.
+    반환된 next_page_token을 page_token으로 넘기면 중단된 페이지부터 이어서 받는다.
+    """
+    result = CommentCrawlResult(next_page_token=page_token)
+    started = time.monotonic()
+
+    try:
+        for _ in range(max_pages):
+            params = {
+                "part": "snippet",
+                "videoId": video_id,
+                "key": YOUTUBE_API_KEY,
+                "textFormat": "plainText",
+                "maxResults": 100,
+            }
+            if result.next_page_token:
+                params["pageToken"] = result.next_page_token
+
+            attempt = 0
+            while True:
+                try:
+                    data = _fetch_comment_page(params, timeout)
+                    break
+                except _RetryableError as e:
+                    if attempt >= max_retries:
+                        raise Exception(f"{e} (재시도 {max_retries}회 초과)")
+                    delay = _backoff_delay(attempt, base_delay, max_delay)
+                    logger.warning(f"댓글 페이지 요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+                    time.sleep(delay)
+                    attempt += 1
+                    result.stats.retries += 1
 
             for item in data.get("items", []):
                 comment = item["snippet"]["topLevelComment"]["snippet"]["textDisplay"]
-                comments.append(comment)
+                result.comments.append(comment)
+            result.stats.pages += 1
 
-            page_token = data.get("nextPageToken")
-            if not page_token:
+            result.next_page_token = data.get("nextPageToken")
+            if not result.next_page_token:
+                result.completed = True
                 break
-        else:
-            raise Exception(f"YouTube API 오류: {response.status_code}")
-    
-    return comments
+    except Exception as e:
+        result.error = str(e)
+        result.stats.elapsed = time.monotonic() - started
+        logger.error(f"댓글 크롤링 중단: {video_id} - {result.stats.pages}페이지, 댓글 {len(result.comments)}개 확보 ({e})")
+        if not allow_partial:
+            raise CommentCrawlError(str(e), result) from e
+        return result
+
+    result.stats.elapsed = time.monotonic() - started
+    logger.info(f"댓글 크롤링 완료: {video_id} - {result.stats.pages}페이지, 재시도 {result.stats.retries}회, {result.stats.elapsed:.2f}초")
+    return result
+
+def find_comment(video_id: str, max_pages=20):
+    """유튜브 비디오의 댓글을 가져오는 함수"""
+    return crawl_comments(video_id, max_pages=max_pages).comments
 
 def extract_video_id(url): 
     """유튜브 URL에서 비디오 ID를 추출하는 함수"""
@@ -5,18 +5,58 @@ PostgreSQL 이관을 고려한 설계
 import json
 import os
 import logging
-from typing import List, Dict, Optional
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 from models import *
+from aggregation import aggregate_stats
+from columnar import PerformanceColumns, PerformanceRow, date_to_epoch
+from json_stream import iter_json_records
+from pydantic import ValidationError
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내부 락만 사용
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# 통계 중 날짜 필드 (비교는 epoch 기준)
+DATE_STAT_FIELDS = ('first_appearance', 'latest_appearance')
+
+_PERFORMANCE_FIELDS_SET = frozenset(['id', 'song_master_id', 'utaite_id', 'video_id', 'start_time', 'start_time_seconds', 'date'])
+
 class DataManager:
     """데이터 파일 관리 클래스"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", journal_compact_threshold: int = 1000, trusted_load: bool = False):
         self.data_dir = data_dir
         self.ensure_data_dir()
+        
+        # trusted_load면 부른 기록을 model_construct로 검증 없이 만든다 (전체 검증은 validate_data).
+        # scripts/benchmark_load.py 기준 pydantic 2.11/2.14 모두 model_construct가 Rust 검증보다 느려 기본은 검증 로드
+        self.trusted_load = trusted_load
+        
+        # 부른 기록은 스냅샷(songs.json) + 추가 전용 저널로 저장하고, 저널이 이 줄 수를 넘으면 스냅샷으로 합친다
+        self.journal_compact_threshold = journal_compact_threshold
+        self._journal_rows = 0
+        
+        # 프로세스 레벨 로드 캐시: 파일 경로 -> (시그니처, 로드된 모델 리스트)
+        # 시그니처는 (mtime_ns, size) + 내부 쓰기 버전이라 다른 프로세스가 파일을 고쳐도 감지된다
+        self._cache: Dict[str, Tuple[Tuple, List[Any]]] = {}
+        self._write_versions: Dict[str, int] = {}
+        self._cache_lock = threading.RLock()
+        
+        # 로드 결과에서 파생된 인덱스 캐시: 키 -> (원본 파일 시그니처들, 값)
+        self._derived_cache: Dict[str, Tuple[Tuple, Any]] = {}
+        
+        # 쓰기 락: 스레드 간 RLock + 프로세스 간 flock (읽기는 락을 잡지 않음)
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._lock_fd: Optional[int] = None
     
     def ensure_data_dir(self):
         """데이터 디렉토리 생성"""
@@ -44,156 +84,502 @@ class DataManager:
     def performances_file(self) -> str:
         return os.path.join(self.data_dir, "songs.json")  # 기존 파일명 유지
     
+    @property
+    def performances_journal_file(self) -> str:
+        return os.path.join(self.data_dir, "songs.journal.jsonl")
+    
+    @property
+    def lock_file(self) -> str:
+        return os.path.join(self.data_dir, ".write.lock")
+    
+    @property
+    def _performance_sources(self) -> List[str]:
+        return [self.performances_file, self.performances_journal_file]
+    
+    # === Write Lock ===
+    @contextmanager
+    def write_lock(self):
+        """프로세스 간 쓰기 락 - 읽기-수정-쓰기 전체를 감싼다 (같은 스레드에서 재진입 가능)
+        
+        여러 uvicorn 워커가 같은 데이터 디렉토리를 쓸 때 마지막 쓰기가 앞선 쓰기를 덮지 않게 한다.
+        읽기는 락을 잡지 않는다: 파일은 원자적으로 교체되고 캐시는 완성된 결과로만 바뀌므로,
+        읽는 쪽은 쓰기를 기다리지 않고 직전 커밋의 스냅샷을 본다.
+        """
+        with self._write_lock:
+            if self._write_depth == 0:
+                fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._lock_fd = fd
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    fd, self._lock_fd = self._lock_fd, None
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+    
+    # === Cache ===
+    def _file_signature(self, path: str) -> Optional[Tuple[int, int]]:
+        """캐시 무효화용 파일 시그니처 (없으면 None)"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _source_signature(self, path: str) -> Tuple:
+        """파일 시그니처 + 내부 쓰기 버전"""
+        return (self._file_signature(path), self._write_versions.get(path, 0))
+    
+    def _signature(self, paths: List[str]) -> Tuple:
+        """여러 파일의 시그니처 묶음"""
+        return tuple(self._source_signature(path) for path in paths)
+    
+    def _load_cached(self, path: str, reader: Callable[[], List[Any]], extra_paths: List[str] = ()) -> List[Any]:
+        """파일이 바뀌지 않았으면 캐시된 결과를, 바뀌었으면 다시 읽어서 반환
+        
+        반환 리스트는 복사본이지만 안의 모델 객체는 캐시와 공유되므로,
+        객체를 수정했다면 반드시 save_*로 저장해야 한다.
+        """
+        with self._cache_lock:
+            signature = self._signature([path, *extra_paths])
+            cached = self._cache.get(path)
+            if cached and cached[0] == signature:
+                return list(cached[1])
+        
+        # 파싱은 락 밖에서 수행 (stat 이후 파일이 바뀌면 다음 조회에서 시그니처 불일치로 다시 읽음)
+        items = reader()
+        with self._cache_lock:
+            self._cache[path] = (signature, items)
+        return list(items)
+    
+    def _derived(self, key: str, paths: List[str], builder: Callable[[], Any]) -> Any:
+        """원본 파일들이 바뀌지 않았으면 캐시된 파생 값을, 바뀌었으면 다시 만들어서 반환"""
+        with self._cache_lock:
+            signature = self._signature(paths)
+            cached = self._derived_cache.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+        
+        value = builder()
+        with self._cache_lock:
+            self._derived_cache[key] = (signature, value)
+        return value
+    
+    def _invalidate(self, path: str):
+        """내부 쓰기 후 캐시 무효화"""
+        with self._cache_lock:
+            self._write_versions[path] = self._write_versions.get(path, 0) + 1
+            self._cache.pop(path, None)
+    
+    def clear_cache(self):
+        """전체 캐시 비우기"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._derived_cache.clear()
+    
     # === Load Methods ===
-    def load_utaites(self) -> List[Utaite]:
-        """우타이테 마스터 로드"""
-        if not os.path.exists(self.utaites_file):
-            return []
+    def iter_records(self, path: str) -> Iterator[dict]:
+        """데이터 파일 레코드를 하나씩 반환 (파일 전체를 메모리에 올리지 않음)"""
+        if not os.path.exists(path):
+            return iter(())
+        return iter_json_records(path)
+    
+    def _read_models(self, path: str, model: type, label: str) -> list:
+        # 마스터 모델은 필드가 적어 Rust 검증이 model_construct보다 빠르므로 신뢰 로드에서도 검증한다
         try:
-            with open(self.utaites_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [Utaite(**item) for item in data]
+            return [model(**item) for item in self.iter_records(path)]
         except Exception as e:
-            logger.error(f"우타이테 로드 실패: {e}")
+            logger.error(f"{label} 로드 실패: {e}")
             return []
     
+    def load_utaites(self) -> List[Utaite]:
+        """우타이테 마스터 로드"""
+        return self._load_cached(self.utaites_file, self._read_utaites)
+    
+    def _read_utaites(self) -> List[Utaite]:
+        return self._read_models(self.utaites_file, Utaite, "우타이테")
+    
     def load_artists(self) -> List[Artist]:
         """아티스트 마스터 로드"""
-        if not os.path.exists(self.artists_file):
-            return []
-        try:
-            with open(self.artists_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [Artist(**item) for item in data]
-        except Exception as e:
-            logger.error(f"아티스트 로드 실패: {e}")
-            return []
+        return self._load_cached(self.artists_file, self._read_artists)
+    
+    def _read_artists(self) -> List[Artist]:
+        return self._read_models(self.artists_file, Artist, "아티스트")
     
     def load_songs_master(self) -> List[SongMaster]:
         """곡 마스터 로드"""
-        if not os.path.exists(self.songs_master_file):
-            return []
-        try:
-            with open(self.songs_master_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [SongMaster(**item) for item in data]
-        except Exception as e:
-            logger.error(f"곡 마스터 로드 실패: {e}")
-            return []
+        return self._load_cached(self.songs_master_file, self._read_songs_master)
+    
+    def _read_songs_master(self) -> List[SongMaster]:
+        return self._read_models(self.songs_master_file, SongMaster, "곡 마스터")
     
     def load_videos(self) -> List[Video]:
         """비디오 마스터 로드"""
-        if not os.path.exists(self.videos_file):
-            return []
-        try:
-            with open(self.videos_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [Video(**item) for item in data]
-        except Exception as e:
-            logger.error(f"비디오 로드 실패: {e}")
-            return []
+        return self._load_cached(self.videos_file, self._read_videos)
+    
+    def _read_videos(self) -> List[Video]:
+        return self._read_models(self.videos_file, Video, "비디오")
     
     def load_performances(self) -> List[Performance]:
         """부른 기록 로드"""
-        if not os.path.exists(self.performances_file):
-            return []
+        return self._load_cached(self.performances_file, self._read_performances, [self.performances_journal_file])
+    
+    def _read_performances(self) -> List[Performance]:
         try:
-            with open(self.performances_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                performances = []
-                for item in data:
-                    # 기존 구조 호환성
-                    perf_data = {
-                        'id': item['id'],
-                        'song_master_id': item['song_master_id'],
-                        'utaite_id': item.get('utaite_id', ''),
-                        'video_id': item['video_id'],
-                        'start_time': item['start_time'],
-                        'start_time_seconds': time_to_seconds(item['start_time']),
-                        'date': item['date']
-                    }
-                    performances.append(Performance(**perf_data))
-                return performances
+            if self.trusted_load:
+                return [Performance.model_construct(_fields_set=set(_PERFORMANCE_FIELDS_SET), **self._performance_fields(item))
+                        for item in self.iter_performance_records()]
+            return [Performance(**self._performance_fields(item)) for item in self.iter_performance_records()]
         except Exception as e:
             logger.error(f"부른 기록 로드 실패: {e}")
             return []
     
+    def _performance_fields(self, item: dict) -> dict:
+        """부른 기록 원본 레코드 -> Performance 필드 (기존 구조 호환성)"""
+        return {
+            'id': item['id'],
+            'song_master_id': item['song_master_id'],
+            'utaite_id': item.get('utaite_id', ''),
+            'video_id': item['video_id'],
+            'start_time': item['start_time'],
+            'start_time_seconds': time_to_seconds(item['start_time']),
+            'date': item['date']
+        }
+    
+    def validate_data(self) -> List[dict]:
+        """모든 데이터 파일을 Pydantic 전체 검증으로 다시 읽어 문제 레코드 목록 반환
+        
+        각 항목은 {file, index, id, error} (index/id는 파일 자체를 읽지 못하면 None)
+        """
+        sources = [
+            (self.utaites_file, Utaite, None),
+            (self.artists_file, Artist, None),
+            (self.songs_master_file, SongMaster, None),
+            (self.videos_file, Video, None),
+            (self.performances_file, Performance, self._performance_fields),
+            (self.performances_journal_file, Performance, self._performance_fields),
+        ]
+        
+        errors = []
+        for path, model, to_fields in sources:
+            file_name = os.path.basename(path)
+            try:
+                for index, item in enumerate(self.iter_records(path)):
+                    try:
+                        model.model_validate(to_fields(item) if to_fields else item)
+                    except (ValidationError, KeyError, TypeError, ValueError) as e:
+                        record_id = item.get('id') if isinstance(item, dict) else None
+                        errors.append({'file': file_name, 'index': index, 'id': record_id, 'error': repr(e) if isinstance(e, KeyError) else str(e)})
+            except ValueError as e:
+                errors.append({'file': file_name, 'index': None, 'id': None, 'error': str(e)})
+        
+        if errors:
+            logger.warning(f"데이터 검증 실패 {len(errors)}건")
+        return errors
+    
+    def load_performance_records(self) -> List[dict]:
+        """스냅샷과 저널을 합친 부른 기록 원본 레코드 (같은 ID는 저널이 우선)"""
+        return list(self.iter_performance_records())
+    
+    def iter_performance_records(self) -> Iterator[dict]:
+        """스냅샷과 저널을 합친 부른 기록 원본 레코드를 하나씩 반환
+        
+        저널(마지막 압축 이후 추가분)만 메모리에 올리고 스냅샷은 스트리밍으로 읽는다.
+        순서는 스냅샷 순서 뒤에 저널에만 있는 기록이 붙는다.
+        """
+        journal: Dict[str, dict] = {}
+        journal_rows = 0
+        for item in self.iter_records(self.performances_journal_file):
+            journal[item['id']] = item
+            journal_rows += 1
+        self._journal_rows = journal_rows
+        
+        for item in self.iter_records(self.performances_file):
+            yield journal.pop(item['id'], item)
+        yield from journal.values()
+    
     # === Save Methods ===
     def save_utaites(self, utaites: List[Utaite]):
         """우타이테 마스터 저장"""
-        try:
-            with open(self.utaites_file, 'w', encoding='utf-8') as f:
+        with self.write_lock():
+            try:
                 data = [utaite.dict() for utaite in utaites]
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"우타이테 저장 실패: {e}")
-            raise
+                self._atomic_write_json(self.utaites_file, data)
+            except Exception as e:
+                logger.error(f"우타이테 저장 실패: {e}")
+                raise
+            finally:
+                self._invalidate(self.utaites_file)
     
     def save_artists(self, artists: List[Artist]):
         """아티스트 마스터 저장"""
-        try:
-            with open(self.artists_file, 'w', encoding='utf-8') as f:
+        with self.write_lock():
+            try:
                 data = [artist.dict() for artist in artists]
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"아티스트 저장 실패: {e}")
-            raise
+                self._atomic_write_json(self.artists_file, data)
+            except Exception as e:
+                logger.error(f"아티스트 저장 실패: {e}")
+                raise
+            finally:
+                self._invalidate(self.artists_file)
     
     def save_songs_master(self, songs: List[SongMaster]):
         """곡 마스터 저장"""
-        try:
-            with open(self.songs_master_file, 'w', encoding='utf-8') as f:
+        with self.write_lock():
+            try:
                 data = [song.dict() for song in songs]
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"곡 마스터 저장 실패: {e}")
-            raise
+                self._atomic_write_json(self.songs_master_file, data)
+            except Exception as e:
+                logger.error(f"곡 마스터 저장 실패: {e}")
+                raise
+            finally:
+                self._invalidate(self.songs_master_file)
     
     def save_videos(self, videos: List[Video]):
         """비디오 마스터 저장"""
-        try:
-            with open(self.videos_file, 'w', encoding='utf-8') as f:
+        with self.write_lock():
+            try:
                 data = [video.dict() for video in videos]
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"비디오 저장 실패: {e}")
-            raise
+                self._atomic_write_json(self.videos_file, data)
+            except Exception as e:
+                logger.error(f"비디오 저장 실패: {e}")
+                raise
+            finally:
+                self._invalidate(self.videos_file)
     
     def save_performances(self, performances: List[Performance]):
-        """부른 기록 저장"""
+        """부른 기록 저장 (전체 스냅샷을 다시 쓰고 저널을 비움)"""
+        with self.write_lock():
+            try:
+                self._atomic_write_json(self.performances_file, [self._performance_item(perf) for perf in performances])
+                self._truncate_journal()
+            except Exception as e:
+                logger.error(f"부른 기록 저장 실패: {e}")
+                raise
+            finally:
+                self._invalidate(self.performances_file)
+    
+    def add_performances(self, new_performances: List[Performance]):
+        """부른 기록 추가 (저널에 새 기록만 덧붙이고, 캐시와 컬럼 저장소도 새 기록만 반영)"""
+        path = self.performances_file
+        with self.write_lock():
+            before = self._signature(self._performance_sources)
+            try:
+                self._append_journal(new_performances)
+            except Exception as e:
+                logger.error(f"부른 기록 추가 실패: {e}")
+                self._invalidate(path)
+                raise
+            self._journal_rows += len(new_performances)
+            after = self._signature(self._performance_sources)
+            
+            # 이미 올라와 있는 캐시만 새 값을 따로 완성한 뒤 한 번에 교체 (읽는 쪽은 이전 또는 새 스냅샷만 봄)
+            with self._cache_lock:
+                cached = self._cache.get(path)
+                cached_columns = self._derived_cache.get('performance_columns')
+            records = [self._performance_item(perf) for perf in new_performances]
+            updated = cached[1] + list(new_performances) if cached and cached[0] == before else None
+            columns = cached_columns[1].with_added(records) if cached_columns and cached_columns[0] == before else None
+            with self._cache_lock:
+                if updated is not None:
+                    self._cache[path] = (after, updated)
+                else:
+                    self._cache.pop(path, None)
+                if columns is not None:
+                    self._derived_cache['performance_columns'] = (after, columns)
+            
+            if self._journal_rows >= self.journal_compact_threshold:
+                self.compact_performances()
+    
+    def remove_performances(self, performance_ids: List[str]) -> List[Performance]:
+        """부른 기록 삭제 (스냅샷 재작성) 후 삭제된 기록 반환"""
+        ids = set(performance_ids)
+        with self.write_lock():
+            # 조회는 컬럼 저장소를 쓰므로 Performance 리스트는 캐시에 올리지 않고 한 번만 읽는다
+            performances = self._read_performances()
+            removed = [perf for perf in performances if perf.id in ids]
+            if removed:
+                self.save_performances([perf for perf in performances if perf.id not in ids])
+            return removed
+    
+    def compact_performances(self):
+        """저널을 스냅샷에 합치고 저널 비우기 (내용은 그대로라 캐시와 컬럼 저장소는 유지)"""
+        path = self.performances_file
+        with self.write_lock():
+            performances = self._read_performances()
+            before = self._signature(self._performance_sources)
+            try:
+                self._atomic_write_json(path, [self._performance_item(perf) for perf in performances])
+                # 스냅샷 교체 후 저널을 비우기 전에 중단되면 저널 기록은 ID로 중복 제거된다
+                self._truncate_journal()
+            except Exception as e:
+                logger.error(f"부른 기록 압축 실패: {e}")
+                self._invalidate(path)
+                raise
+            self._journal_rows = 0
+            after = self._signature(self._performance_sources)
+            
+            with self._cache_lock:
+                for cache in (self._cache, self._derived_cache):
+                    key = path if cache is self._cache else 'performance_columns'
+                    cached = cache.get(key)
+                    if cached and cached[0] == before:
+                        cache[key] = (after, cached[1])
+            
+            logger.info(f"부른 기록 저널 압축 완료: {len(performances)}개")
+    
+    def _performance_item(self, perf: Performance) -> dict:
+        """부른 기록 저장 형식 (기존 구조와 호환성 유지)"""
+        return {
+            'id': perf.id,
+            'song_master_id': perf.song_master_id,
+            'utaite_id': perf.utaite_id,
+            'video_id': perf.video_id,
+            'start_time': perf.start_time,
+            'date': perf.date
+        }
+    
+    def _append_journal(self, performances: List[Performance]):
+        """저널 끝에 부른 기록 추가 후 fsync"""
+        lines = ''.join(json.dumps(self._performance_item(perf), ensure_ascii=False) + '\n' for perf in performances)
+        # 이전 추가가 줄 중간에서 끊겼다면 새 기록이 손상된 줄에 붙지 않도록 줄을 바꾼다
+        if os.path.exists(self.performances_journal_file) and os.path.getsize(self.performances_journal_file) > 0:
+            with open(self.performances_journal_file, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    lines = '\n' + lines
+        with open(self.performances_journal_file, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _truncate_journal(self):
+        """저널 비우기"""
+        if not os.path.exists(self.performances_journal_file):
+            return
+        with open(self.performances_journal_file, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _atomic_write_json(self, path: str, data: list):
+        """임시 파일에 쓰고 fsync 후 rename으로 교체 (중간에 실패해도 기존 파일은 온전함)"""
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
         try:
-            with open(self.performances_file, 'w', encoding='utf-8') as f:
-                data = []
-                for perf in performances:
-                    # 기존 구조와 호환성 유지
-                    item = {
-                        'id': perf.id,
-                        'song_master_id': perf.song_master_id,
-                        'utaite_id': perf.utaite_id,
-                        'video_id': perf.video_id,
-                        'start_time': perf.start_time,
-                        'date': perf.date
-                    }
-                    data.append(item)
+            # mkstemp는 0600으로 만들기 때문에 기존 파일 권한을 이어받는다
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"부른 기록 저장 실패: {e}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             raise
+        
+        # rename 자체도 디스크에 반영 (디렉토리 fsync를 지원하지 않는 플랫폼은 건너뜀)
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
     
     # === Helper Methods ===
-    def get_performances_with_details(self, language: str = "original") -> List[PerformanceWithDetails]:
-        """조인된 상세 부른 기록 반환"""
-        performances = self.load_performances()
-        utaites = self.load_utaites()
-        songs_master = self.load_songs_master()
-        artists = self.load_artists()
-        videos = self.load_videos()
+    def get_performance_columns(self) -> PerformanceColumns:
+        """부른 기록 컬럼 저장소 (원본 레코드를 스트리밍해 Performance 객체 없이 구축)
+        
+        목록/검색 조회와 통계는 이 저장소에서 필터/정렬/집계하고 응답에 필요한 행만 꺼낸다.
+        """
+        return self._derived(
+            'performance_columns',
+            self._performance_sources,
+            lambda: PerformanceColumns.from_records(self.iter_performance_records())
+        )
+    
+    def _detail_lookups(self) -> Tuple[Dict[str, Utaite], Dict[str, SongMaster], Dict[str, Video]]:
+        """조인용 id -> 마스터 딕셔너리 (마스터 파일이 바뀔 때만 재구축)"""
+        return self._derived(
+            'detail_lookups',
+            [self.utaites_file, self.songs_master_file, self.videos_file],
+            lambda: (
+                {u.id: u for u in self.load_utaites()},
+                {s.id: s for s in self.load_songs_master()},
+                {v.id: v for v in self.load_videos()}
+            )
+        )
+    
+    def _song_ids_by_artist_name(self, language: str) -> Dict[str, List[str]]:
+        """언어별 아티스트 이름 -> 곡 ID 목록"""
+        def build():
+            index = defaultdict(list)
+            for song in self.load_songs_master():
+                artist_name = song.artist.get(language) or song.artist.get('original', '') if song.artist else ''
+                index[artist_name].append(song.id)
+            return index
+        return self._derived(f'artist_songs:{language}', [self.songs_master_file], build)
+    
+    def _utaite_ids_by_name(self, language: str) -> Dict[str, List[str]]:
+        """언어별 우타이테 이름 -> 우타이테 ID 목록"""
+        def build():
+            index = defaultdict(list)
+            for utaite in self.load_utaites():
+                index[utaite.names.get(language) or utaite.names.get('original', '')].append(utaite.id)
+            return index
+        return self._derived(f'utaite_names:{language}', [self.utaites_file], build)
+    
+    def count_performances(self) -> int:
+        """전체 부른 기록 수"""
+        return len(self.get_performance_columns())
+    
+    def get_video_performances(self, video_id: str) -> List[Performance]:
+        """특정 비디오의 부른 기록"""
+        columns = self.get_performance_columns()
+        return [columns.performance(row) for row in columns.rows(video_id=video_id)]
+    
+    def get_performances_with_details(self, language: str = "original",
+                                      utaite_id: Optional[str] = None,
+                                      song_id: Optional[str] = None,
+                                      video_id: Optional[str] = None,
+                                      artist_name: Optional[str] = None,
+                                      utaite_name: Optional[str] = None,
+                                      newest_first: bool = False) -> List[PerformanceWithDetails]:
+        """조인된 상세 부른 기록 반환
         
-        # 빠른 조회를 위한 딕셔너리 생성
-        utaites_dict = {u.id: u for u in utaites}
-        songs_dict = {s.id: s for s in songs_master}
-        artists_dict = {a.id: a for a in artists}
-        videos_dict = {v.id: v for v in videos}
+        필터(여러 필터는 AND)와 날짜 정렬은 컬럼 저장소의 배열 위에서 처리하고, 결과 행만 꺼내 조인한다.
+        newest_first면 날짜(epoch) 최신순, 아니면 저장 순서.
+        """
+        columns = self.get_performance_columns()
+        
+        utaite_ids = None
+        if utaite_name is not None:
+            utaite_ids = self._utaite_ids_by_name(language).get(utaite_name, [])
+            if utaite_id is not None:
+                utaite_ids = [u for u in utaite_ids if u == utaite_id]
+        elif utaite_id is not None:
+            utaite_ids = [utaite_id]
+        song_ids = None
+        if artist_name is not None:
+            song_ids = self._song_ids_by_artist_name(language).get(artist_name, [])
+            if song_id is not None:
+                song_ids = [s for s in song_ids if s == song_id]
+        elif song_id is not None:
+            song_ids = [song_id]
+        
+        rows = columns.rows(utaite_ids=utaite_ids, song_ids=song_ids, video_id=video_id)
+        if newest_first:
+            rows = columns.sort_rows(rows, newest_first=True)
+        return self._join_details(columns.iter_rows(rows), language)
+    
+    def _join_details(self, performances: Iterable[PerformanceRow], language: str) -> List[PerformanceWithDetails]:
+        """부른 기록에 우타이테/곡/비디오 정보 조인"""
+        utaites_dict, songs_dict, videos_dict = self._detail_lookups()
         
         results = []
         for perf in performances:
@@ -229,59 +615,337 @@ class DataManager:
         
         return results
     
+    # === Find or Create ===
+    def _utaite_id_index(self) -> Dict[str, str]:
+        """우타이테 원어 이름 -> ID"""
+        def build():
+            index = {}
+            for utaite in self.load_utaites():
+                index.setdefault(utaite.names.get('original'), utaite.id)
+            return index
+        return self._derived('utaite_ids', [self.utaites_file], build)
+    
+    def _artist_id_index(self) -> Dict[str, str]:
+        """아티스트 원어 이름 -> ID"""
+        def build():
+            index = {}
+            for artist in self.load_artists():
+                index.setdefault(artist.names.get('original'), artist.id)
+            return index
+        return self._derived('artist_ids', [self.artists_file], build)
+    
+    def _song_id_index(self) -> Dict[Tuple[str, str], str]:
+        """(곡 원어 제목, 아티스트 원어 이름) -> 곡 ID"""
+        def build():
+            index = {}
+            for song in self.load_songs_master():
+                index.setdefault((song.titles.get('original'), song.artist.get('original')), song.id)
+            return index
+        return self._derived('song_ids', [self.songs_master_file], build)
+    
+    def find_utaite_id(self, name: str) -> Optional[str]:
+        """원어 이름으로 우타이테 ID 찾기"""
+        return self._utaite_id_index().get(name)
+    
+    def find_artist_id(self, name: str) -> Optional[str]:
+        """원어 이름으로 아티스트 ID 찾기"""
+        return self._artist_id_index().get(name)
+    
+    def find_song_master_id(self, title: str, artist_name: str) -> Optional[str]:
+        """원어 제목 + 아티스트 이름으로 곡 ID 찾기"""
+        return self._song_id_index().get((title, artist_name))
+    
     def find_or_create_utaite(self, name: str) -> str:
         """우타이테 찾기 또는 생성"""
-        utaites = self.load_utaites()
-        
-        # 기존 우타이테 찾기
-        for utaite in utaites:
-            if utaite.names.get('original') == name:
-                return utaite.id
+        with self.unit_of_work() as uow:
+            return uow.utaite_id(name)
+    
+    def find_or_create_artist(self, name: str) -> str:
+        """아티스트 찾기 또는 생성"""
+        with self.unit_of_work() as uow:
+            return uow.artist_id(name)
+    
+    # === Statistics ===
+    def get_aggregated_stats(self) -> Tuple[List[ArtistWithStats], List[UtaiteWithStats]]:
+        """아티스트/우타이테 통계 (한 번 훑는 집계, 원본 파일이 바뀔 때만 다시 계산)"""
+        return self._derived(
+            'aggregated_stats',
+            [*self._performance_sources, self.songs_master_file, self.artists_file, self.utaites_file],
+            lambda: aggregate_stats(self.get_performance_columns().iter_rows(), self.load_songs_master(), self.load_artists(), self.load_utaites())
+        )
+    
+    def recompute_statistics(self) -> Dict[str, Dict[str, dict]]:
+        """전체 부른 기록에서 통계를 처음부터 다시 계산 (검증용)"""
+        columns = self.get_performance_columns()
+        utaite_counts = columns.counts_by_utaite()
+        utaite_bounds = columns.date_bounds_by_utaite()
+        song_counts = columns.counts_by_song()
         
-        # 새 우타이테 생성
-        new_id = generate_id('utaite', name)
-        current_time = datetime.now().isoformat()
+        artist_ids = self._artist_id_index()
+        artist_counts = Counter()
+        for song in self.load_songs_master():
+            artist_id = song.artist_id or artist_ids.get(song.artist.get('original'))
+            if artist_id:
+                artist_counts[artist_id] += 1
         
-        new_utaite = Utaite(
-            id=new_id,
-            names={'original': name, 'korean': '', 'english': '', 'romanized': ''},
-            performance_count=0,
-            created_at=current_time,
-            updated_at=current_time
-        )
+        return {
+            'utaites': {
+                u.id: {
+                    'performance_count': utaite_counts.get(u.id, 0),
+                    'first_appearance': utaite_bounds.get(u.id, (None, None))[0],
+                    'latest_appearance': utaite_bounds.get(u.id, (None, None))[1]
+                }
+                for u in self.load_utaites()
+            },
+            'songs': {s.id: {'performance_count': song_counts.get(s.id, 0)} for s in self.load_songs_master()},
+            'artists': {a.id: {'song_count': artist_counts[a.id]} for a in self.load_artists()},
+        }
+    
+    def verify_statistics(self, fix: bool = False) -> List[dict]:
+        """저장된 통계와 전체 재계산 결과 비교 (fix=True면 어긋난 값 바로잡기)"""
+        if fix:
+            with self.write_lock():
+                return self._verify_statistics(fix)
+        return self._verify_statistics(fix)
+    
+    def _verify_statistics(self, fix: bool) -> List[dict]:
+        expected = self.recompute_statistics()
+        sources = {
+            'utaites': (self.load_utaites, self.save_utaites),
+            'songs': (self.load_songs_master, self.save_songs_master),
+            'artists': (self.load_artists, self.save_artists),
+        }
         
-        utaites.append(new_utaite)
-        self.save_utaites(utaites)
+        drift = []
+        for entity, (load, save) in sources.items():
+            items = load()
+            fixed = False
+            for i, item in enumerate(items):
+                updates = {}
+                for field, value in expected[entity][item.id].items():
+                    stored = getattr(item, field)
+                    if field in DATE_STAT_FIELDS and stored is not None and value is not None:
+                        # 같은 시각을 다른 표기(시간대 유무 등)로 저장한 것은 불일치가 아니다
+                        same = date_to_epoch(stored) == date_to_epoch(value)
+                    else:
+                        same = stored == value
+                    if not same:
+                        drift.append({'entity': entity, 'id': item.id, 'field': field, 'stored': stored, 'expected': value})
+                        updates[field] = value
+                if updates and fix:
+                    items[i] = item.model_copy(update=updates)
+                    fixed = True
+            if fixed:
+                save(items)
         
-        logger.info(f"새 우타이테 생성: {name} (ID: {new_id})")
-        return new_id
+        if drift:
+            logger.warning(f"통계 불일치 {len(drift)}건 발견" + (" - 수정 완료" if fix else ""))
+        return drift
     
-    def find_or_create_artist(self, name: str) -> str:
-        """아티스트 찾기 또는 생성"""
-        artists = self.load_artists()
+    def unit_of_work(self) -> 'UnitOfWork':
+        """요청 하나에서 필요한 엔티티를 모아 해석하고 파일별로 한 번만 저장하는 작업 단위"""
+        return UnitOfWork(self)
+
+class UnitOfWork:
+    """엔티티 찾기/생성 작업 단위
+    
+    이름 -> ID 해시 인덱스로 기존 엔티티를 찾고, 새 엔티티는 메모리에 모아 두었다가
+    flush (또는 with 블록 정상 종료) 시 마스터 파일마다 한 번씩만 저장한다.
+    부른 기록 추가/삭제도 함께 모아서, 우타이테/곡/아티스트 통계는 전체 재계산 없이
+    변화량만 반영한다. with 블록에서 예외가 나면 아무것도 저장하지 않는다.
+    
+        with data_manager.unit_of_work() as uow:
+            utaite_id = uow.utaite_id(singer_name)
+            song_id = uow.song_master_id(title, artist_name)
+            uow.add_performances([...])
+    """
+    
+    def __init__(self, manager: DataManager):
+        self.manager = manager
+        self.new_utaites: Dict[str, Utaite] = {}
+        self.new_artists: Dict[str, Artist] = {}
+        self.new_songs: Dict[Tuple[str, str], SongMaster] = {}
+        self.new_performances: List[Performance] = []
+        self.removed_performance_ids: set = set()
+    
+    def __enter__(self) -> 'UnitOfWork':
+        # 엔티티 해석부터 저장까지 쓰기 락을 잡아 다른 프로세스의 쓰기와 섞이지 않게 한다
+        self._lock = self.manager.write_lock()
+        self._lock.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        except BaseException as error:
+            # 저장 중 실패도 락에 예외로 전달해 (SQLite 엔진은) 트랜잭션이 롤백되게 한다
+            self._lock.__exit__(type(error), error, error.__traceback__)
+            raise
+        self._lock.__exit__(exc_type, exc, tb)
+        return False
+    
+    def utaite_id(self, name: str) -> str:
+        """우타이테 찾기 또는 (저장 대기 상태로) 생성"""
+        existing = self.manager.find_utaite_id(name)
+        if existing:
+            return existing
+        if name not in self.new_utaites:
+            current_time = datetime.now().isoformat()
+            self.new_utaites[name] = Utaite(
+                id=generate_id('utaite', name),
+                names={'original': name, 'korean': '', 'english': '', 'romanized': ''},
+                performance_count=0,
+                created_at=current_time,
+                updated_at=current_time
+            )
+        return self.new_utaites[name].id
+    
+    def artist_id(self, name: str) -> str:
+        """아티스트 찾기 또는 (저장 대기 상태로) 생성"""
+        existing = self.manager.find_artist_id(name)
+        if existing:
+            return existing
+        if name not in self.new_artists:
+            current_time = datetime.now().isoformat()
+            self.new_artists[name] = Artist(
+                id=generate_id('artist', name),
+                names={'original': name, 'korean': '', 'english': '', 'romanized': ''},
+                song_count=0,
+                created_at=current_time,
+                updated_at=current_time
+            )
+        return self.new_artists[name].id
+    
+    def song_master_id(self, title: str, artist_name: str) -> str:
+        """곡 마스터 찾기 또는 (저장 대기 상태로) 생성 - 아티스트도 함께 해석"""
+        key = (title, artist_name)
+        existing = self.manager.find_song_master_id(title, artist_name)
+        if existing:
+            return existing
+        if key not in self.new_songs:
+            current_time = datetime.now().isoformat()
+            self.new_songs[key] = SongMaster(
+                id=generate_id('song', f"{title}|{artist_name}"),
+                titles={'original': title, 'korean': '', 'english': '', 'romanized': ''},
+                artist={'original': artist_name, 'korean': '', 'english': ''},
+                artist_id=self.artist_id(artist_name),
+                tags=[],
+                performance_count=0,
+                created_at=current_time,
+                updated_at=current_time
+            )
+        return self.new_songs[key].id
+    
+    def add_performances(self, performances: List[Performance]):
+        """부른 기록 추가 예약"""
+        self.new_performances.extend(performances)
+    
+    def remove_performances(self, performance_ids: List[str]):
+        """부른 기록 삭제 예약"""
+        self.removed_performance_ids.update(performance_ids)
+    
+    def flush(self):
+        """부른 기록을 반영하고, 새 엔티티와 통계 변화량을 마스터 파일별로 한 번씩 저장"""
+        with self.manager.write_lock():
+            self._flush()
+    
+    def _flush(self):
+        manager = self.manager
         
-        # 기존 아티스트 찾기
-        for artist in artists:
-            if artist.names.get('original') == name:
-                return artist.id
+        removed = manager.remove_performances(list(self.removed_performance_ids)) if self.removed_performance_ids else []
+        if self.new_performances:
+            manager.add_performances(self.new_performances)
         
-        # 새 아티스트 생성
-        new_id = generate_id('artist', name)
-        current_time = datetime.now().isoformat()
+        # 락을 잡기 전에 다른 프로세스가 이미 저장한 곡은 아티스트 곡 수에 세지 않는다
+        saved_song_ids = {song.id for song in manager.load_songs_master()}
+        added_songs = [song for song in self.new_songs.values() if song.id not in saved_song_ids]
+        utaite_deltas, song_deltas, artist_deltas = self._count_deltas(removed, added_songs)
+        added_dates: Dict[str, List[str]] = defaultdict(list)
+        for perf in self.new_performances:
+            added_dates[perf.utaite_id].append(perf.date)
+        removed_dates: Dict[str, List[str]] = defaultdict(list)
+        for perf in removed:
+            removed_dates[perf.utaite_id].append(perf.date)
         
-        new_artist = Artist(
-            id=new_id,
-            names={'original': name, 'korean': '', 'english': '', 'romanized': ''},
-            song_count=0,
-            created_at=current_time,
-            updated_at=current_time
-        )
+        def update_utaite(utaite: Utaite) -> Optional[dict]:
+            delta = utaite_deltas.get(utaite.id, 0)
+            first, latest = utaite.first_appearance, utaite.latest_appearance
+            # 날짜는 recompute_statistics(컬럼 저장소)와 같이 epoch로 비교한다 (시간대 없는 값은 UTC)
+            bounds = {date_to_epoch(date) for date in (first, latest) if date is not None}
+            if any(date_to_epoch(date) in bounds for date in removed_dates.get(utaite.id, [])):
+                # 경계 날짜가 삭제됐을 때만 해당 우타이테의 기록으로 다시 구한다
+                columns = manager.get_performance_columns()
+                dates = [columns.dates[columns.date_code[row]] for row in columns.rows(utaite_ids=[utaite.id])]
+                first, latest = (min(dates, key=date_to_epoch), max(dates, key=date_to_epoch)) if dates else (None, None)
+            else:
+                for date in added_dates.get(utaite.id, []):
+                    first = date if first is None or date_to_epoch(date) < date_to_epoch(first) else first
+                    latest = date if latest is None or date_to_epoch(date) > date_to_epoch(latest) else latest
+            if not delta and (first, latest) == (utaite.first_appearance, utaite.latest_appearance):
+                return None
+            return {'performance_count': utaite.performance_count + delta, 'first_appearance': first, 'latest_appearance': latest}
         
-        artists.append(new_artist)
-        self.save_artists(artists)
+        self._save_master(manager.load_utaites, manager.save_utaites, self.new_utaites, update_utaite, '우타이테')
+        self._save_master(manager.load_songs_master, manager.save_songs_master, self.new_songs,
+                          lambda song: {'performance_count': song.performance_count + song_deltas[song.id]} if song_deltas.get(song.id) else None,
+                          '곡 마스터')
+        self._save_master(manager.load_artists, manager.save_artists, self.new_artists,
+                          lambda artist: {'song_count': artist.song_count + artist_deltas[artist.id]} if artist_deltas.get(artist.id) else None,
+                          '아티스트')
         
-        logger.info(f"새 아티스트 생성: {name} (ID: {new_id})")
-        return new_id
+        self._reset()
+    
+    def _count_deltas(self, removed: List[Performance], added_songs: List[SongMaster]) -> Tuple[Counter, Counter, Counter]:
+        """우타이테/곡 부른 횟수와 아티스트 곡 수 변화량 (added_songs: 새 곡 중 실제로 저장소에 추가되는 곡)"""
+        utaite_deltas = Counter()
+        song_deltas = Counter()
+        artist_deltas = Counter(song.artist_id for song in added_songs)
+        for perf in self.new_performances:
+            utaite_deltas[perf.utaite_id] += 1
+            song_deltas[perf.song_master_id] += 1
+        for perf in removed:
+            utaite_deltas[perf.utaite_id] -= 1
+            song_deltas[perf.song_master_id] -= 1
+        return utaite_deltas, song_deltas, artist_deltas
+    
+    def _reset(self):
+        self.new_utaites.clear()
+        self.new_artists.clear()
+        self.new_songs.clear()
+        self.new_performances.clear()
+        self.removed_performance_ids.clear()
+    
+    def _save_master(self, load: Callable[[], list], save: Callable[[list], None], new_items: Dict[Any, Any],
+                     update: Callable[[Any], Optional[dict]], label: str):
+        """새 엔티티 추가와 통계 갱신을 모아서 마스터 파일 한 번만 저장
+        
+        new_items의 키는 이름 또는 (곡 제목, 아티스트 이름) 튜플 - 로그에만 쓴다
+        """
+        items = load()
+        # 락을 잡기 전에 다른 프로세스가 같은 엔티티를 이미 만들었으면 중복 추가하지 않는다
+        existing_ids = {item.id for item in items}
+        new_items = {name: item for name, item in new_items.items() if item.id not in existing_ids}
+        items += list(new_items.values())
+        changed = bool(new_items)
+        for i, item in enumerate(items):
+            updates = update(item)
+            if updates:
+                # 캐시와 공유되는 객체를 직접 바꾸지 않도록 복사본으로 교체
+                items[i] = item.model_copy(update=updates)
+                changed = True
+        if changed:
+            save(items)
+        for name, item in new_items.items():
+            logger.info(f"새 {label} 생성: {' - '.join(name) if isinstance(name, tuple) else name} (ID: {item.id})")
+
+def create_data_manager():
+    """환경변수 DATA_BACKEND에 따라 저장소 엔진 선택 (json 기본, sqlite 선택)"""
+    backend = os.getenv("DATA_BACKEND", "json").lower()
+    if backend == "sqlite":
+        from sqlite_store import SQLiteDataManager
+        return SQLiteDataManager(os.getenv("SQLITE_PATH", os.path.join("data", "utawakufinder.db")))
+    return DataManager(trusted_load=os.getenv("DATA_TRUSTED_LOAD", "false").lower() == "true")
 
 # 전역 데이터 매니저 인스턴스
-data_manager = DataManager()
\ No newline at end of file
+data_manager = create_data_manager()
@@ -0,0 +1,83 @@
+"""
+JSON 스트리밍 읽기
+최상위 배열 JSON 파일을 json.load로 통째로 올리지 않고 원소를 하나씩 꺼낸다 (JSON Lines도 지원)
+"""
+import json
+import logging
+import re
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def iter_json_array(path: str, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """최상위 JSON 배열의 원소를 하나씩 반환 - 메모리는 원소 하나 + 읽기 버퍼 크기만 사용"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer, pos, eof = '', 0, False
+
+        def read_more() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def next_char() -> str:
+            """공백을 건너뛴 다음 문자 (파일 끝이면 빈 문자열)"""
+            nonlocal pos
+            while True:
+                pos = _WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not read_more():
+                    return ''
+
+        if next_char() != '[':
+            raise ValueError(f"JSON 배열 파일이 아닙니다: {path}")
+        pos += 1
+        if next_char() == ']':
+            return
+
+        while True:
+            next_char()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # 숫자는 청크 경계에서 잘려도 해석되므로 값 뒤 구분자까지 읽힌 경우만 확정
+                    if eof or (end < len(buffer) and buffer[end] in ' \t\n\r,]'):
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                read_more()
+            pos = end
+            yield value
+
+            separator = next_char()
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"JSON 배열 구분자 오류 ({path}): {separator!r}")
+            pos += 1
+
+def iter_json_lines(path: str) -> Iterator[Any]:
+    """JSON Lines 파일의 레코드를 한 줄씩 반환 (중단된 쓰기로 손상된 줄은 경고 후 건너뜀)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"{path} {line_no}번째 줄 손상 - 건너뜀")
+
+def iter_json_records(path: str) -> Iterator[Any]:
+    """확장자에 따라 JSON 배열(.json) 또는 JSON Lines(.jsonl) 레코드를 하나씩 반환"""
+    if path.endswith('.jsonl'):
+        return iter_json_lines(path)
+    return iter_json_array(path)
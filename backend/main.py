@@ -15,9 +15,11 @@ import asyncio
 from datetime import datetime
 
 # PostgreSQL 관련 imports
-from database import get_db
+from database import get_db, get_read_db, replicas, query_stats, QueryStats
 from database import Artist as ArtistModel, Utaite as UtaiteModel, SongMaster as SongMasterModel, Video as VideoModel, Performance as PerformanceModel
 from schemas import *
+import queries
+import name_cache
 
 # 기존 파싱 로직 imports
 from crawler import extract_video_id, find_comment
@@ -37,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
 @app.middleware("http")
@@ -44,10 +47,22 @@ async def log_requests(request: Request, call_next):
     start_time = time.time()
     logger.info(f"요청 시작: {request.method} {request.url}")
     
-    response = await call_next(request)
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats.reset(token)
     
     process_time = time.time() - start_time
-    logger.info(f"요청 완료: {request.method} {request.url} - 상태코드: {response.status_code} - 처리시간: {process_time:.2f}초")
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", app;dur={process_time * 1000:.1f}'
+    )
+    response.headers["Timing-Allow-Origin"] = "*"
+    logger.info(
+        f"요청 완료: {request.method} {request.url} - 상태코드: {response.status_code} - 처리시간: {process_time:.2f}초"
+        f" - 쿼리 {stats.count}개 {stats.total_ms:.1f}ms"
+    )
     
     return response
 
@@ -67,6 +82,7 @@ def health_check(db: Session = Depends(get_db)):
             "status": "healthy",
             "utaites_count": utaites_count,
             "performances_count": performances_count,
+            "read_replicas": {"configured": len(replicas.engines), "available": replicas.available()},
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -76,33 +92,12 @@ def health_check(db: Session = Depends(get_db)):
 # === 부른 기록 API (기존 호환성) ===
 
 @app.get("/songs")
-def get_songs(db: Session = Depends(get_db)):
+def get_songs(db: Session = Depends(get_read_db)):
     """모든 부른 기록 (프론트엔드 호환용)"""
     try:
-        # performance_details 뷰를 직접 쿼리
-        query = """
-        SELECT 
-            p.id,
-            p.start_time,
-            p.date,
-            sm.id as song_id,
-            sm.title as song_title,
-            a.name as song_artist,
-            u.id as utaite_id,
-            u.name as utaite_name,
-            v.video_id,
-            v.title as video_title,
-            v.channel as video_channel,
-            v.thumbnail_url
-        FROM performances p
-        JOIN song_masters sm ON p.song_master_id = sm.id
-        JOIN artists a ON sm.artist_id = a.id
-        JOIN utaites u ON p.utaite_id = u.id
-        JOIN videos v ON p.video_id = v.id
-        ORDER BY p.date DESC
-        """
-        
-        results = db.execute(text(query)).fetchall()
+        query = queries.SONGS
+        
+        results = query.execute(db).fetchall()
         
         performances = []
         for row in results:
@@ -113,6 +108,7 @@ def get_songs(db: Session = Depends(get_db)):
                 song_id=row.song_id,
                 song_title=row.song_title,
                 song_artist=row.song_artist,
+                artist_id=row.artist_id,
                 utaite_id=row.utaite_id,
                 utaite_name=row.utaite_name,
                 video_id=row.video_id,
@@ -129,33 +125,12 @@ def get_songs(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"부른 기록 조회 중 오류: {str(e)}")
 
 @app.get("/songs/master")
-def get_songs_master(db: Session = Depends(get_db)):
+def get_songs_master(db: Session = Depends(get_read_db)):
     """곡 마스터 정보 (프론트엔드 호환용)"""
     try:
-        # 곡 통계와 함께 조회
-        query = """
-        SELECT 
-            sm.id,
-            sm.title,
-            sm.title_korean,
-            sm.title_english,
-            sm.title_romanized,
-            a.name as artist_name,
-            a.name_korean as artist_name_korean,
-            a.name_english as artist_name_english,
-            a.name_romanized as artist_name_romanized,
-            sm.album_art_url,
-            sm.tags,
-            COALESCE(ss.performance_count, 0) as performance_count,
-            sm.created_at,
-            sm.updated_at
-        FROM song_masters sm
-        JOIN artists a ON sm.artist_id = a.id
-        LEFT JOIN song_stats ss ON sm.id = ss.id
-        ORDER BY COALESCE(ss.performance_count, 0) DESC
-        """
-        
-        results = db.execute(text(query)).fetchall()
+        query = queries.SONGS_MASTER
+        
+        results = query.execute(db).fetchall()
         
         songs = []
         for row in results:
@@ -185,34 +160,71 @@ def get_songs_master(db: Session = Depends(get_db)):
         logger.error(f"곡 마스터 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"곡 마스터 조회 중 오류: {str(e)}")
 
+@app.get("/songs/master/{song_master_id}", response_model=SongMasterPage)
+def get_song_master(song_master_id: int, related_limit: int = 6, db: Session = Depends(get_read_db)):
+    """곡 마스터 한 건과 같은 아티스트의 다른 곡 (전체 목록을 받지 않고 곡 페이지를 그리도록)"""
+    try:
+        row = queries.SONG_MASTER.execute(db, {"song_master_id": song_master_id}).fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="곡을 찾을 수 없습니다")
+        
+        artist = {
+            "original": row.artist_name,
+            "korean": row.artist_name_korean,
+            "english": row.artist_name_english,
+            "romanized": row.artist_name_romanized
+        }
+        related = queries.SONG_MASTER_RELATED.execute(db, {
+            "artist_id": row.artist_id, "song_master_id": song_master_id, "limit": related_limit
+        }).fetchall()
+        
+        related_songs = []
+        for r in related:
+            related_songs.append(SongMasterDetail(
+                id=r.id,
+                titles={
+                    "original": r.title,
+                    "korean": r.title_korean,
+                    "english": r.title_english,
+                    "romanized": r.title_romanized
+                },
+                artist=artist,
+                artist_id=row.artist_id,
+                tags=r.tags or [],
+                performance_count=r.performance_count,
+                album_art_url=r.album_art_url
+            ))
+        
+        logger.info(f"곡 마스터 조회 성공: {song_master_id} (관련 곡 {len(related_songs)}곡)")
+        return SongMasterPage(
+            id=row.id,
+            titles={
+                "original": row.title,
+                "korean": row.title_korean,
+                "english": row.title_english,
+                "romanized": row.title_romanized
+            },
+            artist=artist,
+            artist_id=row.artist_id,
+            tags=row.tags or [],
+            performance_count=row.performance_count,
+            album_art_url=row.album_art_url,
+            related_songs=related_songs
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"곡 마스터 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"곡 마스터 조회 중 오류: {str(e)}")
+
 @app.get("/songs/by-master/{song_master_id}")
-def get_songs_by_master(song_master_id: int, db: Session = Depends(get_db)):
+def get_songs_by_master(song_master_id: int, db: Session = Depends(get_read_db)):
     """특정 곡의 모든 부른 기록"""
     try:
-        query = """
-        SELECT 
-            p.id,
-            p.start_time,
-            p.date,
-            sm.id as song_id,
-            sm.title as song_title,
-            a.name as song_artist,
-            u.id as utaite_id,
-            u.name as utaite_name,
-            v.video_id,
-            v.title as video_title,
-            v.channel as video_channel,
-            v.thumbnail_url
-        FROM performances p
-        JOIN song_masters sm ON p.song_master_id = sm.id
-        JOIN artists a ON sm.artist_id = a.id
-        JOIN utaites u ON p.utaite_id = u.id
-        JOIN videos v ON p.video_id = v.id
-        WHERE sm.id = :song_master_id
-        ORDER BY p.date DESC
-        """
-        
-        results = db.execute(text(query), {"song_master_id": song_master_id}).fetchall()
+        query = queries.SONGS_BY_MASTER
+        
+        results = query.execute(db, {"song_master_id": song_master_id}).fetchall()
         
         performances = []
         for row in results:
@@ -223,6 +235,7 @@ def get_songs_by_master(song_master_id: int, db: Session = Depends(get_db)):
                 song_id=row.song_id,
                 song_title=row.song_title,
                 song_artist=row.song_artist,
+                artist_id=row.artist_id,
                 utaite_id=row.utaite_id,
                 utaite_name=row.utaite_name,
                 video_id=row.video_id,
@@ -241,12 +254,11 @@ def get_songs_by_master(song_master_id: int, db: Session = Depends(get_db)):
 # === 아티스트 API ===
 
 @app.get("/artists")
-def get_artists(db: Session = Depends(get_db)):
+def get_artists(db: Session = Depends(get_read_db)):
     """아티스트 목록과 통계 (프론트엔드 호환용)"""
     try:
         logger.info("아티스트 쿼리 시작")
-        # 먼저 간단한 쿼리로 테스트
-        results = db.execute(text("SELECT * FROM artist_stats WHERE total_performances > 0 ORDER BY total_performances DESC")).fetchall()
+        results = queries.ARTISTS.execute(db).fetchall()
         logger.info(f"쿼리 완료, 결과: {len(results)}개")
         
         artists = []
@@ -277,33 +289,25 @@ def get_artists(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"아티스트 통계 조회 중 오류: {str(e)}")
 
 @app.get("/artists/songs")
-def get_artist_songs(name: str, db: Session = Depends(get_db)):
-    """특정 아티스트의 모든 곡"""
+def get_artist_songs(name: str, db: Session = Depends(get_read_db)):
+    """특정 아티스트의 모든 곡 (이름 -> ID는 name_cache)"""
     try:
-        query = """
-        SELECT 
-            p.id,
-            p.start_time,
-            p.date,
-            sm.id as song_id,
-            sm.title as song_title,
-            a.name as song_artist,
-            u.id as utaite_id,
-            u.name as utaite_name,
-            v.video_id,
-            v.title as video_title,
-            v.channel as video_channel,
-            v.thumbnail_url
-        FROM performances p
-        JOIN song_masters sm ON p.song_master_id = sm.id
-        JOIN artists a ON sm.artist_id = a.id
-        JOIN utaites u ON p.utaite_id = u.id
-        JOIN videos v ON p.video_id = v.id
-        WHERE a.name = :artist_name
-        ORDER BY p.date DESC
-        """
-        
-        results = db.execute(text(query), {"artist_name": name}).fetchall()
+        artist_id = name_cache.resolve(db, "artists", name)
+    except Exception as e:
+        logger.error(f"아티스트 ID 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"아티스트별 곡 조회 중 오류: {str(e)}")
+    if artist_id is None:
+        logger.info(f"아티스트별 곡 조회 성공: {name} - 0곡")
+        return []
+    return get_artist_performances(artist_id, db)
+
+@app.get("/artists/{artist_id}/performances")
+def get_artist_performances(artist_id: int, db: Session = Depends(get_read_db)):
+    """특정 아티스트의 모든 부른 기록 (ID 기준)"""
+    try:
+        query = queries.ARTIST_PERFORMANCES
+        
+        results = query.execute(db, {"artist_id": artist_id}).fetchall()
         
         performances = []
         for row in results:
@@ -314,6 +318,7 @@ def get_artist_songs(name: str, db: Session = Depends(get_db)):
                 song_id=row.song_id,
                 song_title=row.song_title,
                 song_artist=row.song_artist,
+                artist_id=row.artist_id,
                 utaite_id=row.utaite_id,
                 utaite_name=row.utaite_name,
                 video_id=row.video_id,
@@ -322,7 +327,7 @@ def get_artist_songs(name: str, db: Session = Depends(get_db)):
                 thumbnail_url=row.thumbnail_url
             ))
         
-        logger.info(f"아티스트별 곡 조회 성공: {name} - {len(performances)}곡")
+        logger.info(f"아티스트별 곡 조회 성공: {artist_id} - {len(performances)}곡")
         return performances
         
     except Exception as e:
@@ -332,28 +337,12 @@ def get_artist_songs(name: str, db: Session = Depends(get_db)):
 # === 우타이테 API ===
 
 @app.get("/utaites")
-def get_utaites(db: Session = Depends(get_db)):
+def get_utaites(db: Session = Depends(get_read_db)):
     """우타이테 목록과 통계"""
     try:
-        query = """
-        SELECT 
-            u.id,
-            u.name,
-            u.name_korean,
-            u.name_english,
-            u.name_romanized,
-            COALESCE(ust.total_performances, 0) as total_performances,
-            COALESCE(ust.unique_songs, 0) as unique_songs,
-            COALESCE(ust.unique_artists, 0) as unique_artists,
-            ust.latest_performance_date,
-            ust.first_performance_date
-        FROM utaites u
-        LEFT JOIN utaite_stats ust ON u.id = ust.id
-        WHERE COALESCE(ust.total_performances, 0) > 0
-        ORDER BY COALESCE(ust.total_performances, 0) DESC
-        """
-        
-        results = db.execute(text(query)).fetchall()
+        query = queries.UTAITES
+        
+        results = query.execute(db).fetchall()
         
         utaites = []
         for row in results:
@@ -362,15 +351,8 @@ def get_utaites(db: Session = Depends(get_db)):
             
             # 최신 공연 정보
             if row.latest_performance_date:
-                latest_query = """
-                SELECT v.thumbnail_url, sm.title
-                FROM performances p
-                JOIN videos v ON p.video_id = v.id
-                JOIN song_masters sm ON p.song_master_id = sm.id
-                WHERE p.utaite_id = :utaite_id AND p.date = :latest_date
-                LIMIT 1
-                """
-                latest_result = db.execute(text(latest_query), {
+                latest_query = queries.UTAITE_LATEST
+                latest_result = latest_query.execute(db, {
                     "utaite_id": row.id,
                     "latest_date": row.latest_performance_date
                 }).fetchone()
@@ -383,17 +365,8 @@ def get_utaites(db: Session = Depends(get_db)):
                     }
             
             # 인기 곡들
-            top_songs_query = """
-            SELECT sm.id, sm.title, a.name as artist_name, COUNT(p.id) as performance_count
-            FROM performances p
-            JOIN song_masters sm ON p.song_master_id = sm.id
-            JOIN artists a ON sm.artist_id = a.id
-            WHERE p.utaite_id = :utaite_id
-            GROUP BY sm.id, sm.title, a.name
-            ORDER BY COUNT(p.id) DESC
-            LIMIT 5
-            """
-            top_songs_results = db.execute(text(top_songs_query), {"utaite_id": row.id}).fetchall()
+            top_songs_query = queries.UTAITE_TOP_SONGS
+            top_songs_results = top_songs_query.execute(db, {"utaite_id": row.id}).fetchall()
             
             top_songs = [
                 {
@@ -427,33 +400,25 @@ def get_utaites(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"우타이테 목록 조회 중 오류: {str(e)}")
 
 @app.get("/utaites/songs")
-def get_utaite_songs(name: str, db: Session = Depends(get_db)):
-    """특정 우타이테의 모든 곡"""
+def get_utaite_songs(name: str, db: Session = Depends(get_read_db)):
+    """특정 우타이테의 모든 곡 (이름 -> ID는 name_cache)"""
+    try:
+        utaite_id = name_cache.resolve(db, "utaites", name)
+    except Exception as e:
+        logger.error(f"우타이테 ID 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"우타이테별 곡 조회 중 오류: {str(e)}")
+    if utaite_id is None:
+        logger.info(f"우타이테별 곡 조회 성공: {name} - 0곡")
+        return []
+    return get_utaite_performances(utaite_id, db)
+
+@app.get("/utaites/{utaite_id}/performances")
+def get_utaite_performances(utaite_id: int, db: Session = Depends(get_read_db)):
+    """특정 우타이테의 모든 부른 기록 (ID 기준)"""
     try:
-        query = """
-        SELECT 
-            p.id,
-            p.start_time,
-            p.date,
-            sm.id as song_id,
-            sm.title as song_title,
-            a.name as song_artist,
-            u.id as utaite_id,
-            u.name as utaite_name,
-            v.video_id,
-            v.title as video_title,
-            v.channel as video_channel,
-            v.thumbnail_url
-        FROM performances p
-        JOIN song_masters sm ON p.song_master_id = sm.id
-        JOIN artists a ON sm.artist_id = a.id
-        JOIN utaites u ON p.utaite_id = u.id
-        JOIN videos v ON p.video_id = v.id
-        WHERE u.name = :utaite_name
-        ORDER BY p.date DESC
-        """
-        
-        results = db.execute(text(query), {"utaite_name": name}).fetchall()
+        query = queries.UTAITE_PERFORMANCES
+        
+        results = query.execute(db, {"utaite_id": utaite_id}).fetchall()
         
         performances = []
         for row in results:
@@ -464,6 +429,7 @@ def get_utaite_songs(name: str, db: Session = Depends(get_db)):
                 song_id=row.song_id,
                 song_title=row.song_title,
                 song_artist=row.song_artist,
+                artist_id=row.artist_id,
                 utaite_id=row.utaite_id,
                 utaite_name=row.utaite_name,
                 video_id=row.video_id,
@@ -472,17 +438,45 @@ def get_utaite_songs(name: str, db: Session = Depends(get_db)):
                 thumbnail_url=row.thumbnail_url
             ))
         
-        logger.info(f"우타이테별 곡 조회 성공: {name} - {len(performances)}곡")
+        logger.info(f"우타이테별 곡 조회 성공: {utaite_id} - {len(performances)}곡")
         return performances
         
     except Exception as e:
         logger.error(f"우타이테별 곡 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"우타이테별 곡 조회 중 오류: {str(e)}")
 
+# === 비디오 API ===
+
+@app.get("/videos/{video_id}/setlist", response_model=VideoSetlist)
+def get_video_setlist(video_id: str, db: Session = Depends(get_read_db)):
+    """방송 한 편의 곡 목록 (재생 순서)"""
+    try:
+        video = queries.VIDEO.execute(db, {"video_id": video_id}).fetchone()
+        if not video:
+            raise HTTPException(status_code=404, detail="비디오를 찾을 수 없습니다")
+        
+        results = queries.VIDEO_SETLIST.execute(db, {"video_table_id": video.id}).fetchall()
+        songs = [SetlistEntry.model_validate(row._mapping) for row in results]
+        
+        logger.info(f"세트리스트 조회 성공: {video_id} - {len(songs)}곡")
+        return VideoSetlist(
+            video_id=video.video_id,
+            title=video.title,
+            channel=video.channel,
+            thumbnail_url=video.thumbnail_url,
+            songs=songs
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"세트리스트 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"세트리스트 조회 중 오류: {str(e)}")
+
 # === 기존 호환성 ===
 
 @app.get("/videos")
-def get_videos(db: Session = Depends(get_db)):
+def get_videos(db: Session = Depends(get_read_db)):
     """기존 호환성을 위한 비디오 엔드포인트"""
     return get_songs(db)
 
@@ -0,0 +1,75 @@
+"""
+이름 -> ID 프로세스 내 LRU 캐시
+/artists/songs?name=, /utaites/songs?name= 같은 이름 기반 엔드포인트가 이름을 한 번만 유니크 인덱스로 ID로 바꾸고
+이후에는 (ID, date DESC, id) 인덱스 쿼리 하나로 끝나도록 한다
+
+API 서버(main.py)는 읽기 전용이고 artists/utaites는 동기화/마이그레이션 스크립트가 다른 프로세스에서 바꾸므로
+캐시는 쓰기 이벤트로 비우지 않고 항목 만료 시간(NAME_CACHE_TTL)으로만 반영한다.
+이름이 바뀌거나 삭제되면 최대 TTL 동안 이전 ID가 쓰일 수 있고, 새 이름은 캐시하지 않아 바로 조회된다
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+import queries
+
+NAME_CACHE_SIZE = int(os.getenv("NAME_CACHE_SIZE", "4096"))
+NAME_CACHE_TTL = float(os.getenv("NAME_CACHE_TTL", "300"))
+
+class NameIdCache:
+    """이름 -> ID LRU (없는 이름은 캐시하지 않아 새로 추가된 이름은 바로 조회된다)"""
+
+    def __init__(self, maxsize: int = NAME_CACHE_SIZE, ttl: float = NAME_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, loader: Callable[[], Optional[int]]) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._entries[name] = (value, now + self.ttl)
+                self._entries.move_to_end(name)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# 테이블 이름 -> 캐시
+caches = {
+    "artists": NameIdCache(),
+    "utaites": NameIdCache(),
+}
+
+_LOOKUPS = {
+    "artists": queries.ARTIST_ID_BY_NAME,
+    "utaites": queries.UTAITE_ID_BY_NAME,
+}
+
+def resolve(db, table: str, name: str) -> Optional[int]:
+    """아티스트/우타이테 이름 -> ID (name 유니크 인덱스, 없으면 None)"""
+    return caches[table].get(name, lambda: _LOOKUPS[table].execute(db, {"name": name}).scalar())
+
+def invalidate_all():
+    for cache in caches.values():
+        cache.invalidate()
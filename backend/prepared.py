@@ -0,0 +1,66 @@
+"""
+서버 측 prepared statement
+queries.py의 엔드포인트 SQL을 연결마다 한 번 PREPARE하고 이후에는 EXECUTE만 보내
+요청마다 같은 문장을 다시 파싱/계획하지 않도록 한다
+(파라미터가 없는 문장은 첫 실행부터, 있는 문장은 PostgreSQL이 일반 계획을 고른 뒤부터 계획 단계를 건너뜀)
+
+PgBouncer transaction 모드처럼 연결이 세션을 유지하지 않는 환경에서는 PREPARED_STATEMENTS=0으로 끈다
+
+준비된 문장은 DEALLOCATE하지 않고 연결이 살아 있는 동안 유지된다. 마이그레이션으로 문장이 읽는 테이블/뷰의
+결과 컬럼이 바뀌면 PostgreSQL은 그 연결의 EXECUTE를 "cached plan must not change result type"으로 거부하는데,
+이 경우 해당 풀 연결을 폐기(invalidate)해 서버 세션과 준비된 문장을 모두 버리고, 세션을 롤백한 뒤
+새 연결에서 다시 PREPARE해 한 번 재시도한다. 롤백 후 재시도하므로 읽기 세션(get_read_db)에서만 사용한다
+"""
+
+import os
+import re
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+PREPARED_STATEMENTS = os.getenv("PREPARED_STATEMENTS", "1").lower() not in ("0", "false", "no")
+
+# :name 바인드 파라미터 (:: 캐스트 제외)
+_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+def _is_stale_plan(error: DBAPIError) -> bool:
+    """스키마 변경으로 준비된 문장의 결과 형식이 바뀐 경우 (SQLSTATE 0A000 feature_not_supported)"""
+    return getattr(error.orig, "pgcode", None) == "0A000" and "cached plan must not change result type" in str(error.orig)
+
+class PreparedQuery:
+    """이름이 붙은 엔드포인트 SQL (sql은 EXPLAIN 검사/벤치마크가 그대로 사용)"""
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self.statement = text(sql)
+
+        params = list(dict.fromkeys(_PARAM.findall(sql)))
+        positions = {param: i + 1 for i, param in enumerate(params)}
+        self.prepare_sql = f"PREPARE {name} AS " + _PARAM.sub(lambda m: f"${positions[m.group(1)]}", sql)
+        arguments = f"({', '.join(':' + param for param in params)})" if params else ""
+        self.execute_statement = text(f"EXECUTE {name}{arguments}")
+
+    def execute(self, db: Session, params: Optional[dict] = None, retry: bool = True):
+        if not PREPARED_STATEMENTS:
+            return db.execute(self.statement, params or {})
+
+        # 준비된 문장 이름은 DBAPI 연결(세션)에 묶이므로 풀 연결의 info에 기록
+        connection = db.connection()
+        prepared = connection.connection.info.setdefault("prepared_statements", set())
+        if self.name not in prepared:
+            connection.exec_driver_sql(self.prepare_sql)
+            prepared.add(self.name)
+        try:
+            return db.execute(self.execute_statement, params or {})
+        except DBAPIError as e:
+            if not retry or not _is_stale_plan(e):
+                raise
+            # 트랜잭션이 중단돼 DEALLOCATE도 보낼 수 없으므로 연결째 버리고 새 연결에서 다시 준비
+            connection.invalidate()
+            db.rollback()
+            return self.execute(db, params, retry=False)
+
+    def __str__(self):
+        return self.sql
@@ -0,0 +1,189 @@
+"""
+PostgreSQL 엔드포인트 SQL
+main.py의 엔드포인트와 scripts/check_query_plans.py(EXPLAIN 검사)가 같은 문장을 쓰도록 한곳에 모은다
+
+부른 기록 목록은 트리거가 유지하는 비정규화 테이블 performance_details 하나만
+(필터 키, date DESC, id) 인덱스 순서로 읽는다 (곡/아티스트/우타이테/비디오 조인 없음).
+각 문장은 PreparedQuery로 감싸 연결마다 한 번만 PREPARE한다 (prepared.py)
+"""
+
+from prepared import PreparedQuery
+
+# 부른 기록 상세 (PerformanceDetail) 공통 SELECT
+PERFORMANCE_DETAIL_SELECT = """
+SELECT
+    id,
+    start_time,
+    date,
+    song_master_id as song_id,
+    song_title,
+    artist_name as song_artist,
+    artist_id,
+    utaite_id,
+    utaite_name,
+    video_id,
+    video_title,
+    video_channel,
+    thumbnail_url
+FROM performance_details
+"""
+
+# 모든 부른 기록 - (date DESC, id) 인덱스 순서
+SONGS = PreparedQuery("songs", PERFORMANCE_DETAIL_SELECT + """
+ORDER BY date DESC, id
+""")
+
+SONGS_MASTER = PreparedQuery("songs_master", """
+SELECT
+    sm.id,
+    sm.title,
+    sm.title_korean,
+    sm.title_english,
+    sm.title_romanized,
+    a.name as artist_name,
+    a.name_korean as artist_name_korean,
+    a.name_english as artist_name_english,
+    a.name_romanized as artist_name_romanized,
+    sm.album_art_url,
+    sm.tags,
+    COALESCE(ss.performance_count, 0) as performance_count,
+    sm.created_at,
+    sm.updated_at
+FROM song_masters sm
+JOIN artists a ON sm.artist_id = a.id
+LEFT JOIN song_stats ss ON sm.id = ss.id
+ORDER BY COALESCE(ss.performance_count, 0) DESC
+""")
+
+# 특정 곡의 부른 기록 - (song_master_id, date DESC, id) 인덱스
+SONGS_BY_MASTER = PreparedQuery("songs_by_master", PERFORMANCE_DETAIL_SELECT + """
+WHERE song_master_id = :song_master_id
+ORDER BY date DESC, id
+""")
+
+ARTISTS = PreparedQuery("artists", """
+SELECT * FROM artist_stats WHERE total_performances > 0 ORDER BY total_performances DESC
+""")
+
+# 곡 마스터 한 건 - song_masters 기본 키 + (song_master_id, ...) 인덱스 범위 COUNT
+SONG_MASTER = PreparedQuery("song_master", """
+SELECT
+    sm.id,
+    sm.title,
+    sm.title_korean,
+    sm.title_english,
+    sm.title_romanized,
+    sm.artist_id,
+    a.name as artist_name,
+    a.name_korean as artist_name_korean,
+    a.name_english as artist_name_english,
+    a.name_romanized as artist_name_romanized,
+    sm.album_art_url,
+    sm.tags,
+    (SELECT COUNT(*) FROM performance_details pd WHERE pd.song_master_id = sm.id) as performance_count,
+    sm.created_at,
+    sm.updated_at
+FROM song_masters sm
+JOIN artists a ON sm.artist_id = a.id
+WHERE sm.id = :song_master_id
+""")
+
+# 같은 아티스트의 다른 곡 - song_masters(artist_id) 인덱스
+SONG_MASTER_RELATED = PreparedQuery("song_master_related", """
+SELECT
+    sm.id,
+    sm.title,
+    sm.title_korean,
+    sm.title_english,
+    sm.title_romanized,
+    sm.album_art_url,
+    sm.tags,
+    (SELECT COUNT(*) FROM performance_details pd WHERE pd.song_master_id = sm.id) as performance_count
+FROM song_masters sm
+WHERE sm.artist_id = :artist_id AND sm.id <> :song_master_id
+ORDER BY performance_count DESC, sm.id
+LIMIT :limit
+""")
+
+# 특정 아티스트의 부른 기록 - (artist_id, date DESC, id) 인덱스 (이름은 name_cache로 ID 변환)
+ARTIST_PERFORMANCES = PreparedQuery("artist_performances", PERFORMANCE_DETAIL_SELECT + """
+WHERE artist_id = :artist_id
+ORDER BY date DESC, id
+""")
+
+UTAITES = PreparedQuery("utaites", """
+SELECT
+    u.id,
+    u.name,
+    u.name_korean,
+    u.name_english,
+    u.name_romanized,
+    COALESCE(ust.total_performances, 0) as total_performances,
+    COALESCE(ust.unique_songs, 0) as unique_songs,
+    COALESCE(ust.unique_artists, 0) as unique_artists,
+    ust.latest_performance_date,
+    ust.first_performance_date
+FROM utaites u
+LEFT JOIN utaite_stats ust ON u.id = ust.id
+WHERE COALESCE(ust.total_performances, 0) > 0
+ORDER BY COALESCE(ust.total_performances, 0) DESC
+""")
+
+# 우타이테의 최신 부른 기록 한 건 - (utaite_id, date DESC, id) 인덱스 첫 행
+UTAITE_LATEST = PreparedQuery("utaite_latest", """
+SELECT thumbnail_url, song_title as title
+FROM performance_details
+WHERE utaite_id = :utaite_id AND date = :latest_date
+ORDER BY date DESC, id
+LIMIT 1
+""")
+
+# 우타이테의 인기 곡 - (utaite_id, ...) 인덱스 범위만 읽고 집계
+UTAITE_TOP_SONGS = PreparedQuery("utaite_top_songs", """
+SELECT song_master_id as id, song_title as title, artist_name, COUNT(*) as performance_count
+FROM performance_details
+WHERE utaite_id = :utaite_id
+GROUP BY song_master_id, song_title, artist_name
+ORDER BY COUNT(*) DESC
+LIMIT 5
+""")
+
+# 특정 우타이테의 부른 기록 - (utaite_id, date DESC, id) 인덱스 (이름은 name_cache로 ID 변환)
+UTAITE_PERFORMANCES = PreparedQuery("utaite_performances", PERFORMANCE_DETAIL_SELECT + """
+WHERE utaite_id = :utaite_id
+ORDER BY date DESC, id
+""")
+
+# 비디오 한 건 - videos.video_id 유니크 인덱스
+VIDEO = PreparedQuery("video", """
+SELECT id, video_id, title, channel, thumbnail_url
+FROM videos
+WHERE video_id = :video_id
+""")
+
+# 비디오 세트리스트 - (video_table_id, start_time_seconds, id) INCLUDE 인덱스로 재생 순서대로 index-only scan
+VIDEO_SETLIST = PreparedQuery("video_setlist", """
+SELECT
+    id,
+    start_time,
+    start_time_seconds,
+    date,
+    song_master_id as song_id,
+    song_title,
+    artist_name as song_artist,
+    album_art_url,
+    utaite_id,
+    utaite_name
+FROM performance_details
+WHERE video_table_id = :video_table_id
+ORDER BY start_time_seconds, id
+""")
+
+# 이름 -> ID (name 유니크 인덱스) - name_cache가 캐시 미스일 때 사용
+ARTIST_ID_BY_NAME = PreparedQuery("artist_id_by_name", """
+SELECT id FROM artists WHERE name = :name
+""")
+
+UTAITE_ID_BY_NAME = PreparedQuery("utaite_id_by_name", """
+SELECT id FROM utaites WHERE name = :name
+""")
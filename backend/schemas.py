@@ -111,6 +111,7 @@ class PerformanceDetail(BaseModel):
     song_id: int  # song_master_id의 별칭
     song_title: str
     song_artist: str
+    artist_id: Optional[int] = None
     utaite_id: int
     utaite_name: str
     video_id: str  # video.video_id (YouTube ID)
@@ -121,10 +122,33 @@ class PerformanceDetail(BaseModel):
     class Config:
         from_attributes = True
 
+class SetlistEntry(BaseModel):
+    id: int
+    start_time: str
+    start_time_seconds: int
+    date: datetime
+    song_id: int
+    song_title: str
+    song_artist: str
+    album_art_url: Optional[str] = None
+    utaite_id: int
+    utaite_name: str
+    
+    class Config:
+        from_attributes = True
+
+class VideoSetlist(BaseModel):
+    video_id: str  # YouTube ID
+    title: str
+    channel: Optional[str]
+    thumbnail_url: Optional[str]
+    songs: List[SetlistEntry]  # 재생 순서
+
 class SongMasterDetail(BaseModel):
     id: int
     titles: dict  # {"original": title, "korean": title_korean, ...}
     artist: dict  # {"original": artist_name, "korean": artist_name_korean, ...}
+    artist_id: Optional[int] = None
     tags: List[str]
     performance_count: int
     album_art_url: Optional[str] = None
@@ -132,6 +156,9 @@ class SongMasterDetail(BaseModel):
     class Config:
         from_attributes = True
 
+class SongMasterPage(SongMasterDetail):
+    related_songs: List[SongMasterDetail] = []  # 같은 아티스트의 다른 곡 (부른 횟수 순)
+
 class ArtistWithStats(BaseModel):
     id: int
     name: str
@@ -0,0 +1,588 @@
+"""
+SQLite 저장소 엔진
+JSON 파일 대신 표준 라이브러리 sqlite3 (WAL 모드)로 DataManager와 같은 인터페이스를 제공
+테이블/인덱스는 scripts/init.sql과 같은 구조이고, ID는 JSON 저장소의 문자열 ID를 그대로 사용
+"""
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from models import *
+from aggregation import aggregate_stats
+from columnar import date_to_epoch
+from data_manager import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+# 다국어 dict 키 -> 컬럼 접미사 (init.sql의 name/name_korean/... 구조)
+LANGUAGE_COLUMNS = {'original': '', 'korean': '_korean', 'english': '_english', 'romanized': '_romanized'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artists (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    name_korean TEXT,
+    name_english TEXT,
+    name_romanized TEXT,
+    song_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS utaites (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    name_korean TEXT,
+    name_english TEXT,
+    name_romanized TEXT,
+    performance_count INTEGER NOT NULL DEFAULT 0,
+    first_appearance TEXT,
+    latest_appearance TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+-- artist_name* 컬럼은 JSON 곡 마스터의 artist dict (기존 호환성)
+CREATE TABLE IF NOT EXISTS song_masters (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_korean TEXT,
+    title_english TEXT,
+    title_romanized TEXT,
+    artist_id TEXT REFERENCES artists(id),
+    artist_name TEXT,
+    artist_name_korean TEXT,
+    artist_name_english TEXT,
+    artist_name_romanized TEXT,
+    album_art_url TEXT,
+    tags TEXT NOT NULL DEFAULT '[]', -- JSON 배열
+    performance_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+-- id가 유튜브 비디오 ID라 init.sql의 idx_videos_video_id는 기본키가 대신한다
+CREATE TABLE IF NOT EXISTS videos (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    channel TEXT,
+    thumbnail_url TEXT,
+    duration INTEGER,
+    published_at TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS performances (
+    id TEXT PRIMARY KEY,
+    song_master_id TEXT NOT NULL REFERENCES song_masters(id),
+    utaite_id TEXT NOT NULL REFERENCES utaites(id),
+    video_id TEXT NOT NULL REFERENCES videos(id),
+    start_time TEXT NOT NULL,
+    start_time_seconds INTEGER,
+    date TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    date_epoch INTEGER NOT NULL DEFAULT 0 -- date의 epoch 마이크로초 (시간대 없는 값은 UTC, columnar.date_to_epoch)
+);
+
+CREATE INDEX IF NOT EXISTS idx_song_masters_artist_id ON song_masters(artist_id);
+CREATE INDEX IF NOT EXISTS idx_performances_song_master_id ON performances(song_master_id);
+CREATE INDEX IF NOT EXISTS idx_performances_utaite_id ON performances(utaite_id);
+CREATE INDEX IF NOT EXISTS idx_performances_video_id ON performances(video_id);
+CREATE INDEX IF NOT EXISTS idx_performances_date ON performances(date);
+
+-- 이름 기반 조회/필터와 우타이테별 최초/최신 날짜용
+CREATE INDEX IF NOT EXISTS idx_song_masters_title_artist_name ON song_masters(title, artist_name);
+CREATE INDEX IF NOT EXISTS idx_song_masters_artist_name ON song_masters(artist_name);
+CREATE INDEX IF NOT EXISTS idx_performances_utaite_date ON performances(utaite_id, date);
+"""
+
+# 이전 버전 DB에 없는 컬럼의 인덱스 (컬럼을 추가한 뒤 만든다)
+EPOCH_INDEX = "CREATE INDEX IF NOT EXISTS idx_performances_utaite_date_epoch ON performances(utaite_id, date_epoch)"
+
+# 우타이테별 최초/최신 날짜 - JSON 저장소와 같이 epoch 순으로 고르고, 같은 시각이면 먼저 저장된 표기를 쓴다
+FIRST_APPEARANCE_SQL = "(SELECT date FROM performances WHERE utaite_id = {id} ORDER BY date_epoch, rowid LIMIT 1)"
+LATEST_APPEARANCE_SQL = "(SELECT date FROM performances WHERE utaite_id = {id} ORDER BY date_epoch DESC, rowid LIMIT 1)"
+
+UTAITE_COLUMNS = ['id', 'name', 'name_korean', 'name_english', 'name_romanized',
+                  'performance_count', 'first_appearance', 'latest_appearance', 'created_at', 'updated_at']
+ARTIST_COLUMNS = ['id', 'name', 'name_korean', 'name_english', 'name_romanized',
+                  'song_count', 'created_at', 'updated_at']
+SONG_COLUMNS = ['id', 'title', 'title_korean', 'title_english', 'title_romanized', 'artist_id',
+                'artist_name', 'artist_name_korean', 'artist_name_english', 'artist_name_romanized',
+                'album_art_url', 'tags', 'performance_count', 'created_at', 'updated_at']
+VIDEO_COLUMNS = ['id', 'title', 'channel', 'thumbnail_url', 'duration', 'published_at', 'created_at', 'updated_at']
+PERFORMANCE_COLUMNS = ['id', 'song_master_id', 'utaite_id', 'video_id', 'start_time', 'start_time_seconds',
+                       'date', 'created_at', 'updated_at']
+# 저장할 때는 정렬/집계용 date_epoch도 함께 쓴다
+PERFORMANCE_WRITE_COLUMNS = PERFORMANCE_COLUMNS + ['date_epoch']
+DATE_STAT_FIELDS = ('first_appearance', 'latest_appearance')
+
+def _to_columns(names: Dict[str, str], required: bool = False) -> Tuple:
+    """다국어 dict -> (원어, 한국어, 영어, 로마자) 컬럼 값 (없는 언어는 NULL)"""
+    values = tuple(names.get(language) for language in LANGUAGE_COLUMNS)
+    if required and values[0] is None:
+        return ('',) + values[1:]
+    return values
+
+def _from_columns(row: sqlite3.Row, prefix: str) -> Dict[str, str]:
+    """컬럼 값 -> 다국어 dict (NULL 언어는 제외)"""
+    names = {}
+    for language, suffix in LANGUAGE_COLUMNS.items():
+        value = row[f"{prefix}{suffix}"]
+        if value is not None:
+            names[language] = value
+    return names
+
+def _name_expression(column: str, language: str) -> str:
+    """언어별 이름 선택 SQL (해당 언어가 비어 있으면 원어)"""
+    suffix = LANGUAGE_COLUMNS.get(language)
+    if not suffix:
+        return f"COALESCE({column}, '')"
+    return f"COALESCE(NULLIF({column}{suffix}, ''), {column}, '')"
+
+class SQLiteDataManager:
+    """SQLite (WAL 모드) 기반 데이터 매니저 - DataManager와 같은 load_*/save_*/find_or_create_* 인터페이스"""
+
+    def __init__(self, db_path: str = "data/utawakufinder.db"):
+        self.db_path = db_path
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩 연다
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._connection().executescript(SCHEMA)
+        self._migrate()
+
+    # === Connection ===
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: 트랜잭션은 _transaction에서 명시적으로 연다
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self):
+        """이전 버전 DB에 date_epoch 컬럼 추가 후 기존 기록의 값 채우기"""
+        conn = self._connection()
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(performances)")}
+        if 'date_epoch' not in columns:
+            with self._transaction() as conn:
+                conn.execute("ALTER TABLE performances ADD COLUMN date_epoch INTEGER NOT NULL DEFAULT 0")
+                rows = conn.execute("SELECT id, date FROM performances").fetchall()
+                conn.executemany("UPDATE performances SET date_epoch = ? WHERE id = ?",
+                                 [(date_to_epoch(row['date']), row['id']) for row in rows])
+            logger.info(f"performances.date_epoch 컬럼 추가: {len(rows)}건 채움")
+        conn.execute(EPOCH_INDEX)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """쓰기 트랜잭션 (시작 시 쓰기 락을 잡아 다른 쓰기와 직렬화)
+
+        이미 write_lock으로 트랜잭션이 열려 있으면 그 트랜잭션에 합류하고, 커밋/롤백은 바깥에서 한다
+        """
+        conn = self._connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def write_lock(self):
+        """쓰기 락 - 읽기-수정-쓰기 전체를 BEGIN IMMEDIATE 트랜잭션 하나로 감싼다
+
+        SQLite 쓰기 락은 데이터베이스 파일에 걸리므로 다른 프로세스의 쓰기와도 직렬화되고,
+        블록 안의 중복 확인/엔티티 조회가 커밋 시점까지 유효하다.
+        블록이 예외로 끝나면 롤백한다.
+        """
+        with self._write_lock, self._transaction():
+            yield
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        return self._connection().execute(sql, params).fetchall()
+
+    def clear_cache(self):
+        """인터페이스 호환용 (SQLite 엔진은 별도 캐시 없음)"""
+
+    # === Row Mapping ===
+    def _utaite_row(self, utaite: Utaite) -> Tuple:
+        return (utaite.id, *_to_columns(utaite.names, required=True), utaite.performance_count,
+                utaite.first_appearance, utaite.latest_appearance, utaite.created_at, utaite.updated_at)
+
+    def _artist_row(self, artist: Artist) -> Tuple:
+        return (artist.id, *_to_columns(artist.names, required=True), artist.song_count,
+                artist.created_at, artist.updated_at)
+
+    def _song_row(self, song: SongMaster) -> Tuple:
+        return (song.id, *_to_columns(song.titles, required=True), song.artist_id, *_to_columns(song.artist or {}),
+                song.album_art_url, json.dumps(song.tags, ensure_ascii=False), song.performance_count,
+                song.created_at, song.updated_at)
+
+    def _video_row(self, video: Video) -> Tuple:
+        return (video.id, video.title, video.channel, video.thumbnail_url, video.duration,
+                video.published_at, video.created_at, video.updated_at)
+
+    def _performance_row(self, perf: Performance) -> Tuple:
+        start_time_seconds = perf.start_time_seconds
+        if start_time_seconds is None:
+            start_time_seconds = time_to_seconds(perf.start_time)
+        return (perf.id, perf.song_master_id, perf.utaite_id, perf.video_id, perf.start_time,
+                start_time_seconds, perf.date, perf.created_at, perf.updated_at, date_to_epoch(perf.date))
+
+    def _utaite_from_row(self, row: sqlite3.Row) -> Utaite:
+        return Utaite(id=row['id'], names=_from_columns(row, 'name'), performance_count=row['performance_count'],
+                      first_appearance=row['first_appearance'], latest_appearance=row['latest_appearance'],
+                      created_at=row['created_at'], updated_at=row['updated_at'])
+
+    def _artist_from_row(self, row: sqlite3.Row) -> Artist:
+        return Artist(id=row['id'], names=_from_columns(row, 'name'), song_count=row['song_count'],
+                      created_at=row['created_at'], updated_at=row['updated_at'])
+
+    def _song_from_row(self, row: sqlite3.Row) -> SongMaster:
+        return SongMaster(id=row['id'], titles=_from_columns(row, 'title'), artist=_from_columns(row, 'artist_name'),
+                          artist_id=row['artist_id'], tags=json.loads(row['tags']),
+                          performance_count=row['performance_count'], album_art_url=row['album_art_url'],
+                          created_at=row['created_at'], updated_at=row['updated_at'])
+
+    def _video_from_row(self, row: sqlite3.Row) -> Video:
+        return Video(**{column: row[column] for column in VIDEO_COLUMNS})
+
+    def _performance_from_row(self, row: sqlite3.Row) -> Performance:
+        return Performance(**{column: row[column] for column in PERFORMANCE_COLUMNS})
+
+    def _insert(self, conn: sqlite3.Connection, table: str, columns: List[str], rows: List[Tuple], conflict: str = "ABORT"):
+        placeholders = ", ".join("?" for _ in columns)
+        conn.executemany(
+            f"INSERT OR {conflict} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            rows
+        )
+
+    # === Load Methods ===
+    def load_utaites(self) -> List[Utaite]:
+        """우타이테 마스터 로드"""
+        return [self._utaite_from_row(row) for row in self._query("SELECT * FROM utaites ORDER BY rowid")]
+
+    def load_artists(self) -> List[Artist]:
+        """아티스트 마스터 로드"""
+        return [self._artist_from_row(row) for row in self._query("SELECT * FROM artists ORDER BY rowid")]
+
+    def load_songs_master(self) -> List[SongMaster]:
+        """곡 마스터 로드"""
+        return [self._song_from_row(row) for row in self._query("SELECT * FROM song_masters ORDER BY rowid")]
+
+    def load_videos(self) -> List[Video]:
+        """비디오 마스터 로드"""
+        return [self._video_from_row(row) for row in self._query("SELECT * FROM videos ORDER BY rowid")]
+
+    def load_performances(self) -> List[Performance]:
+        """부른 기록 로드"""
+        return [self._performance_from_row(row) for row in self._query("SELECT * FROM performances ORDER BY rowid")]
+
+    def load_performance_records(self) -> List[dict]:
+        """부른 기록 원본 레코드 (JSON 저장소와 같은 형식)"""
+        rows = self._query("SELECT id, song_master_id, utaite_id, video_id, start_time, date FROM performances ORDER BY rowid")
+        return [dict(row) for row in rows]
+
+    # === Save Methods ===
+    def _replace_all(self, table: str, columns: List[str], rows: List[Tuple], label: str):
+        try:
+            with self._transaction() as conn:
+                conn.execute(f"DELETE FROM {table}")
+                self._insert(conn, table, columns, rows)
+        except Exception as e:
+            logger.error(f"{label} 저장 실패: {e}")
+            raise
+
+    def save_utaites(self, utaites: List[Utaite]):
+        """우타이테 마스터 저장"""
+        self._replace_all('utaites', UTAITE_COLUMNS, [self._utaite_row(u) for u in utaites], '우타이테')
+
+    def save_artists(self, artists: List[Artist]):
+        """아티스트 마스터 저장"""
+        self._replace_all('artists', ARTIST_COLUMNS, [self._artist_row(a) for a in artists], '아티스트')
+
+    def save_songs_master(self, songs: List[SongMaster]):
+        """곡 마스터 저장"""
+        self._replace_all('song_masters', SONG_COLUMNS, [self._song_row(s) for s in songs], '곡 마스터')
+
+    def save_videos(self, videos: List[Video]):
+        """비디오 마스터 저장"""
+        self._replace_all('videos', VIDEO_COLUMNS, [self._video_row(v) for v in videos], '비디오')
+
+    def save_performances(self, performances: List[Performance]):
+        """부른 기록 저장"""
+        self._replace_all('performances', PERFORMANCE_WRITE_COLUMNS, [self._performance_row(p) for p in performances], '부른 기록')
+
+    def add_performances(self, new_performances: List[Performance]):
+        """부른 기록 추가"""
+        with self._transaction() as conn:
+            self._insert(conn, 'performances', PERFORMANCE_WRITE_COLUMNS,
+                         [self._performance_row(p) for p in new_performances])
+
+    def remove_performances(self, performance_ids: List[str]) -> List[Performance]:
+        """부른 기록 삭제 후 삭제된 기록 반환"""
+        with self._transaction() as conn:
+            return self._delete_performances(conn, performance_ids)
+
+    def _delete_performances(self, conn: sqlite3.Connection, performance_ids: List[str]) -> List[Performance]:
+        removed = []
+        for perf_id in performance_ids:
+            row = conn.execute("SELECT * FROM performances WHERE id = ?", (perf_id,)).fetchone()
+            if row:
+                removed.append(self._performance_from_row(row))
+        conn.executemany("DELETE FROM performances WHERE id = ?", [(p.id,) for p in removed])
+        return removed
+
+    def compact_performances(self):
+        """WAL 체크포인트 (JSON 저장소의 저널 압축에 해당)"""
+        self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def import_from(self, manager):
+        """다른 데이터 매니저(JSON 등)의 전체 데이터를 한 트랜잭션으로 가져오기"""
+        with self._transaction() as conn:
+            for table in ('performances', 'videos', 'song_masters', 'utaites', 'artists'):
+                conn.execute(f"DELETE FROM {table}")
+            self._insert(conn, 'artists', ARTIST_COLUMNS, [self._artist_row(a) for a in manager.load_artists()])
+            self._insert(conn, 'utaites', UTAITE_COLUMNS, [self._utaite_row(u) for u in manager.load_utaites()])
+            self._insert(conn, 'song_masters', SONG_COLUMNS, [self._song_row(s) for s in manager.load_songs_master()])
+            self._insert(conn, 'videos', VIDEO_COLUMNS, [self._video_row(v) for v in manager.load_videos()])
+            self._insert(conn, 'performances', PERFORMANCE_WRITE_COLUMNS,
+                         [self._performance_row(p) for p in manager.load_performances()], conflict="REPLACE")
+
+    # === Helper Methods ===
+    def count_performances(self) -> int:
+        """전체 부른 기록 수"""
+        return self._query("SELECT COUNT(*) FROM performances")[0][0]
+
+    def get_video_performances(self, video_id: str) -> List[Performance]:
+        """특정 비디오의 부른 기록"""
+        rows = self._query("SELECT * FROM performances WHERE video_id = ? ORDER BY rowid", (video_id,))
+        return [self._performance_from_row(row) for row in rows]
+
+    def get_performances_with_details(self, language: str = "original",
+                                      utaite_id: Optional[str] = None,
+                                      song_id: Optional[str] = None,
+                                      video_id: Optional[str] = None,
+                                      artist_name: Optional[str] = None,
+                                      utaite_name: Optional[str] = None,
+                                      newest_first: bool = False) -> List[PerformanceWithDetails]:
+        """조인된 상세 부른 기록 반환 (필터는 인덱스 조건으로 변환, 여러 필터는 AND, newest_first면 날짜 최신순)"""
+        song_artist = _name_expression('sm.artist_name', language)
+        utaite_display = _name_expression('u.name', language)
+
+        conditions, params = [], []
+        if utaite_id is not None:
+            conditions.append("p.utaite_id = ?")
+            params.append(utaite_id)
+        if song_id is not None:
+            conditions.append("p.song_master_id = ?")
+            params.append(song_id)
+        if video_id is not None:
+            conditions.append("p.video_id = ?")
+            params.append(video_id)
+        if artist_name is not None:
+            conditions.append("sm.artist_name = ?" if language == 'original' else f"{song_artist} = ?")
+            params.append(artist_name)
+        if utaite_name is not None:
+            conditions.append("u.name = ?" if language == 'original' else f"{utaite_display} = ?")
+            params.append(utaite_name)
+
+        query = f"""
+        SELECT
+            p.id,
+            p.start_time,
+            p.date,
+            p.video_id,
+            sm.id AS song_id,
+            {_name_expression('sm.title', language)} AS song_title,
+            {song_artist} AS song_artist,
+            u.id AS utaite_id,
+            {utaite_display} AS utaite_name,
+            v.title AS video_title,
+            v.channel AS video_channel,
+            v.thumbnail_url
+        FROM performances p
+        JOIN song_masters sm ON sm.id = p.song_master_id
+        JOIN utaites u ON u.id = p.utaite_id
+        LEFT JOIN videos v ON v.id = p.video_id
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY {"p.date_epoch DESC, " if newest_first else ""}p.rowid
+        """
+
+        return [
+            PerformanceWithDetails(
+                id=row['id'],
+                start_time=row['start_time'],
+                date=row['date'],
+                song_id=row['song_id'],
+                song_title=row['song_title'],
+                song_artist=row['song_artist'],
+                utaite_id=row['utaite_id'],
+                utaite_name=row['utaite_name'],
+                video_id=row['video_id'],
+                video_title=row['video_title'] or '',
+                video_channel=row['video_channel'] or '',
+                thumbnail_url=row['thumbnail_url'] or f"https://img.youtube.com/vi/{row['video_id']}/mqdefault.jpg"
+            )
+            for row in self._query(query, tuple(params))
+        ]
+
+    # === Statistics ===
+    def get_aggregated_stats(self) -> Tuple[List[ArtistWithStats], List[UtaiteWithStats]]:
+        """아티스트/우타이테 통계 (한 번 훑는 집계)"""
+        return aggregate_stats(self.load_performances(), self.load_songs_master(), self.load_artists(), self.load_utaites())
+
+    def recompute_statistics(self) -> Dict[str, Dict[str, dict]]:
+        """전체 부른 기록에서 통계를 처음부터 다시 계산 (검증용)"""
+        utaites = self._query(f"""
+            SELECT u.id,
+                (SELECT COUNT(*) FROM performances WHERE utaite_id = u.id) AS performance_count,
+                {FIRST_APPEARANCE_SQL.format(id='u.id')} AS first_appearance,
+                {LATEST_APPEARANCE_SQL.format(id='u.id')} AS latest_appearance
+            FROM utaites u
+        """)
+        songs = self._query("""
+            SELECT sm.id, COUNT(p.id) AS performance_count
+            FROM song_masters sm LEFT JOIN performances p ON p.song_master_id = sm.id
+            GROUP BY sm.id
+        """)
+        artists = self._query("""
+            SELECT a.id, COUNT(sm.id) AS song_count
+            FROM artists a
+            LEFT JOIN song_masters sm ON sm.artist_id = a.id OR (sm.artist_id IS NULL AND sm.artist_name = a.name)
+            GROUP BY a.id
+        """)
+        return {
+            'utaites': {row['id']: {k: row[k] for k in ('performance_count', 'first_appearance', 'latest_appearance')} for row in utaites},
+            'songs': {row['id']: {'performance_count': row['performance_count']} for row in songs},
+            'artists': {row['id']: {'song_count': row['song_count']} for row in artists},
+        }
+
+    def verify_statistics(self, fix: bool = False) -> List[dict]:
+        """저장된 통계와 전체 재계산 결과 비교 (fix=True면 어긋난 값 바로잡기)"""
+        expected = self.recompute_statistics()
+        tables = {'utaites': 'utaites', 'songs': 'song_masters', 'artists': 'artists'}
+
+        drift = []
+        for entity, table in tables.items():
+            fields = list(next(iter(expected[entity].values()), {}).keys())
+            if not fields:
+                continue
+            for row in self._query(f"SELECT id, {', '.join(fields)} FROM {table}"):
+                for field in fields:
+                    value = expected[entity][row['id']][field]
+                    stored = row[field]
+                    if field in DATE_STAT_FIELDS and stored is not None and value is not None:
+                        # 같은 시각의 다른 표기는 불일치가 아니다 (JSON 저장소와 같은 기준)
+                        same = date_to_epoch(stored) == date_to_epoch(value)
+                    else:
+                        same = stored == value
+                    if not same:
+                        drift.append({'entity': entity, 'id': row['id'], 'field': field, 'stored': row[field], 'expected': value})
+
+        if drift and fix:
+            with self._transaction() as conn:
+                for item in drift:
+                    conn.execute(f"UPDATE {tables[item['entity']]} SET {item['field']} = ? WHERE id = ?",
+                                 (item['expected'], item['id']))
+        if drift:
+            logger.warning(f"통계 불일치 {len(drift)}건 발견" + (" - 수정 완료" if fix else ""))
+        return drift
+
+    # === Find or Create ===
+    def find_utaite_id(self, name: str) -> Optional[str]:
+        """원어 이름으로 우타이테 ID 찾기"""
+        row = self._connection().execute("SELECT id FROM utaites WHERE name = ?", (name,)).fetchone()
+        return row['id'] if row else None
+
+    def find_artist_id(self, name: str) -> Optional[str]:
+        """원어 이름으로 아티스트 ID 찾기"""
+        row = self._connection().execute("SELECT id FROM artists WHERE name = ?", (name,)).fetchone()
+        return row['id'] if row else None
+
+    def find_song_master_id(self, title: str, artist_name: str) -> Optional[str]:
+        """원어 제목 + 아티스트 이름으로 곡 ID 찾기"""
+        row = self._connection().execute(
+            "SELECT id FROM song_masters WHERE title = ? AND artist_name = ? ORDER BY rowid LIMIT 1",
+            (title, artist_name)
+        ).fetchone()
+        return row['id'] if row else None
+
+    def find_or_create_utaite(self, name: str) -> str:
+        """우타이테 찾기 또는 생성"""
+        with self.unit_of_work() as uow:
+            return uow.utaite_id(name)
+
+    def find_or_create_artist(self, name: str) -> str:
+        """아티스트 찾기 또는 생성"""
+        with self.unit_of_work() as uow:
+            return uow.artist_id(name)
+
+    # === Batch Writes ===
+    def write_batch(self, removed_ids: Iterable[str], utaites: Iterable[Utaite], artists: Iterable[Artist],
+                    songs: Iterable[SongMaster], performances: List[Performance]) -> Tuple[List[Performance], List[SongMaster]]:
+        """작업 단위 변경을 한 트랜잭션으로 쓰기 (삭제된 기록, 실제로 추가된 곡 반환)
+
+        write_lock 안에서 부르면 그 트랜잭션에 합류한다.
+        이미 있는 우타이테/아티스트/곡은 건너뛰고, 같은 ID의 부른 기록이 있으면 예외로 전체 롤백한다.
+        """
+        with self._transaction() as conn:
+            removed = self._delete_performances(conn, list(removed_ids))
+            self._insert(conn, 'utaites', UTAITE_COLUMNS, [self._utaite_row(u) for u in utaites], conflict="IGNORE")
+            self._insert(conn, 'artists', ARTIST_COLUMNS, [self._artist_row(a) for a in artists], conflict="IGNORE")
+            song_sql = f"INSERT OR IGNORE INTO song_masters ({', '.join(SONG_COLUMNS)}) VALUES ({', '.join('?' for _ in SONG_COLUMNS)})"
+            added_songs = [song for song in songs if conn.execute(song_sql, self._song_row(song)).rowcount]
+            self._insert(conn, 'performances', PERFORMANCE_WRITE_COLUMNS, [self._performance_row(p) for p in performances])
+        return removed, added_songs
+
+    def apply_stat_deltas(self, utaite_deltas: Dict[str, int], song_deltas: Dict[str, int], artist_deltas: Dict[str, int]):
+        """통계 변화량 반영 (우타이테 최초/최신 날짜는 (utaite_id, date_epoch) 인덱스로 다시 구함)"""
+        with self._transaction() as conn:
+            conn.executemany("UPDATE song_masters SET performance_count = performance_count + ? WHERE id = ?",
+                             [(delta, song_id) for song_id, delta in song_deltas.items() if delta])
+            conn.executemany("UPDATE artists SET song_count = song_count + ? WHERE id = ?",
+                             [(delta, artist_id) for artist_id, delta in artist_deltas.items() if delta and artist_id])
+            conn.executemany(f"""
+                UPDATE utaites SET
+                    performance_count = performance_count + ?,
+                    first_appearance = {FIRST_APPEARANCE_SQL.format(id='utaites.id')},
+                    latest_appearance = {LATEST_APPEARANCE_SQL.format(id='utaites.id')}
+                WHERE id = ?
+            """, [(delta, utaite_id) for utaite_id, delta in utaite_deltas.items()])
+
+    def unit_of_work(self) -> 'SQLiteUnitOfWork':
+        """요청 하나의 변경을 한 트랜잭션으로 반영하는 작업 단위"""
+        return SQLiteUnitOfWork(self)
+
+class SQLiteUnitOfWork(UnitOfWork):
+    """SQLite 작업 단위 - 새 엔티티, 부른 기록, 통계 변화량을 한 트랜잭션으로 반영"""
+
+    def flush(self):
+        # __enter__의 write_lock이 연 BEGIN IMMEDIATE 트랜잭션에 합류하므로
+        # 블록 안에서 한 중복 확인/엔티티 조회와 아래 쓰기가 같은 트랜잭션에서 커밋된다
+        manager = self.manager
+        with manager.write_lock():
+            removed, added_songs = manager.write_batch(self.removed_performance_ids, self.new_utaites.values(),
+                                                       self.new_artists.values(), self.new_songs.values(),
+                                                       self.new_performances)
+            # 아티스트 곡 수는 실제로 추가된 곡만 센다 (이미 있어 건너뛴 곡 제외)
+            manager.apply_stat_deltas(*self._count_deltas(removed, added_songs))
+
+        for label, items in (('우타이테', self.new_utaites), ('아티스트', self.new_artists)):
+            for name, item in items.items():
+                logger.info(f"새 {label} 생성: {name} (ID: {item.id})")
+        for song in added_songs:
+            logger.info(f"새 곡 마스터 생성: {song.titles['original']} - {song.artist['original']} (ID: {song.id})")
+        self._reset()
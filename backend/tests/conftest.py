@@ -0,0 +1,22 @@
+import os
+import sys
+import pytest
+
+# backend 모듈은 backend 디렉토리를 기준으로 import한다 (from models import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Performance
+
+@pytest.fixture
+def make_performance():
+    """video1 영상의 index번째 부른 기록 생성"""
+    def make(index: int, song_master_id: str, utaite_id: str, date: str = "2024-01-01T00:00:00") -> Performance:
+        return Performance(
+            id=f"video1_{index}_0000{index}",
+            song_master_id=song_master_id,
+            utaite_id=utaite_id,
+            video_id="video1",
+            start_time=f"0:0{index}:00",
+            date=date
+        )
+    return make
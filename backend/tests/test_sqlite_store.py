@@ -0,0 +1,67 @@
+"""SQLite 저장소 작업 단위 회귀 테스트"""
+import sqlite3
+import pytest
+from sqlite_store import SQLiteDataManager
+
+def test_unit_of_work_holds_write_lock_until_commit(tmp_path):
+    path = str(tmp_path / "test.db")
+    manager = SQLiteDataManager(path)
+    other = sqlite3.connect(path, timeout=0, isolation_level=None)
+    with manager.unit_of_work() as uow:
+        # 조회/중복 확인 단계부터 쓰기 락을 잡고 있어야 다른 연결의 쓰기가 끼어들지 못한다
+        with pytest.raises(sqlite3.OperationalError):
+            other.execute("BEGIN IMMEDIATE")
+        uow.utaite_id("singer")
+
+    other.execute("BEGIN IMMEDIATE")
+    other.execute("ROLLBACK")
+    assert [u.names['original'] for u in manager.load_utaites()] == ["singer"]
+
+def test_duplicate_performance_rolls_back_whole_unit(tmp_path, make_performance):
+    manager = SQLiteDataManager(str(tmp_path / "test.db"))
+    with manager.unit_of_work() as uow:
+        utaite_id = uow.utaite_id("singer")
+        song_id = uow.song_master_id("Lemon", "Kenshi Yonezu")
+        uow.add_performances([make_performance(1, song_id, utaite_id)])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with manager.unit_of_work() as uow:
+            new_song = uow.song_master_id("Flamingo", "Kenshi Yonezu")
+            uow.add_performances([make_performance(1, new_song, utaite_id)])
+
+    assert [song.id for song in manager.load_songs_master()] == [song_id]
+    assert manager.load_performances()[0].song_master_id == song_id
+    assert manager.verify_statistics() == []
+
+def test_existing_song_is_not_counted_twice_for_artist(tmp_path, make_performance):
+    manager = SQLiteDataManager(str(tmp_path / "test.db"))
+    for index in (1, 2):
+        with manager.unit_of_work() as uow:
+            utaite_id = uow.utaite_id("singer")
+            song_id = uow.song_master_id("Lemon", "Kenshi Yonezu")
+            uow.add_performances([make_performance(index, song_id, utaite_id)])
+
+    songs = manager.load_songs_master()
+    assert [(song.titles['original'], song.performance_count) for song in songs] == [("Lemon", 2)]
+    assert {artist.names['original']: artist.song_count for artist in manager.load_artists()} == {"Kenshi Yonezu": 1}
+    assert [u.performance_count for u in manager.load_utaites()] == [2]
+    assert manager.verify_statistics() == []
+
+def test_mixed_offset_dates_match_json_engine(tmp_path, make_performance):
+    from data_manager import DataManager
+    dates = ["2024-01-01T12:00:00+09:00", "2024-01-01T05:00:00", "2024-01-01T04:00:00Z"]
+    bounds = []
+    for manager in (SQLiteDataManager(str(tmp_path / "test.db")), DataManager(str(tmp_path / "json"))):
+        with manager.unit_of_work() as uow:
+            utaite_id = uow.utaite_id("singer")
+            song_id = uow.song_master_id("Lemon", "Kenshi Yonezu")
+            uow.add_performances([make_performance(i, song_id, utaite_id, date) for i, date in enumerate(dates, 1)])
+        utaite = manager.load_utaites()[0]
+        bounds.append((utaite.first_appearance, utaite.latest_appearance))
+        assert manager.verify_statistics() == []
+        newest = manager.get_performances_with_details(utaite_id=utaite_id, newest_first=True)
+        assert [p.id for p in newest] == ["video1_2_00002", "video1_3_00003", "video1_1_00001"]
+        assert manager.count_performances() == 3
+
+    # 문자열 순서가 아니라 시각 순서: 12:00+09:00(03:00 UTC)이 최초, 05:00(UTC)이 최신
+    assert bounds == [("2024-01-01T12:00:00+09:00", "2024-01-01T05:00:00")] * 2
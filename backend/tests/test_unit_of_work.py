@@ -0,0 +1,107 @@
+"""UnitOfWork 저장 회귀 테스트"""
+from data_manager import DataManager
+
+def test_same_title_different_artists_are_both_saved(tmp_path, make_performance):
+    manager = DataManager(str(tmp_path))
+    with manager.unit_of_work() as uow:
+        utaite_id = uow.utaite_id("singer")
+        first = uow.song_master_id("Lemon", "Kenshi Yonezu")
+        second = uow.song_master_id("Lemon", "Other Artist")
+        uow.add_performances([make_performance(1, first, utaite_id), make_performance(2, second, utaite_id)])
+
+    assert first != second
+    songs = {song.id: song for song in manager.load_songs_master()}
+    assert set(songs) == {first, second}
+    assert {songs[first].artist['original'], songs[second].artist['original']} == {"Kenshi Yonezu", "Other Artist"}
+    assert all(song.performance_count == 1 for song in songs.values())
+    assert {artist.names['original']: artist.song_count for artist in manager.load_artists()} == {
+        "Kenshi Yonezu": 1, "Other Artist": 1
+    }
+    assert manager.verify_statistics() == []
+
+def test_existing_song_does_not_count_twice_for_artist(tmp_path):
+    manager = DataManager(str(tmp_path))
+    with manager.unit_of_work() as uow:
+        uow.song_master_id("Lemon", "Kenshi Yonezu")
+    with manager.unit_of_work() as uow:
+        uow.song_master_id("Lemon", "Kenshi Yonezu")
+
+    assert len(manager.load_songs_master()) == 1
+    assert [artist.song_count for artist in manager.load_artists()] == [1]
+
+def test_mixed_timezone_dates_are_not_reported_as_drift(tmp_path, make_performance):
+    manager = DataManager(str(tmp_path))
+    with manager.unit_of_work() as uow:
+        utaite_id = uow.utaite_id("singer")
+        song_id = uow.song_master_id("Lemon", "Kenshi Yonezu")
+        uow.add_performances([make_performance(1, song_id, utaite_id, "2024-01-01T12:00:00+09:00"),
+                              make_performance(2, song_id, utaite_id, "2024-01-01T05:00:00")])
+
+    utaite = manager.load_utaites()[0]
+    # 12:00+09:00은 03:00 UTC라 시간대 없는 05:00(UTC)보다 이르다
+    assert (utaite.first_appearance, utaite.latest_appearance) == ("2024-01-01T12:00:00+09:00", "2024-01-01T05:00:00")
+    assert manager.verify_statistics() == []
+
+def test_trusted_load_matches_validated_load(tmp_path, make_performance):
+    DataManager(str(tmp_path)).add_performances([make_performance(1, "song_1", "utaite_1")])
+
+    trusted = DataManager(str(tmp_path), trusted_load=True).load_performances()
+    validated = DataManager(str(tmp_path)).load_performances()
+    assert trusted == validated
+    assert [p.model_dump() for p in trusted] == [p.model_dump() for p in validated]
+    assert trusted[0].model_fields_set == validated[0].model_fields_set
+
+def test_add_performances_does_not_mutate_cached_columns(tmp_path, make_performance):
+    manager = DataManager(str(tmp_path))
+    manager.add_performances([make_performance(1, "song_1", "utaite_1")])
+    snapshot = manager.get_performance_columns()
+    assert snapshot.rows(utaite_ids=["utaite_1"]) == [0]
+
+    manager.add_performances([make_performance(2, "song_1", "utaite_1"), make_performance(3, "song_2", "utaite_2")])
+
+    # 이전 스냅샷을 읽던 쪽은 그대로, 새 저장소에는 추가된 기록이 보인다
+    assert len(snapshot) == 1 and snapshot.rows(utaite_ids=["utaite_1"]) == [0]
+    assert snapshot.rows(utaite_ids=["utaite_2"]) == []
+    columns = manager.get_performance_columns()
+    assert columns is not snapshot
+    assert [columns.perf_id(row) for row in columns.rows(utaite_ids=["utaite_1"])] == ["video1_1_00001", "video1_2_00002"]
+    assert [columns.perf_id(row) for row in columns.rows(song_ids=["song_2"])] == ["video1_3_00003"]
+    assert manager.get_video_performances("video1") == DataManager(str(tmp_path)).load_performances()
+
+def test_newest_first_sorts_filtered_rows_by_epoch(tmp_path, make_performance):
+    manager = DataManager(str(tmp_path))
+    with manager.unit_of_work() as uow:
+        utaite_id = uow.utaite_id("singer")
+        song_id = uow.song_master_id("Lemon", "Kenshi Yonezu")
+        other_id = uow.song_master_id("Flamingo", "Kenshi Yonezu")
+        uow.add_performances([make_performance(1, song_id, utaite_id, "2024-01-01T12:00:00+09:00"),
+                              make_performance(2, other_id, utaite_id, "2024-01-01T05:00:00"),
+                              make_performance(3, song_id, utaite_id, "2024-01-01T04:00:00Z")])
+
+    # 문자열로는 12:00+09:00이 가장 늦지만 epoch로는 03:00 UTC라 가장 이르다
+    assert [p.id for p in manager.get_performances_with_details(utaite_id=utaite_id, newest_first=True)] == [
+        "video1_2_00002", "video1_3_00003", "video1_1_00001"
+    ]
+    assert [p.id for p in manager.get_performances_with_details(utaite_id=utaite_id, song_id=song_id, newest_first=True)] == [
+        "video1_3_00003", "video1_1_00001"
+    ]
+    assert [p.id for p in manager.get_performances_with_details(artist_name="Kenshi Yonezu", song_id=other_id)] == ["video1_2_00002"]
+    assert manager.count_performances() == 3
+
+def test_removing_boundary_with_other_offset_recomputes_dates(tmp_path, make_performance):
+    manager = DataManager(str(tmp_path))
+    with manager.unit_of_work() as uow:
+        utaite_id = uow.utaite_id("singer")
+        song_id = uow.song_master_id("Lemon", "Kenshi Yonezu")
+        uow.add_performances([make_performance(1, song_id, utaite_id, "2024-01-01T09:00:00+09:00"),
+                              make_performance(2, song_id, utaite_id, "2024-02-01T00:00:00Z")])
+    # 같은 시각을 다른 표기로 저장한 통계 (다른 엔진/동기화에서 온 값)
+    manager.save_utaites([manager.load_utaites()[0].model_copy(update={'first_appearance': "2024-01-01T00:00:00Z"})])
+    assert manager.verify_statistics() == []
+
+    with manager.unit_of_work() as uow:
+        uow.remove_performances(["video1_1_00001"])
+
+    utaite = manager.load_utaites()[0]
+    assert (utaite.first_appearance, utaite.latest_appearance) == ("2024-02-01T00:00:00Z", "2024-02-01T00:00:00Z")
+    assert manager.verify_statistics() == []
@@ -16,7 +16,10 @@ interface GroupedSong {
 export default function ArtistPage() {
   const params = useParams()
   const router = useRouter()
-  const artist_name = decodeURIComponent(params?.artist_name as string)
+  // URL 값이 숫자면 아티스트 ID, 아니면 (이전 링크 호환) 아티스트 이름
+  const artist_param = decodeURIComponent(params?.artist_name as string)
+  const artist_id = /^\d+$/.test(artist_param) ? artist_param : null
+  const [artist_name, setArtistName] = useState(artist_id ? '' : artist_param)
   
   const [artistSongs, setArtistSongs] = useState<GroupedSong[]>([])
   const [loading, setLoading] = useState(true)
@@ -118,24 +121,33 @@ export default function ArtistPage() {
   }
 
   useEffect(() => {
-    if (artist_name) {
+    if (artist_param) {
       fetchArtistDetails()
     }
-  }, [artist_name])
+  }, [artist_param])
 
   const fetchArtistDetails = async () => {
-    console.log('🎤 아티스트 상세 정보 가져오기 시작:', artist_name)
+    console.log('🎤 아티스트 상세 정보 가져오기 시작:', artist_param)
     
     try {
-      // 아티스트의 모든 곡과 공연 기록 가져오기
+      // 아티스트의 모든 곡과 공연 기록 가져오기 (ID면 인덱스 쿼리 한 번)
       const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:9030'
-      const response = await fetch(`${backendUrl}/artists/songs?name=${encodeURIComponent(artist_name)}`)
+      let response = await fetch(artist_id
+        ? `${backendUrl}/artists/${artist_id}/performances`
+        : `${backendUrl}/artists/songs?name=${encodeURIComponent(artist_param)}`)
       
       if (!response.ok) {
         throw new Error('아티스트 정보를 찾을 수 없습니다.')
       }
       
-      const data = await response.json()
+      let data = await response.json()
+      
+      // 숫자로만 된 아티스트 이름일 수 있으므로 ID 결과가 없으면 이름으로 다시 조회
+      if (artist_id && data.length === 0) {
+        response = await fetch(`${backendUrl}/artists/songs?name=${encodeURIComponent(artist_param)}`)
+        data = response.ok ? await response.json() : []
+      }
+      setArtistName(data.length > 0 ? data[0].song_artist : artist_param)
       
       // API 응답 (PerformanceDetail[])을 곡별로 그룹화
       const songsMap = new Map<number, GroupedSong>()
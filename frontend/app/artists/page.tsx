@@ -3,9 +3,11 @@
 import { useState, useEffect } from 'react'
 import { useRouter } from 'next/navigation'
 import Header from '@/components/Header'
+import { profilePath } from '@/lib/links'
 import { Music, Users, PlayCircle, Calendar } from 'lucide-react'
 
 interface Artist {
+  id: number | string
   name: string
   song_count: number
   total_performances: number
@@ -52,8 +54,8 @@ export default function ArtistsPage() {
     }
   }
 
-  const handleArtistClick = (artistName: string) => {
-    router.push(`/artist/${encodeURIComponent(artistName)}`)
+  const handleArtistClick = (artist: Artist) => {
+    router.push(profilePath('artist', artist.id, artist.name))
   }
 
   if (loading) {
@@ -81,7 +83,7 @@ export default function ArtistsPage() {
             {artists.map((artist) => (
               <div
                 key={artist.name}
-                onClick={() => handleArtistClick(artist.name)}
+                onClick={() => handleArtistClick(artist)}
                 className="bg-youtube-gray hover:bg-youtube-lightgray rounded-lg p-6 cursor-pointer transition-colors duration-200"
               >
                 {/* 아티스트 썸네일 */}
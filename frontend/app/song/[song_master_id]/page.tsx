@@ -11,8 +11,10 @@ interface SongMaster {
   id: number
   titles: { original: string }
   artist: { original: string }
+  artist_id?: number
   tags: string[]
   performance_count: number
+  related_songs?: SongMaster[]
 }
 
 export default function SongPage() {
@@ -37,15 +39,14 @@ export default function SongPage() {
     try {
       const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:9030'
       
-      // 곡 마스터 정보 가져오기
-      const masterResponse = await fetch(`${backendUrl}/songs/master`)
-      const masterData = await masterResponse.json()
-      const master = masterData.find((m: SongMaster) => m.id === parseInt(song_master_id))
+      // 곡 마스터 정보 가져오기 (같은 아티스트의 다른 곡 포함)
+      const masterResponse = await fetch(`${backendUrl}/songs/master/${song_master_id}`)
       
-      if (!master) {
+      if (!masterResponse.ok) {
         throw new Error('곡을 찾을 수 없습니다.')
       }
       
+      const master = await masterResponse.json()
       setSongMaster(master)
       console.log('✅ 곡 마스터 정보:', master.titles.original)
 
@@ -64,11 +65,8 @@ export default function SongPage() {
       setPerformances(performances)
       console.log('✅ 부른 기록:', performances.length, '개')
 
-      // 같은 아티스트의 다른 곡들 찾기
-      const relatedArtistSongs = masterData.filter((m: SongMaster) => 
-        m.id !== song_master_id && 
-        m.artist.original === master.artist.original
-      ).slice(0, 6) // 최대 6개까지
+      // 같은 아티스트의 다른 곡들 (최대 6개, 백엔드에서 부른 횟수 순)
+      const relatedArtistSongs = master.related_songs || []
       
       setRelatedSongs(relatedArtistSongs)
       console.log('✅ 관련 곡:', relatedArtistSongs.length, '개')
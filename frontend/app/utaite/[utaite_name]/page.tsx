@@ -10,7 +10,10 @@ import { Music, Users, Calendar, PlayCircle, ArrowLeft, Mic } from 'lucide-react
 export default function UtaitePage() {
   const params = useParams()
   const router = useRouter()
-  const utaite_name = decodeURIComponent(params?.utaite_name as string)
+  // URL 값이 숫자면 우타이테 ID, 아니면 (이전 링크 호환) 우타이테 이름
+  const utaite_param = decodeURIComponent(params?.utaite_name as string)
+  const utaite_id = /^\d+$/.test(utaite_param) ? utaite_param : null
+  const [utaite_name, setUtaiteName] = useState(utaite_id ? '' : utaite_param)
   
   const [songs, setSongs] = useState<SongEntry[]>([])
   const [loading, setLoading] = useState(true)
@@ -23,23 +26,33 @@ export default function UtaitePage() {
   } | null>(null)
 
   useEffect(() => {
-    if (utaite_name) {
+    if (utaite_param) {
       fetchUtaiteDetails()
     }
-  }, [utaite_name])
+  }, [utaite_param])
 
   const fetchUtaiteDetails = async () => {
-    console.log('🎤 우타이테 상세 정보 가져오기 시작:', utaite_name)
+    console.log('🎤 우타이테 상세 정보 가져오기 시작:', utaite_param)
     
     try {
-      // 우타이테가 부른 모든 노래 가져오기
-      const response = await fetch(`${process.env.NEXT_PUBLIC_BACKEND_URL}/utaites/songs?name=${encodeURIComponent(utaite_name)}`)
+      // 우타이테가 부른 모든 노래 가져오기 (ID면 인덱스 쿼리 한 번)
+      const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL
+      let response = await fetch(utaite_id
+        ? `${backendUrl}/utaites/${utaite_id}/performances`
+        : `${backendUrl}/utaites/songs?name=${encodeURIComponent(utaite_param)}`)
       
       if (!response.ok) {
         throw new Error('우타이테 정보를 찾을 수 없습니다.')
       }
       
-      const data = await response.json()
+      let data = await response.json()
+      
+      // 숫자로만 된 우타이테 이름일 수 있으므로 ID 결과가 없으면 이름으로 다시 조회
+      if (utaite_id && data.length === 0) {
+        response = await fetch(`${backendUrl}/utaites/songs?name=${encodeURIComponent(utaite_param)}`)
+        data = response.ok ? await response.json() : []
+      }
+      setUtaiteName(data.length > 0 ? data[0].utaite_name : utaite_param)
       setSongs(data)
       console.log('✅ 우타이테 노래 정보:', data.length, '곡')
 
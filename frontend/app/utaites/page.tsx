@@ -3,10 +3,11 @@
 import { useState, useEffect } from 'react'
 import { useRouter } from 'next/navigation'
 import Header from '@/components/Header'
+import { profilePath } from '@/lib/links'
 import { Music, Users, PlayCircle, Calendar, Mic } from 'lucide-react'
 
 interface Utaite {
-  id: number
+  id: number | string
   name: string
   name_korean?: string
   name_english?: string
@@ -57,8 +58,8 @@ export default function UtaitesPage() {
     }
   }
 
-  const handleUtaiteClick = (utaiteName: string) => {
-    router.push(`/utaite/${encodeURIComponent(utaiteName)}`)
+  const handleUtaiteClick = (utaite: Utaite) => {
+    router.push(profilePath('utaite', utaite.id, utaite.name))
   }
 
   if (loading) {
@@ -86,7 +87,7 @@ export default function UtaitesPage() {
             {utaites.map((utaite) => (
               <div
                 key={utaite.name}
-                onClick={() => handleUtaiteClick(utaite.name)}
+                onClick={() => handleUtaiteClick(utaite)}
                 className="bg-youtube-gray hover:bg-youtube-lightgray rounded-lg p-6 cursor-pointer transition-colors duration-200"
               >
                 {/* 우타이테 썸네일 */}
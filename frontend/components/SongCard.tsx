@@ -2,6 +2,7 @@
 
 import { SongEntry } from '@/types'
 import { useRouter } from 'next/navigation'
+import { profilePath } from '@/lib/links'
 import EmbeddedPlayer from './EmbeddedPlayer'
 
 interface SongCardProps {
@@ -20,12 +21,12 @@ export default function SongCard({ song }: SongCardProps) {
 
   const handleArtistClick = (e: React.MouseEvent) => {
     e.stopPropagation() // 부모의 onClick 이벤트 방지
-    router.push(`/artist/${encodeURIComponent(song.song_artist)}`)
+    router.push(profilePath('artist', song.artist_id, song.song_artist))
   }
 
   const handleUtaiteClick = (e: React.MouseEvent) => {
     e.stopPropagation() // 부모의 onClick 이벤트 방지
-    router.push(`/utaite/${encodeURIComponent(song.utaite_name)}`)
+    router.push(profilePath('utaite', song.utaite_id, song.utaite_name))
   }
 
   const timeToSeconds = (timeStr: string): number => {
@@ -0,0 +1,7 @@
+// 아티스트/우타이테 상세 페이지 경로
+// PostgreSQL 백엔드(main.py)는 숫자 ID를 주므로 ID로 링크하고, JSON 백엔드(main_json.py)의 문자열 ID(utaite_xxx)나
+// ID가 없는 응답은 이름으로 링크한다 (상세 페이지는 숫자면 ID 엔드포인트, 아니면 ?name= 엔드포인트를 호출)
+export function profilePath(kind: 'artist' | 'utaite', id: number | string | null | undefined, name: string): string {
+  const numericId = id !== null && id !== undefined && /^\d+$/.test(String(id))
+  return `/${kind}/${numericId ? id : encodeURIComponent(name)}`
+}
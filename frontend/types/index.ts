@@ -11,7 +11,8 @@ export interface SongEntry {
   song_id: number
   song_title: string  // API response field
   song_artist: string  // API response field
-  utaite_id: number
+  artist_id?: number  // PostgreSQL 백엔드만 제공
+  utaite_id: number | string  // JSON 백엔드는 문자열 ID (utaite_xxx)
   utaite_name: string  // API response field
   video_id: string
   video_title: string  // API response field
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL 스키마 마이그레이션 적용 스크립트
+scripts/migrations/의 번호 붙은 SQL 파일을 순서대로 실행하고 schema_migrations 테이블에 기록한다
+(init.sql로 새로 만든 DB는 이미 최신 스키마라 --baseline으로 기록만 남기면 된다)
+"""
+
+import argparse
+import logging
+import os
+import sys
+from database import engine
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# 파일 첫 줄 근처에 이 표시가 있으면 트랜잭션 밖에서 실행 (CREATE INDEX CONCURRENTLY 등)
+NO_TRANSACTION_MARK = "-- migrate:no-transaction"
+
+def list_migrations(directory: str = MIGRATIONS_DIR):
+    """(버전, 파일 경로) 목록 - 파일 이름 앞의 숫자가 버전"""
+    migrations = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".sql") and name.split("_", 1)[0].isdigit():
+            migrations.append((name[:-4], os.path.join(directory, name)))
+    return migrations
+
+def applied_versions(cursor) -> set:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(255) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+def apply_migrations(baseline: bool = False, dry_run: bool = False) -> int:
+    """적용되지 않은 마이그레이션 실행 (적용한 개수 반환)"""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        done = applied_versions(cursor)
+        connection.commit()
+
+        count = 0
+        for version, path in list_migrations():
+            if version in done:
+                continue
+            if dry_run:
+                logger.info(f"적용 예정: {version}")
+                count += 1
+                continue
+
+            with open(path, "r", encoding="utf-8") as f:
+                sql = f.read()
+            no_transaction = NO_TRANSACTION_MARK in sql
+
+            logger.info(f"{'기록만' if baseline else '적용'}: {version}{' (트랜잭션 밖)' if no_transaction and not baseline else ''}")
+            if not baseline:
+                if no_transaction:
+                    connection.autocommit = True
+                    for statement in _split_statements(sql):
+                        cursor.execute(statement)
+                    connection.autocommit = False
+                else:
+                    cursor.execute(sql)
+            cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            connection.commit()
+            count += 1
+        return count
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+def _split_statements(sql: str):
+    """트랜잭션 밖 실행용: 세미콜론 기준으로 문장 분리 (함수 본문 등 $$ 블록은 쓰지 않는 파일에만 사용)"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    for statement in "\n".join(lines).split(";"):
+        if statement.strip():
+            yield statement
+
+def main():
+    parser = argparse.ArgumentParser(description="PostgreSQL 스키마 마이그레이션 적용")
+    parser.add_argument("--baseline", action="store_true", help="실행하지 않고 적용된 것으로 기록 (init.sql로 만든 새 DB)")
+    parser.add_argument("--dry-run", action="store_true", help="적용할 마이그레이션만 출력")
+    args = parser.parse_args()
+
+    try:
+        count = apply_migrations(baseline=args.baseline, dry_run=args.dry_run)
+        logger.info(f"✅ 마이그레이션 {count}개 {'예정' if args.dry_run else '완료'}")
+        return 0
+    except Exception as e:
+        logger.error(f"마이그레이션 실패: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+아티스트/우타이테 통계 집계 벤치마크
+합성 데이터로 부른 기록 수를 두 배씩 늘려 가며 aggregate_stats가 선형으로 늘어나는지 확인한다
+"""
+
+import argparse
+import random
+import time
+from aggregation import aggregate_stats
+from models import Artist, Performance, SongMaster, Utaite
+
+def build_dataset(performance_count: int, seed: int = 42):
+    """부른 기록 수에 비례하는 합성 마스터/부른 기록 생성"""
+    rng = random.Random(seed)
+    artist_count = max(1, performance_count // 100)
+    song_count = max(1, performance_count // 20)
+    utaite_count = max(1, performance_count // 2000)
+
+    artists = [Artist(id=f"artist_{i}", names={"original": f"artist {i}"}) for i in range(artist_count)]
+    songs = [
+        SongMaster(
+            id=f"song_{i}",
+            titles={"original": f"song {i}"},
+            artist={"original": f"artist {rng.randrange(artist_count)}"}
+        )
+        for i in range(song_count)
+    ]
+    utaites = [Utaite(id=f"utaite_{i}", names={"original": f"utaite {i}"}) for i in range(utaite_count)]
+    performances = [
+        Performance(
+            id=f"perf_{i}",
+            song_master_id=f"song_{rng.randrange(song_count)}",
+            utaite_id=f"utaite_{rng.randrange(utaite_count)}",
+            video_id=f"video_{i // 15}",
+            start_time="0:00:00",
+            date=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00"
+        )
+        for i in range(performance_count)
+    ]
+    return performances, songs, artists, utaites
+
+def main():
+    parser = argparse.ArgumentParser(description="통계 집계 선형성 벤치마크")
+    parser.add_argument("--max", type=int, default=100_000, help="최대 부른 기록 수")
+    parser.add_argument("--steps", type=int, default=4, help="측정 단계 수 (단계마다 두 배)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    sizes = [args.max // (2 ** i) for i in reversed(range(args.steps))]
+    print(f"{'부른 기록':>10} {'시간(ms)':>10} {'기록당(µs)':>12} {'이전 대비':>10}")
+
+    previous = None
+    for size in sizes:
+        dataset = build_dataset(size)
+        elapsed = min(_timed(aggregate_stats, *dataset) for _ in range(args.repeat))
+        ratio = f"x{elapsed / previous:.2f}" if previous else "-"
+        print(f"{size:>10,} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>12.2f} {ratio:>10}")
+        previous = elapsed
+
+def _timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+부른 기록 컬럼 저장소 벤치마크
+이전 조회 경로(Performance 리스트 + 우타이테/곡/비디오별 보조 인덱스)와 PerformanceColumns를 비교한다
+- 메모리: 구축 후 남아 있는 할당량 (tracemalloc)
+- 조회: 우타이테별/곡별 필터 + 최신순 정렬, 통계 집계(곡/우타이테별 횟수, 최초/최신 날짜)
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from benchmark_aggregation import build_dataset
+from columnar import PerformanceColumns, date_to_epoch
+from data_manager import DataManager
+from models import Performance, time_to_seconds
+
+def timed(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def retained_bytes(build) -> tuple:
+    """build() 결과를 들고 있는 동안 남은 할당 바이트"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+class ObjectStore:
+    """이전 조회 경로: Performance 리스트와 ID/우타이테/곡/비디오별 보조 인덱스"""
+
+    def __init__(self, records: list):
+        self.performances = [Performance(start_time_seconds=time_to_seconds(record['start_time']), **record) for record in records]
+        self.by_id = {perf.id: perf for perf in self.performances}
+        self.by_utaite, self.by_song, self.by_video = defaultdict(list), defaultdict(list), defaultdict(list)
+        for perf in self.performances:
+            self.by_utaite[perf.utaite_id].append(perf)
+            self.by_song[perf.song_master_id].append(perf)
+            self.by_video[perf.video_id].append(perf)
+
+    def newest(self, group: dict, key: str) -> list:
+        return [perf.id for perf in sorted(group.get(key, []), key=lambda perf: date_to_epoch(perf.date), reverse=True)]
+
+    def statistics(self):
+        song_counts, utaite_counts, bounds = {}, {}, {}
+        for perf in self.performances:
+            song_counts[perf.song_master_id] = song_counts.get(perf.song_master_id, 0) + 1
+            utaite_counts[perf.utaite_id] = utaite_counts.get(perf.utaite_id, 0) + 1
+            first, latest = bounds.get(perf.utaite_id, (perf.date, perf.date))
+            bounds[perf.utaite_id] = (min(first, perf.date, key=date_to_epoch), max(latest, perf.date, key=date_to_epoch))
+        return song_counts, utaite_counts, bounds
+
+def build_columns(records: list) -> PerformanceColumns:
+    """컬럼 저장소 + 조회에 쓰는 우타이테/곡/비디오 postings까지 구축"""
+    columns = PerformanceColumns.from_records(records)
+    record = records[0]
+    for filters in ({'utaite_ids': [record['utaite_id']]}, {'song_ids': [record['song_master_id']]}, {'video_id': record['video_id']}):
+        columns.rows(**filters)
+    return columns
+
+def column_newest(columns: PerformanceColumns, **filters) -> list:
+    return [columns.perf_id(row) for row in columns.sort_rows(columns.rows(**filters), newest_first=True)]
+
+def column_statistics(columns: PerformanceColumns):
+    return columns.counts_by_song(), columns.counts_by_utaite(), columns.date_bounds_by_utaite()
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance 리스트 + 인덱스 vs 컬럼 저장소 메모리/조회 벤치마크")
+    parser.add_argument("--size", type=int, default=100_000, help="부른 기록 수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    # 실제 저장 형식(songs.json)에서 읽은 것과 같은 원본 레코드
+    records = json.loads(json.dumps([DataManager._performance_item(None, perf) for perf in build_dataset(args.size)[0]]))
+    objects, object_bytes = retained_bytes(lambda: ObjectStore(records))
+    columns, column_bytes = retained_bytes(lambda: build_columns(records))
+
+    # 가장 기록이 많은 우타이테/곡으로 조회
+    utaite_id = max(objects.by_utaite, key=lambda key: len(objects.by_utaite[key]))
+    song_id = max(objects.by_song, key=lambda key: len(objects.by_song[key]))
+    assert objects.newest(objects.by_utaite, utaite_id) == column_newest(columns, utaite_ids=[utaite_id])
+    assert objects.newest(objects.by_song, song_id) == column_newest(columns, song_ids=[song_id])
+    assert objects.statistics() == column_statistics(columns)
+
+    rows = [
+        ("우타이테별 최신순(ms)", lambda: objects.newest(objects.by_utaite, utaite_id), lambda: column_newest(columns, utaite_ids=[utaite_id])),
+        ("곡별 최신순(ms)", lambda: objects.newest(objects.by_song, song_id), lambda: column_newest(columns, song_ids=[song_id])),
+        ("통계 집계(ms)", objects.statistics, lambda: column_statistics(columns)),
+    ]
+
+    print(f"부른 기록 {args.size:,}건 (우타이테 {utaite_id} {len(objects.by_utaite[utaite_id]):,}건, 곡 {song_id} {len(objects.by_song[song_id]):,}건)")
+    print(f"{'':<20} {'리스트 + 인덱스':>16} {'컬럼 저장소':>12} {'배율':>8}")
+    print(f"{'메모리(MB)':<20} {object_bytes / 2**20:>16.1f} {column_bytes / 2**20:>12.1f} {object_bytes / column_bytes:>7.1f}x")
+    print(f"{'행당 바이트':<20} {object_bytes / args.size:>16.0f} {column_bytes / args.size:>12.0f}")
+    for label, before, after in rows:
+        before_time, after_time = timed(before, args.repeat), timed(after, args.repeat)
+        print(f"{label:<20} {before_time * 1000:>16.2f} {after_time * 1000:>12.2f} {before_time / after_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
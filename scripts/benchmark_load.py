@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+DataManager 로드 벤치마크
+합성 데이터 파일을 임시 디렉토리에 쓰고, 신뢰 로드(model_construct)와 전체 검증 로드의 시간을 비교한다
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from benchmark_aggregation import build_dataset
+from data_manager import DataManager
+
+LOADERS = ['load_utaites', 'load_artists', 'load_songs_master', 'load_videos', 'load_performances']
+
+def write_dataset(data_dir: str, performance_count: int):
+    """합성 데이터를 JSON 저장소 형식으로 저장"""
+    performances, songs, artists, utaites = build_dataset(performance_count)
+    manager = DataManager(data_dir)
+    manager.save_utaites(utaites)
+    manager.save_artists(artists)
+    manager.save_songs_master(songs)
+    manager.save_performances(performances)
+
+def measure(data_dir: str, trusted_load: bool, repeat: int) -> dict:
+    """로더별 최소 시간 (캐시를 비워 매번 파일부터 읽음)"""
+    manager = DataManager(data_dir, trusted_load=trusted_load)
+    timings = {}
+    for loader in LOADERS:
+        best = None
+        for _ in range(repeat):
+            manager.clear_cache()
+            started = time.perf_counter()
+            getattr(manager, loader)()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings[loader] = best
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="신뢰 로드 vs 전체 검증 로드 벤치마크")
+    parser.add_argument("--size", type=int, default=100_000, help="부른 기록 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, args.size)
+        size_mb = sum(os.path.getsize(os.path.join(data_dir, name)) for name in os.listdir(data_dir)) / 1e6
+        print(f"부른 기록 {args.size:,}건, 데이터 파일 {size_mb:.1f}MB")
+
+        validated = measure(data_dir, trusted_load=False, repeat=args.repeat)
+        trusted = measure(data_dir, trusted_load=True, repeat=args.repeat)
+
+    print(f"{'로더':<20} {'검증(ms)':>10} {'신뢰(ms)':>10} {'배율':>8}")
+    for loader in LOADERS:
+        ratio = validated[loader] / trusted[loader] if trusted[loader] else 0
+        print(f"{loader:<20} {validated[loader] * 1000:>10.1f} {trusted[loader] * 1000:>10.1f} {ratio:>7.2f}x")
+    total_validated, total_trusted = sum(validated.values()), sum(trusted.values())
+    print(f"{'합계':<20} {total_validated * 1000:>10.1f} {total_trusted * 1000:>10.1f} {total_validated / total_trusted:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+prepared statement 계획 시간 비교
+check_query_plans.py와 같은 임시 스키마/합성 데이터에서 /songs, /utaites 쿼리를
+매번 파싱/계획하는 text() 실행과 PREPARE 후 EXECUTE 실행으로 각각 돌려 계획 시간과 왕복 시간을 비교한다
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from sqlalchemy import text
+from database import SessionLocal
+from check_query_plans import SCHEMA, build_schema
+import prepared
+import queries
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# (엔드포인트, 쿼리, 파라미터 조회 SQL) - /utaites는 목록 한 번 + 우타이테마다 최신 기록/인기 곡
+BENCHMARKS = [
+    ("/songs", queries.SONGS, None),
+    ("/utaites", queries.UTAITES, None),
+    ("/utaites (최신 기록)", queries.UTAITE_LATEST,
+     "SELECT utaite_id, MAX(date) AS latest_date FROM performances GROUP BY utaite_id ORDER BY COUNT(*) DESC LIMIT 1"),
+    ("/utaites (인기 곡)", queries.UTAITE_TOP_SONGS,
+     "SELECT utaite_id FROM performances GROUP BY utaite_id ORDER BY COUNT(*) DESC LIMIT 1"),
+]
+
+def planning_time(db, statement: str, params: dict) -> float:
+    """EXPLAIN ANALYZE의 Planning Time (ms)"""
+    rows = db.execute(text(f"EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) {statement}"), params).scalar()
+    return (json.loads(rows) if isinstance(rows, str) else rows)[0]["Planning Time"]
+
+def round_trip(run, iterations: int) -> float:
+    """실행 + 결과 수신 평균 시간 (ms)"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run().fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def benchmark(db, iterations: int) -> list:
+    results = []
+    for name, query, params_sql in BENCHMARKS:
+        params = dict(db.execute(text(params_sql)).mappings().one()) if params_sql else {}
+
+        plain_plan = statistics.median(planning_time(db, query.sql, params) for _ in range(iterations))
+        plain_trip = round_trip(lambda: db.execute(query.statement, params), iterations)
+
+        # PREPARE 후 몇 번 실행해 PostgreSQL이 일반 계획(generic plan)을 고를 기회를 준 뒤 측정
+        prepared_trip = round_trip(lambda: query.execute(db, params), iterations)
+        execute_sql = str(query.execute_statement)
+        prepared_plan = statistics.median(planning_time(db, execute_sql, params) for _ in range(iterations))
+
+        results.append((name, plain_plan, prepared_plan, plain_trip, prepared_trip))
+        logger.info(
+            f"{name}: 계획 {plain_plan:.3f}ms -> {prepared_plan:.3f}ms, "
+            f"왕복 {plain_trip:.2f}ms -> {prepared_trip:.2f}ms"
+        )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="text() 실행과 prepared statement 실행의 계획/왕복 시간 비교")
+    parser.add_argument("--performances", type=int, default=200_000, help="합성 부른 기록 수")
+    parser.add_argument("--iterations", type=int, default=20, help="쿼리별 반복 횟수 (중앙값 보고)")
+    args = parser.parse_args()
+
+    # PREPARED_STATEMENTS=0 환경에서도 비교할 수 있도록 강제로 켬
+    prepared.PREPARED_STATEMENTS = True
+    db = SessionLocal()
+    try:
+        build_schema(db.connection(), args.performances)
+        results = benchmark(db, args.iterations)
+    finally:
+        # 임시 스키마는 롤백으로 지우고, 이 연결에 만든 prepared statement도 정리
+        db.rollback()
+        db.connection().exec_driver_sql("DEALLOCATE ALL")
+        db.connection().connection.info.pop("prepared_statements", None)
+        db.close()
+
+    logger.info(f"{'엔드포인트':<24}{'계획(text)':>12}{'계획(prepared)':>16}{'왕복(text)':>12}{'왕복(prepared)':>16}")
+    for name, plain_plan, prepared_plan, plain_trip, prepared_trip in results:
+        logger.info(f"{name:<24}{plain_plan:>10.3f}ms{prepared_plan:>14.3f}ms{plain_trip:>10.2f}ms{prepared_trip:>14.2f}ms")
+    logger.info(f"스키마 {SCHEMA}는 롤백되었습니다")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
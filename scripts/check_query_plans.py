@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+엔드포인트 SQL 실행 계획 검사
+임시 스키마에 init.sql로 테이블/인덱스를 만들고 큰 합성 데이터를 채운 뒤
+backend/queries.py의 각 문장을 EXPLAIN해 필터가 있는 쿼리가 순차 스캔으로 떨어지면 실패한다 (종료 코드 1)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from sqlalchemy import text
+from database import engine
+import queries
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCHEMA = "plan_check"
+INIT_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "init.sql")
+
+# (이름, SQL, 파라미터 조회 SQL, 순차 스캔을 허용하지 않는 테이블)
+# 전체 목록 쿼리(/songs, /songs/master, /artists, /utaites)는 테이블 전체를 읽는 게 맞아 계획만 출력한다
+CHECKS = [
+    ("/songs", queries.SONGS, None, set()),
+    ("/songs/master", queries.SONGS_MASTER, None, set()),
+    ("/songs/by-master/{id}", queries.SONGS_BY_MASTER,
+     "SELECT song_master_id FROM performances GROUP BY song_master_id ORDER BY COUNT(*) DESC LIMIT 1",
+     {"performance_details"}),
+    ("/artists", queries.ARTISTS, None, set()),
+    ("/songs/master/{id}", queries.SONG_MASTER,
+     "SELECT id AS song_master_id FROM song_masters ORDER BY id LIMIT 1",
+     {"song_masters", "artists", "performance_details"}),
+    ("/songs/master/{id} (관련 곡)", queries.SONG_MASTER_RELATED,
+     'SELECT artist_id, id AS song_master_id, 6 AS "limit" FROM song_masters ORDER BY id LIMIT 1',
+     {"song_masters", "performance_details"}),
+    ("/artists/{id}/performances", queries.ARTIST_PERFORMANCES,
+     "SELECT artist_id FROM song_masters GROUP BY artist_id ORDER BY COUNT(*) DESC LIMIT 1",
+     {"performance_details"}),
+    ("/utaites", queries.UTAITES, None, set()),
+    ("/utaites (최신 기록)", queries.UTAITE_LATEST,
+     "SELECT utaite_id, MAX(date) AS latest_date FROM performances GROUP BY utaite_id LIMIT 1",
+     {"performance_details"}),
+    ("/utaites (인기 곡)", queries.UTAITE_TOP_SONGS,
+     "SELECT utaite_id FROM performances LIMIT 1",
+     {"performance_details"}),
+    ("/utaites/{id}/performances", queries.UTAITE_PERFORMANCES,
+     "SELECT id AS utaite_id FROM utaites ORDER BY id LIMIT 1",
+     {"performance_details"}),
+    ("/videos/{video_id}/setlist", queries.VIDEO_SETLIST,
+     "SELECT video_id AS video_table_id FROM performances ORDER BY id DESC LIMIT 1",
+     {"performance_details"}),
+]
+
+def build_schema(connection, performances: int):
+    """임시 스키마에 init.sql 적용 후 합성 데이터 채우기 (비디오당 15곡, 우타이테당 약 2천 곡)"""
+    connection.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    connection.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+    connection.exec_driver_sql(f"SET search_path TO {SCHEMA}")
+
+    with open(INIT_SQL, "r", encoding="utf-8") as f:
+        cursor = connection.connection.cursor()
+        cursor.execute(f.read())
+        cursor.close()
+
+    sizes = {
+        "performances": performances,
+        "artists": max(1, performances // 100),
+        "songs": max(1, performances // 20),
+        "utaites": max(1, performances // 2000),
+        "videos": max(1, performances // 15),
+    }
+    logger.info(f"합성 데이터 생성: {sizes}")
+    connection.execute(text("INSERT INTO artists (name) SELECT 'artist ' || g FROM generate_series(1, :artists) g"), sizes)
+    connection.execute(text("INSERT INTO utaites (name) SELECT 'utaite ' || g FROM generate_series(1, :utaites) g"), sizes)
+    connection.execute(text("""
+        INSERT INTO song_masters (title, artist_id, tags)
+        SELECT 'song ' || g, 1 + (g % :artists), ARRAY['tag']
+        FROM generate_series(1, :songs) g
+    """), sizes)
+    connection.execute(text("""
+        INSERT INTO videos (video_id, title, channel, thumbnail_url)
+        SELECT 'video' || g, 'stream ' || g, 'channel', 'https://img.youtube.com/vi/video' || g || '/mqdefault.jpg'
+        FROM generate_series(1, :videos) g
+    """), sizes)
+    connection.execute(text("""
+        INSERT INTO performances (song_master_id, utaite_id, video_id, start_time, start_time_seconds, date)
+        SELECT
+            1 + ((g * 7919) % :songs),
+            1 + ((g / 15) % :utaites),
+            1 + ((g / 15) % :videos),
+            '0:' || lpad(((g % 15) * 4)::text, 2, '0') || ':00',
+            (g % 15) * 240,
+            TIMESTAMP '2020-01-01' + ((g / 15) * INTERVAL '6 hours')
+        FROM generate_series(0, :performances - 1) g
+        ON CONFLICT DO NOTHING
+    """), sizes)
+    connection.exec_driver_sql("ANALYZE")
+
+def seq_scans(plan: dict) -> list:
+    """실행 계획 트리에서 순차 스캔한 테이블 이름"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+def node_types(plan: dict) -> list:
+    names = [plan.get("Node Type")]
+    for child in plan.get("Plans", []):
+        names.extend(node_types(child))
+    return names
+
+def check_plans(connection) -> list:
+    """각 쿼리를 EXPLAIN하고 실패 목록 반환"""
+    failures = []
+    for name, sql, params_sql, forbidden in CHECKS:
+        params = dict(connection.execute(text(params_sql)).mappings().one()) if params_sql else {}
+        rows = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql.sql}"), params).scalar()
+        plan = (json.loads(rows) if isinstance(rows, str) else rows)[0]["Plan"]
+
+        scanned = seq_scans(plan)
+        bad = sorted(forbidden.intersection(scanned))
+        status = "❌" if bad else "✅" if forbidden else "ℹ️ "
+        logger.info(f"{status} {name}: 비용 {plan['Total Cost']:,.0f}, 노드 {' > '.join(dict.fromkeys(node_types(plan)))}")
+        if bad:
+            failures.append((name, bad))
+            logger.error(f"   순차 스캔: {', '.join(bad)}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드포인트 SQL EXPLAIN 검사 (임시 스키마 + 합성 데이터)")
+    parser.add_argument("--performances", type=int, default=200_000, help="합성 부른 기록 수")
+    parser.add_argument("--keep", action="store_true", help=f"검사 후 {SCHEMA} 스키마를 지우지 않음")
+    args = parser.parse_args()
+
+    # 스키마 생성부터 한 트랜잭션이라 롤백하면 임시 스키마도 함께 사라진다
+    with engine.connect() as connection:
+        try:
+            build_schema(connection, args.performances)
+            failures = check_plans(connection)
+        except Exception:
+            connection.rollback()
+            raise
+        if args.keep:
+            connection.commit()
+        else:
+            connection.rollback()
+
+    if failures:
+        logger.error(f"순차 스캔으로 떨어진 쿼리 {len(failures)}개")
+        return 1
+    logger.info("✅ 모든 필터 쿼리가 인덱스를 사용합니다")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
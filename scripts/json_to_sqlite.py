@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+JSON 저장소 -> SQLite 저장소 변환 스크립트
+DATA_BACKEND=sqlite로 전환하기 전에 기존 JSON 데이터를 한 트랜잭션으로 옮긴다
+"""
+
+import argparse
+import logging
+import sys
+from data_manager import DataManager
+from sqlite_store import SQLiteDataManager
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def main():
+    """변환 실행"""
+    parser = argparse.ArgumentParser(description="JSON 데이터를 SQLite 데이터베이스로 변환")
+    parser.add_argument("--data-dir", default="data", help="JSON 데이터 디렉토리")
+    parser.add_argument("--db", default="data/utawakufinder.db", help="SQLite 데이터베이스 경로")
+    args = parser.parse_args()
+
+    source = DataManager(args.data_dir)
+    target = SQLiteDataManager(args.db)
+    target.import_from(source)
+
+    logger.info(f"✅ 변환 완료: {args.db}")
+    logger.info(f"  - 우타이테: {len(target.load_utaites())}개")
+    logger.info(f"  - 아티스트: {len(target.load_artists())}개")
+    logger.info(f"  - 곡 마스터: {len(target.load_songs_master())}개")
+    logger.info(f"  - 비디오: {len(target.load_videos())}개")
+    logger.info(f"  - 부른 기록: {len(target.load_performance_records())}개")
+
+    drift = target.verify_statistics()
+    if drift:
+        logger.warning(f"통계 불일치 {len(drift)}건 - verify_stats.py --fix 또는 verify_statistics(fix=True)로 수정하세요")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,7 +15,8 @@ from datetime import datetime
 # 새로운 모델과 데이터 매니저 import
 from models import *
 from data_manager import data_manager
-from crawler import extract_video_id, find_comment
+from columnar import date_to_epoch
+from crawler import extract_video_id, crawl_comments
 
 # 로깅 설정
 logging.basicConfig(
@@ -57,11 +58,10 @@ def health_check():
     """헬스 체크"""
     try:
         utaites = data_manager.load_utaites()
-        performances = data_manager.load_performances()
         return {
             "status": "healthy",
             "utaites_count": len(utaites),
-            "performances_count": len(performances),
+            "performances_count": data_manager.count_performances(),
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -74,42 +74,8 @@ def health_check():
 def get_utaites():
     """우타이테 목록과 통계"""
     try:
-        utaites = data_manager.load_utaites()
-        performances = data_manager.load_performances()
-        songs_master = data_manager.load_songs_master()
-        
-        # 우타이테별 통계 계산
-        utaite_stats = {}
-        for utaite in utaites:
-            utaite_performances = [p for p in performances if p.utaite_id == utaite.id]
-            unique_songs = set(p.song_master_id for p in utaite_performances)
-            
-            # 아티스트 수 계산
-            unique_artists = set()
-            for song_id in unique_songs:
-                song = next((s for s in songs_master if s.id == song_id), None)
-                if song and song.artist.get('original'):
-                    unique_artists.add(song.artist.get('original'))
-            
-            # 최신/최오래된 공연
-            sorted_perfs = sorted(utaite_performances, key=lambda x: x.date)
-            latest_perf = sorted_perfs[-1].date if sorted_perfs else None
-            first_perf = sorted_perfs[0].date if sorted_perfs else None
-            
-            utaite_stats[utaite.id] = UtaiteWithStats(
-                id=utaite.id,
-                name=utaite.names.get('korean') or utaite.names.get('original', ''),
-                names=utaite.names,
-                performance_count=len(utaite_performances),
-                unique_song_count=len(unique_songs),
-                unique_artist_count=len(unique_artists),
-                first_performance=first_perf,
-                latest_performance=latest_perf,
-                latest_thumbnail=f"https://img.youtube.com/vi/{sorted_perfs[-1].video_id}/mqdefault.jpg" if sorted_perfs else None
-            )
-        
-        result = list(utaite_stats.values())
-        result.sort(key=lambda x: x.performance_count, reverse=True)
+        # 부른 기록을 한 번 훑는 집계 결과 (파일이 바뀌지 않았으면 캐시)
+        _, result = data_manager.get_aggregated_stats()
         
         logger.info(f"우타이테 목록 조회 성공: {len(result)}명")
         return result
@@ -122,11 +88,8 @@ def get_utaites():
 def get_utaite_performances(utaite_id: str):
     """특정 우타이테의 부른 기록"""
     try:
-        all_performances = data_manager.get_performances_with_details()
-        filtered = [p for p in all_performances if p.utaite_id == utaite_id]
-        
-        # 날짜순 정렬
-        filtered.sort(key=lambda x: x.date, reverse=True)
+        # 필터와 날짜순(최신순) 정렬은 컬럼 저장소에서 처리
+        filtered = data_manager.get_performances_with_details(utaite_id=utaite_id, newest_first=True)
         
         logger.info(f"우타이테 부른 기록 조회 성공: {utaite_id} - {len(filtered)}곡")
         return filtered
@@ -141,8 +104,7 @@ def get_utaite_performances(utaite_id: str):
 def get_songs():
     """모든 부른 기록 (기존 호환성)"""
     try:
-        performances = data_manager.get_performances_with_details()
-        performances.sort(key=lambda x: x.date, reverse=True)
+        performances = data_manager.get_performances_with_details(newest_first=True)
         
         logger.info(f"부른 기록 조회 성공: {len(performances)}곡")
         return performances
@@ -163,83 +125,35 @@ def get_songs_master():
         logger.error(f"곡 마스터 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=f"곡 마스터 조회 중 오류: {str(e)}")
 
+@app.get("/songs/master/{song_master_id}")
+def get_song_master(song_master_id: str, related_limit: int = 6):
+    """곡 마스터 한 건과 같은 아티스트의 다른 곡 (PostgreSQL 백엔드의 곡 페이지 엔드포인트와 같은 형식)"""
+    try:
+        songs_master = data_manager.load_songs_master()
+        song = next((s for s in songs_master if s.id == song_master_id), None)
+        if not song:
+            raise HTTPException(status_code=404, detail="곡을 찾을 수 없습니다")
+        
+        # 같은 아티스트(원어 이름 기준)의 다른 곡을 부른 횟수 순으로
+        artist_name = song.artist.get('original')
+        related = [s for s in songs_master if s.id != song.id and s.artist.get('original') == artist_name]
+        related.sort(key=lambda s: s.performance_count, reverse=True)
+        
+        logger.info(f"곡 마스터 조회 성공: {song_master_id} (관련 곡 {len(related[:related_limit])}곡)")
+        return {**song.model_dump(), "related_songs": [s.model_dump() for s in related[:related_limit]]}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"곡 마스터 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"곡 마스터 조회 중 오류: {str(e)}")
+
 @app.get("/artists", response_model=List[ArtistWithStats])
 def get_artists_with_stats():
     """아티스트 목록과 통계"""
     try:
-        artists = data_manager.load_artists()
-        performances = data_manager.load_performances()
-        songs_master = data_manager.load_songs_master()
-        
-        # 아티스트별 통계 계산
-        artist_stats = {}
-        for artist in artists:
-            # 이 아티스트의 곡들 찾기 (기존 구조 사용 - artist name으로 매칭)
-            artist_name = artist.names.get('original', '')
-            artist_songs = [s for s in songs_master if s.artist.get('original') == artist_name]
-            
-            # 이 아티스트 곡들의 부른 기록들 찾기
-            artist_performances = []
-            for song in artist_songs:
-                song_perfs = [p for p in performances if p.song_master_id == song.id]
-                artist_performances.extend(song_perfs)
-            
-            # 최신/최오래된 공연
-            sorted_perfs = sorted(artist_performances, key=lambda x: x.date) if artist_performances else []
-            latest_perf = None
-            first_perf = None
-            
-            if sorted_perfs:
-                latest_performance = sorted_perfs[-1]
-                first_performance = sorted_perfs[0]
-                
-                # 최신 공연 정보
-                latest_song = next((s for s in songs_master if s.id == latest_performance.song_master_id), None)
-                latest_perf = {
-                    "date": latest_performance.date,
-                    "thumbnail": f"https://img.youtube.com/vi/{latest_performance.video_id}/mqdefault.jpg",
-                    "song_title": latest_song.titles.get('original', '') if latest_song else ''
-                }
-                
-                # 최오래된 공연 정보
-                first_song = next((s for s in songs_master if s.id == first_performance.song_master_id), None)
-                first_perf = {
-                    "date": first_performance.date,
-                    "thumbnail": f"https://img.youtube.com/vi/{first_performance.video_id}/mqdefault.jpg",
-                    "song_title": first_song.titles.get('original', '') if first_song else ''
-                }
-            
-            # 인기 곡들 (부른 횟수 기준)
-            song_counts = {}
-            for perf in artist_performances:
-                song_counts[perf.song_master_id] = song_counts.get(perf.song_master_id, 0) + 1
-            
-            top_songs = []
-            for song in artist_songs:
-                count = song_counts.get(song.id, 0)
-                if count > 0:
-                    top_songs.append({
-                        "id": song.id,
-                        "title": song.titles.get('original', ''),
-                        "performance_count": count
-                    })
-            
-            # 부른 횟수순으로 정렬
-            top_songs.sort(key=lambda x: x['performance_count'], reverse=True)
-            
-            artist_stats[artist.id] = ArtistWithStats(
-                id=artist.id,
-                name=artist.names.get('korean') or artist.names.get('original', ''),
-                names=artist.names,
-                song_count=len(artist_songs),
-                total_performances=len(artist_performances),
-                latest_performance=latest_perf,
-                first_performance=first_perf,
-                top_songs=top_songs
-            )
-        
-        result = list(artist_stats.values())
-        result.sort(key=lambda x: x.total_performances, reverse=True)
+        # 부른 기록을 한 번 훑는 집계 결과 (파일이 바뀌지 않았으면 캐시)
+        result, _ = data_manager.get_aggregated_stats()
         
         logger.info(f"아티스트 통계 조회 성공: {len(result)}명")
         return result
@@ -264,11 +178,8 @@ def get_artists_master():
 def get_songs_by_master(song_master_id: str):
     """특정 곡의 모든 부른 기록"""
     try:
-        all_performances = data_manager.get_performances_with_details()
-        filtered = [p for p in all_performances if p.song_id == song_master_id]
-        
-        # 날짜순 정렬
-        filtered.sort(key=lambda x: x.date, reverse=True)
+        # 필터와 날짜순(최신순) 정렬은 컬럼 저장소에서 처리
+        filtered = data_manager.get_performances_with_details(song_id=song_master_id, newest_first=True)
         
         logger.info(f"곡별 부른 기록 조회 성공: {song_master_id} - {len(filtered)}곡")
         return filtered
@@ -281,11 +192,8 @@ def get_songs_by_master(song_master_id: str):
 def get_artist_songs(name: str):
     """특정 아티스트의 모든 곡"""
     try:
-        all_performances = data_manager.get_performances_with_details()
-        filtered = [p for p in all_performances if p.song_artist == name]
-        
-        # 날짜순 정렬
-        filtered.sort(key=lambda x: x.date, reverse=True)
+        # 필터와 날짜순(최신순) 정렬은 컬럼 저장소에서 처리
+        filtered = data_manager.get_performances_with_details(artist_name=name, newest_first=True)
         
         logger.info(f"아티스트별 곡 조회 성공: {name} - {len(filtered)}곡")
         return filtered
@@ -298,11 +206,8 @@ def get_artist_songs(name: str):
 def get_utaite_songs(name: str):
     """특정 우타이테의 모든 곡"""
     try:
-        all_performances = data_manager.get_performances_with_details()
-        filtered = [p for p in all_performances if p.utaite_name == name]
-        
-        # 날짜순 정렬
-        filtered.sort(key=lambda x: x.date, reverse=True)
+        # 필터와 날짜순(최신순) 정렬은 컬럼 저장소에서 처리
+        filtered = data_manager.get_performances_with_details(utaite_name=name, newest_first=True)
         
         logger.info(f"우타이테별 곡 조회 성공: {name} - {len(filtered)}곡")
         return filtered
@@ -316,6 +221,7 @@ async def update_album_art(limit: int = 5):
     """곡의 앨범아트를 검색해서 업데이트 (기본 5곡씩)"""
     try:
         songs_master = data_manager.load_songs_master()
+        album_arts = {}  # 곡 ID -> 검색된 앨범아트 URL
         updated_count = 0
         processed_count = 0
         
@@ -338,12 +244,12 @@ async def update_album_art(limit: int = 5):
                 album_art_url = await search_album_art(song_title, artist_name)
                 
                 if album_art_url:
-                    song.album_art_url = album_art_url
+                    album_arts[song.id] = album_art_url
                     updated_count += 1
                     logger.info(f"✅ 앨범아트 찾음: {album_art_url}")
                 else:
                     # 기본 이미지 설정
-                    song.album_art_url = get_default_album_art()
+                    album_arts[song.id] = get_default_album_art()
                     logger.info(f"❌ 앨범아트 없음 - 기본 이미지 설정")
                 
                 processed_count += 1
@@ -351,8 +257,17 @@ async def update_album_art(limit: int = 5):
                 # API 호출 제한을 위해 잠시 대기
                 await asyncio.sleep(1.0)  # MusicBrainz는 초당 1회 제한
         
-        # 업데이트된 데이터 저장
-        data_manager.save_songs_master(songs_master)
+        # 검색이 끝난 뒤 쓰기 락 안에서 최신 곡 마스터에 결과만 반영해 저장 (검색 중 다른 워커의 저장을 덮지 않음)
+        if album_arts:
+            with data_manager.write_lock():
+                # 변경 시각은 락 안에서 찍어 증분 동기화가 읽은 시점보다 늦은 저장이 더 이른 시각을 갖지 않게 한다
+                updated_at = datetime.now().isoformat()
+                songs_master = [
+                    song.model_copy(update={'album_art_url': album_arts[song.id], 'updated_at': updated_at})
+                    if song.id in album_arts else song
+                    for song in data_manager.load_songs_master()
+                ]
+                data_manager.save_songs_master(songs_master)
         
         logger.info(f"앨범아트 업데이트 완료: {processed_count}곡 처리, {updated_count}곡 성공")
         return {
@@ -397,15 +312,18 @@ def search_songs(q: str, language: str = "original"):
                 if q.lower() in song.artist.get('original', '').lower():
                     matched_song_ids.add(song.id)
         
-        # 매칭된 부른 기록 찾기
-        all_performances = data_manager.get_performances_with_details(language)
-        results = [
-            p for p in all_performances 
-            if p.utaite_id in matched_utaite_ids or p.song_id in matched_song_ids
-        ]
+        # 매칭된 부른 기록 찾기 (인덱스로 매칭된 우타이테/곡의 기록만 조인)
+        matched = {}
+        for utaite_id in matched_utaite_ids:
+            for p in data_manager.get_performances_with_details(language, utaite_id=utaite_id):
+                matched[p.id] = p
+        for song_id in matched_song_ids:
+            for p in data_manager.get_performances_with_details(language, song_id=song_id):
+                matched[p.id] = p
+        results = list(matched.values())
         
-        # 날짜순 정렬
-        results.sort(key=lambda x: x.date, reverse=True)
+        # 날짜순 정렬 (다른 목록과 같이 epoch 기준)
+        results.sort(key=lambda x: date_to_epoch(x.date), reverse=True)
         
         logger.info(f"검색 완료: '{q}' - {len(results)}개 결과")
         return {
@@ -436,17 +354,29 @@ def parse_video(request: URLRequest):
         if not video_info:
             raise HTTPException(status_code=404, detail="비디오 정보를 가져올 수 없습니다.")
         
-        comments = find_comment(video_id)
-        songs = parse_songs_from_comments(comments, request.parsing_mode)
+        # 일시적 오류로 중단돼도 이미 받은 페이지는 파싱에 사용
+        crawl = crawl_comments(video_id, allow_partial=True)
+        if not crawl.completed and not crawl.comments:
+            raise HTTPException(status_code=502, detail=f"댓글을 가져올 수 없습니다: {crawl.error}")
+        
+        songs = parse_songs_from_comments(crawl.comments, request.parsing_mode)
         song_objects = [ParsedSong(**song) for song in songs]
         
         result = {
             "video_info": video_info,
             "video_url": request.url,
-            "songs": song_objects
+            "songs": song_objects,
+            "crawl_stats": {
+                "pages": crawl.stats.pages,
+                "retries": crawl.stats.retries,
+                "elapsed": round(crawl.stats.elapsed, 3),
+                "completed": crawl.completed,
+                "next_page_token": crawl.next_page_token,
+                "error": crawl.error
+            }
         }
         
-        logger.info(f"비디오 파싱 완료: {len(song_objects)}곡 추출됨")
+        logger.info(f"비디오 파싱 완료: {len(song_objects)}곡 추출됨 (댓글 {crawl.stats.pages}페이지, 재시도 {crawl.stats.retries}회)")
         return result
         
     except HTTPException:
@@ -461,51 +391,45 @@ def save_songs_endpoint(request: SaveSongsRequest):
     logger.info(f"노래 저장 시작: Video ID={request.video_info.id}, 곡 수={len(request.songs)}")
     
     try:
-        # 중복 체크
-        existing_performances = data_manager.load_performances()
-        existing_video_perfs = [p for p in existing_performances if p.video_id == request.video_info.id]
-        if existing_video_perfs:
-            raise HTTPException(status_code=400, detail="이미 등록된 영상입니다.")
-        
         # 부른 사람 결정
         if request.singer_override:
             singer_name = request.singer_override.strip()
         else:
             singer_name = extract_singer_from_title_and_channel(request.video_info.title, request.video_info.channel)
         
-        # 우타이테 ID 찾기/생성
-        utaite_id = data_manager.find_or_create_utaite(singer_name)
-        
-        # 새 부른 기록 생성
+        # 우타이테/아티스트/곡을 한 번에 해석하고 마스터 파일은 파일당 한 번만 저장
         new_performances = []
-        current_date = datetime.now().isoformat()
         
-        for i, song in enumerate(request.songs):
-            # 아티스트 찾기/생성
-            artist_id = data_manager.find_or_create_artist(song.song_artist)
+        # 작업 단위는 쓰기 락을 잡으므로 중복 체크부터 저장까지 다른 워커의 저장과 섞이지 않는다
+        with data_manager.unit_of_work() as uow:
+            # 날짜는 락 안에서 찍어 증분 동기화의 수위보다 이른 시각으로 저장되지 않게 한다
+            current_date = datetime.now().isoformat()
+            
+            # 중복 체크
+            if data_manager.get_video_performances(request.video_info.id):
+                raise HTTPException(status_code=400, detail="이미 등록된 영상입니다.")
             
-            # 곡 마스터 찾기/생성 
-            song_master_id = find_or_create_song_master_v2(song.song_name, artist_id)
+            utaite_id = uow.utaite_id(singer_name)
+            
+            for i, song in enumerate(request.songs):
+                # 곡 마스터 (아티스트 포함) 찾기/생성
+                song_master_id = uow.song_master_id(song.song_name, song.song_artist)
+                
+                # 부른 기록 생성
+                performance_id = f"{request.video_info.id}_{i}_{song.start_time.replace(':', '')}"
+                performance = Performance(
+                    id=performance_id,
+                    song_master_id=song_master_id,
+                    utaite_id=utaite_id,
+                    video_id=request.video_info.id,
+                    start_time=song.start_time,
+                    start_time_seconds=time_to_seconds(song.start_time),
+                    date=current_date
+                )
+                new_performances.append(performance)
             
-            # 부른 기록 생성
-            performance_id = f"{request.video_info.id}_{i}_{song.start_time.replace(':', '')}"
-            performance = Performance(
-                id=performance_id,
-                song_master_id=song_master_id,
-                utaite_id=utaite_id,
-                video_id=request.video_info.id,
-                start_time=song.start_time,
-                start_time_seconds=time_to_seconds(song.start_time),
-                date=current_date
-            )
-            new_performances.append(performance)
-        
-        # 저장
-        all_performances = existing_performances + new_performances
-        data_manager.save_performances(all_performances)
-        
-        # 통계 업데이트
-        update_performance_counts()
+            # 저장 (보조 인덱스와 통계는 새 기록만큼만 갱신)
+            uow.add_performances(new_performances)
         
         logger.info("노래 저장 완료")
         return {"message": f"{len(new_performances)}곡이 성공적으로 저장되었습니다.", "performances": new_performances}
@@ -626,78 +550,6 @@ def get_default_album_art() -> str:
 
 # === Helper Functions ===
 
-def find_or_create_song_master_v2(song_name: str, artist_id: str) -> str:
-    """새로운 구조로 곡 마스터 찾기/생성"""
-    songs_master = data_manager.load_songs_master()
-    
-    # 기존 곡 찾기 (기존 구조 사용)
-    for song in songs_master:
-        if (song.titles.get('original') == song_name and 
-            song.artist.get('original') == artist_id):
-            return song.id
-    
-    # 새 곡 생성
-    song_id = generate_id('song', f"{song_name}|{artist_id}")
-    current_time = datetime.now().isoformat()
-    
-    new_song = SongMaster(
-        id=song_id,
-        titles={'original': song_name, 'korean': '', 'english': '', 'romanized': ''},
-        artist={'original': artist_id, 'korean': '', 'english': ''},
-        tags=[],
-        performance_count=0
-    )
-    
-    songs_master.append(new_song)
-    data_manager.save_songs_master(songs_master)
-    
-    logger.info(f"새 곡 마스터 생성: {song_name} (ID: {song_id})")
-    return song_id
-
-def update_performance_counts():
-    """부른 횟수/곡 수 통계 업데이트"""
-    try:
-        performances = data_manager.load_performances()
-        utaites = data_manager.load_utaites()
-        songs_master = data_manager.load_songs_master()
-        artists = data_manager.load_artists()
-        
-        # 우타이테별 부른 횟수
-        utaite_counts = {}
-        for perf in performances:
-            utaite_counts[perf.utaite_id] = utaite_counts.get(perf.utaite_id, 0) + 1
-        
-        for utaite in utaites:
-            utaite.performance_count = utaite_counts.get(utaite.id, 0)
-        
-        # 곡별 부른 횟수
-        song_counts = {}
-        for perf in performances:
-            song_counts[perf.song_master_id] = song_counts.get(perf.song_master_id, 0) + 1
-        
-        for song in songs_master:
-            song.performance_count = song_counts.get(song.id, 0)
-        
-        # 아티스트별 곡 수 (기존 구조 사용)
-        artist_counts = {}
-        for song in songs_master:
-            artist_name = song.artist.get('original')
-            if artist_name:
-                artist_counts[artist_name] = artist_counts.get(artist_name, 0) + 1
-        
-        for artist in artists:
-            artist.song_count = artist_counts.get(artist.id, 0)
-        
-        # 저장
-        data_manager.save_utaites(utaites)
-        data_manager.save_songs_master(songs_master)
-        data_manager.save_artists(artists)
-        
-        logger.info("통계 업데이트 완료")
-        
-    except Exception as e:
-        logger.error(f"통계 업데이트 실패: {e}")
-
 # 기존 함수들을 deprecated 파일에서 import
 import sys
 import os
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+부른 기록(performances) 날짜 범위 파티션 관리 스크립트 (선택 기능)
+init.sql의 기본 스키마는 단일 테이블이고, convert로 월 단위 RANGE (date) 파티션 테이블로 바꾼 뒤
+create(앞으로 쓸 파티션 미리 생성) / list / archive(오래된 파티션 분리) / vacuum / explain-recent로 관리한다
+
+파티션 테이블은 기본 키/유니크 제약에 파티션 키가 들어가야 해서
+PRIMARY KEY (id, date), uq_performances_video_start_song (video_id, start_time, song_master_id, date)가 된다
+(한 비디오의 부른 기록은 모두 같은 방송 날짜라 중복 판정 결과는 같다)
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from database import engine
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TABLE = "performances"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+def _month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def _parse_month(value: str) -> date:
+    """YYYY-MM -> 그 달 1일"""
+    return datetime.strptime(value, "%Y-%m").date()
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+def _partition_month(name: str) -> Optional[date]:
+    """performances_pYYYY_MM -> 그 달 1일 (기본 파티션 등은 None)"""
+    prefix = f"{TABLE}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix):], "%Y_%m").date()
+    except ValueError:
+        return None
+
+def is_partitioned(connection) -> bool:
+    relkind = connection.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": TABLE}).scalar()
+    return relkind == "p"
+
+def list_partitions(connection) -> List[Dict]:
+    """파티션 이름, 범위, 예상 행 수, 크기"""
+    rows = connection.execute(text("""
+        SELECT c.relname AS name,
+               pg_get_expr(c.relpartbound, c.oid) AS bound,
+               GREATEST(c.reltuples, 0)::bigint AS rows,
+               pg_total_relation_size(c.oid) AS bytes
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+        ORDER BY c.relname
+    """), {"table": TABLE}).mappings().all()
+    return [dict(row) for row in rows]
+
+def create_partitions(connection, first: date, last: date) -> List[str]:
+    """first~last 달의 월 파티션을 없는 것만 생성 (기본 파티션에 들어가 있던 그 달 행은 새 파티션으로 옮김)
+
+    새 파티션은 독립 테이블로 만들어 행을 옮긴 뒤 ATTACH한다.
+    부모 테이블을 거치지 않으므로 performance_details 동기화 트리거가 다시 돌지 않는다.
+    """
+    existing = {row["name"] for row in list_partitions(connection)}
+    has_default = DEFAULT_PARTITION in existing
+    created = []
+    month = _month_start(first)
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            bounds = {"start": month, "end": _add_months(month, 1)}
+            connection.exec_driver_sql(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            if has_default:
+                moved = connection.execute(text(f"""
+                    WITH moved AS (
+                        DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *
+                    )
+                    INSERT INTO {name} SELECT * FROM moved
+                """), bounds).rowcount
+                if moved:
+                    logger.info(f"  기본 파티션에서 {moved}행 이동 -> {name}")
+            connection.execute(text(
+                f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (:start) TO (:end)"
+            ), bounds)
+            created.append(name)
+            logger.info(f"파티션 생성: {name} [{bounds['start']}, {bounds['end']})")
+        month = _add_months(month, 1)
+    return created
+
+def _capture_dependents(connection) -> Dict[str, list]:
+    """단일 테이블을 지우기 전에 다시 만들어야 할 인덱스/제약/트리거/뷰 정의 수집"""
+    params = {"table": TABLE}
+    indexes = connection.execute(text("""
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = to_regclass(:table)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+    """), params).scalars().all()
+    keys = connection.execute(text("""
+        SELECT c.conname, c.contype,
+               array_agg(a.attname::text ORDER BY k.ord) AS columns
+        FROM pg_constraint c
+        CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+        WHERE c.conrelid = to_regclass(:table) AND c.contype IN ('p', 'u')
+        GROUP BY c.conname, c.contype
+    """), params).all()
+    foreign_keys = connection.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(:table) AND contype = 'f'
+    """), params).all()
+    triggers = connection.execute(text("""
+        SELECT pg_get_triggerdef(oid)
+        FROM pg_trigger
+        WHERE tgrelid = to_regclass(:table) AND NOT tgisinternal
+    """), params).scalars().all()
+    views = connection.execute(text("""
+        SELECT DISTINCT v.relname, pg_get_viewdef(v.oid)
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        WHERE d.refobjid = to_regclass(:table) AND v.relkind = 'v'
+    """), params).all()
+    return {"indexes": indexes, "keys": keys, "foreign_keys": foreign_keys, "triggers": triggers, "views": views}
+
+def convert(connection, months_ahead: int) -> List[str]:
+    """단일 performances 테이블을 월 단위 파티션 테이블로 변환 (한 트랜잭션, 변환 중 쓰기는 막힘)"""
+    if is_partitioned(connection):
+        raise ValueError("performances는 이미 파티션 테이블입니다")
+
+    connection.exec_driver_sql(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    first, last = connection.exec_driver_sql(f"SELECT MIN(date), MAX(date) FROM {TABLE}").one()
+    today = _month_start(date.today())
+    first = _month_start(first) if first else today
+    last = max(_month_start(last) if last else today, _add_months(today, months_ahead))
+
+    dependents = _capture_dependents(connection)
+    sequence = connection.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": TABLE}).scalar()
+    old = f"{TABLE}_unpartitioned"
+
+    # 1. 새 파티션 부모 + 기본 파티션 + 데이터 범위의 월 파티션
+    connection.exec_driver_sql(f"ALTER TABLE {TABLE} RENAME TO {old}")
+    if sequence:
+        connection.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    connection.exec_driver_sql(f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (date)")
+    connection.exec_driver_sql(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+    created = create_partitions(connection, first, last)
+
+    # 2. 데이터 복사 (트리거를 만들기 전이라 performance_details는 그대로)
+    columns = ", ".join(connection.execute(text("""
+        SELECT quote_ident(attname) FROM pg_attribute
+        WHERE attrelid = to_regclass(:table) AND attnum > 0 AND NOT attisdropped
+        ORDER BY attnum
+    """), {"table": old}).scalars().all())
+    copied = connection.exec_driver_sql(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {old}").rowcount
+    logger.info(f"부른 기록 {copied}행 복사")
+
+    # 3. 단일 테이블 삭제 (의존 뷰도 함께 지웠다가 아래에서 다시 만듦)
+    connection.exec_driver_sql(f"DROP TABLE {old} CASCADE")
+    if sequence:
+        connection.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+
+    # 4. 키/제약/인덱스/트리거/뷰 재생성 (기본 키/유니크에는 파티션 키 date 추가)
+    for name, contype, key_columns in dependents["keys"]:
+        key_columns = list(key_columns) + ([] if "date" in key_columns else ["date"])
+        kind = "PRIMARY KEY" if contype == "p" else "UNIQUE"
+        connection.exec_driver_sql(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {kind} ({', '.join(key_columns)})")
+    for name, definition in dependents["foreign_keys"]:
+        connection.exec_driver_sql(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+    for definition in dependents["indexes"]:
+        connection.exec_driver_sql(definition)
+    for definition in dependents["triggers"]:
+        connection.exec_driver_sql(definition)
+    for name, definition in dependents["views"]:
+        connection.exec_driver_sql(f"CREATE VIEW {name} AS {definition}")
+
+    connection.exec_driver_sql(f"ANALYZE {TABLE}")
+    return created
+
+def archive(connection, before: date, schema: str) -> List[str]:
+    """before 달 이전 파티션을 분리해 보관 스키마로 옮기고 읽기 테이블에서 해당 행 제거"""
+    connection.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+    archived = []
+    for row in list_partitions(connection):
+        month = _partition_month(row["name"])
+        if month is None or _add_months(month, 1) > before:
+            continue
+        name = row["name"]
+        connection.exec_driver_sql(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        # 분리는 삭제 트리거를 거치지 않으므로 비정규화 읽기 테이블은 직접 정리
+        removed = connection.exec_driver_sql(
+            f"DELETE FROM performance_details d USING {name} p WHERE d.id = p.id"
+        ).rowcount
+        connection.exec_driver_sql(f"ALTER TABLE {name} SET SCHEMA {schema}")
+        archived.append(name)
+        logger.info(f"파티션 보관: {name} -> {schema}.{name} (performance_details {removed}행 제거)")
+    return archived
+
+def vacuum(names: List[str]):
+    """파티션별 VACUUM ANALYZE (트랜잭션 밖에서 실행)"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name in names:
+            started = datetime.now()
+            connection.exec_driver_sql(f"VACUUM (ANALYZE) {name}")
+            logger.info(f"VACUUM 완료: {name} ({(datetime.now() - started).total_seconds():.1f}초)")
+
+def explain_recent(connection, days: int) -> Tuple[List[str], str]:
+    """최근 N일 부른 기록 조회가 읽는 파티션 (파티션 가지치기 확인용)"""
+    # 기준 시각을 상수로 넘겨 계획 단계에서 가지치기되게 한다 (now()는 실행 시점 가지치기)
+    since = datetime.now() - timedelta(days=days)
+    plan = connection.execute(text(f"""
+        EXPLAIN (FORMAT JSON)
+        SELECT id, song_master_id, utaite_id, video_id, start_time, date
+        FROM {TABLE}
+        WHERE date >= :since
+        ORDER BY date DESC, id
+    """), {"since": since}).scalar()
+    plan = plan[0]["Plan"] if isinstance(plan, list) else plan
+
+    scanned = []
+    def walk(node: dict):
+        if node.get("Relation Name"):
+            scanned.append(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+    walk(plan)
+    return sorted(set(scanned)), plan.get("Node Type", "")
+
+def main():
+    parser = argparse.ArgumentParser(description="performances 날짜 범위 파티션 관리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="단일 테이블을 월 단위 파티션 테이블로 변환")
+    convert_parser.add_argument("--months-ahead", type=int, default=3, help="미리 만들 이후 달 수")
+
+    create_parser = commands.add_parser("create", help="월 파티션 미리 생성 (cron으로 주기 실행)")
+    create_parser.add_argument("--from", dest="first", help="시작 달 YYYY-MM (기본: 이번 달)")
+    create_parser.add_argument("--months-ahead", type=int, default=3, help="미리 만들 이후 달 수")
+
+    commands.add_parser("list", help="파티션 목록/행 수/크기")
+
+    archive_parser = commands.add_parser("archive", help="오래된 파티션 분리 후 보관 스키마로 이동")
+    archive_parser.add_argument("--before", required=True, help="이 달(YYYY-MM) 이전 파티션을 보관")
+    archive_parser.add_argument("--schema", default="archive", help="보관 스키마")
+
+    vacuum_parser = commands.add_parser("vacuum", help="파티션별 VACUUM ANALYZE")
+    vacuum_parser.add_argument("partitions", nargs="*", help="파티션 이름 (없으면 --recent 사용)")
+    vacuum_parser.add_argument("--recent", type=int, default=2, help="이름을 안 주면 최근 N개 월 파티션")
+
+    explain_parser = commands.add_parser("explain-recent", help="최근 N일 조회가 읽는 파티션 확인")
+    explain_parser.add_argument("--days", type=int, default=30)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "vacuum":
+            names = args.partitions
+            if not names:
+                with engine.connect() as connection:
+                    monthly = [row["name"] for row in list_partitions(connection) if _partition_month(row["name"])]
+                names = monthly[-args.recent:]
+            vacuum(names)
+            return 0
+
+        with engine.connect() as connection:
+            if args.command != "convert" and not is_partitioned(connection):
+                logger.error("performances가 파티션 테이블이 아닙니다 (먼저 convert 실행)")
+                return 1
+
+            if args.command == "convert":
+                created = convert(connection, args.months_ahead)
+                logger.info(f"✅ 파티션 변환 완료: 월 파티션 {len(created)}개 + {DEFAULT_PARTITION}")
+            elif args.command == "create":
+                first = _parse_month(args.first) if args.first else _month_start(date.today())
+                created = create_partitions(connection, first, _add_months(_month_start(date.today()), args.months_ahead))
+                logger.info(f"✅ 새 파티션 {len(created)}개")
+            elif args.command == "list":
+                for row in list_partitions(connection):
+                    print(f"{row['name']:<28} {row['bound']:<70} {row['rows']:>12,}행 {row['bytes'] / 1024 / 1024:>10.1f}MB")
+            elif args.command == "archive":
+                archived = archive(connection, _parse_month(args.before), args.schema)
+                logger.info(f"✅ 보관한 파티션 {len(archived)}개")
+            elif args.command == "explain-recent":
+                scanned, node = explain_recent(connection, args.days)
+                logger.info(f"최근 {args.days}일 조회 ({node}): {len(scanned)}개 파티션 - {', '.join(scanned)}")
+            connection.commit()
+        return 0
+    except Exception as e:
+        logger.error(f"파티션 작업 실패: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
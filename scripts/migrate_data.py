@@ -2,14 +2,16 @@
 """
 데이터 마이그레이션 스크립트
 기존 JSON 구조를 새로운 정규화된 구조로 변환
+기존 songs.json은 한 번만 스트리밍하며 변환 결과를 바로 파일에 쓴다 (메모리는 마스터/통계 크기만 사용)
 """
+import argparse
 import json
 import os
 import shutil
+import time
 from datetime import datetime
-from collections import defaultdict
-# 간단한 함수들만 포함
 import hashlib
+from json_stream import iter_json_records
 
 def time_to_seconds(time_str: str) -> int:
     """시간 문자열을 초로 변환 (0:28:42 -> 1722)"""
@@ -47,282 +49,252 @@ def backup_data():
     
     return backup_dir
 
-def load_old_data():
-    """기존 데이터 로드"""
-    print("📂 기존 데이터 로드 중...")
-    
-    # 기존 songs.json (부른 기록)
-    with open("data/songs.json", "r", encoding="utf-8") as f:
-        old_songs = json.load(f)
-    
-    # 기존 songs_master.json 
-    with open("data/songs_master.json", "r", encoding="utf-8") as f:
-        old_songs_master = json.load(f)
-    
-    # 기존 utaites_master.json
-    utaites_master = []
-    if os.path.exists("data/utaites_master.json"):
-        with open("data/utaites_master.json", "r", encoding="utf-8") as f:
-            utaites_master = json.load(f)
-    
-    print(f"📊 로드된 데이터:")
-    print(f"  - 부른 기록: {len(old_songs)}곡")
+class JsonArrayWriter:
+    """JSON 배열을 원소 단위로 임시 파일에 써 두었다가 close()에서 원자적으로 교체"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.count = 0
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self._file.write("[")
+
+    def write(self, item: dict):
+        self._file.write(",\n  " if self.count else "\n  ")
+        self._file.write(json.dumps(item, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]\n" if self.count else "]\n")
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def write_json(path: str, items) -> int:
+    """리스트/이터러블을 JsonArrayWriter로 저장하고 개수 반환"""
+    writer = JsonArrayWriter(path)
+    try:
+        for item in items:
+            writer.write(item)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return writer.count
+
+class Progress:
+    """처리 건수/처리량 주기적 출력"""
+
+    def __init__(self, label: str, every: int = 50_000):
+        self.label = label
+        self.every = every
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def tick(self):
+        self.count += 1
+        if self.count % self.every == 0:
+            self.report()
+
+    def report(self, final: bool = False):
+        elapsed = time.perf_counter() - self.started
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        mark = "✅" if final else "⏳"
+        print(f"{mark} {self.label}: {self.count:,}건, {elapsed:.1f}초, {rate:,.0f}건/초")
+
+def load_masters(data_dir: str):
+    """곡 마스터/기존 우타이테 로드 (부른 기록에 비해 작아서 메모리에 둔다)"""
+    print("📂 마스터 데이터 로드 중...")
+    old_songs_master = list(iter_json_records(os.path.join(data_dir, "songs_master.json")))
+
+    utaites_path = os.path.join(data_dir, "utaites_master.json")
+    existing_utaites = list(iter_json_records(utaites_path)) if os.path.exists(utaites_path) else []
+
     print(f"  - 곡 마스터: {len(old_songs_master)}곡")
-    print(f"  - 우타이테: {len(utaites_master)}명")
-    
-    return old_songs, old_songs_master, utaites_master
+    print(f"  - 기존 우타이테: {len(existing_utaites)}명")
+    return old_songs_master, existing_utaites
 
-def extract_unique_data(old_songs, old_songs_master):
-    """고유 데이터 추출"""
-    print("🔍 고유 데이터 추출 중...")
-    
-    # 우타이테 추출
-    utaites = {}
-    for song in old_songs:
-        singer = song.get("singer", "미상")
-        if singer and singer != "미상":
-            utaite_id = generate_id("utaite", singer)
-            utaites[utaite_id] = {
-                "id": utaite_id,
-                "names": {
-                    "original": singer,
-                    "korean": "",
-                    "english": "",
-                    "romanized": ""
-                },
-                "performance_count": 0,
-                "first_appearance": None,
-                "latest_appearance": None,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-    
-    # 아티스트 추출 (songs_master에서)
+def migrate_masters(old_songs_master, now: str):
+    """아티스트 추출 + 곡 마스터 변환 (performance_count는 부른 기록 스트리밍 후 채움)"""
+    print("🎵 아티스트/곡 마스터 변환 중...")
     artists = {}
+    songs_master = []
     for song in old_songs_master:
         artist_name = song.get("artist", {}).get("original", "미상")
+        artist_id = None
         if artist_name and artist_name != "미상":
             artist_id = generate_id("artist", artist_name)
-            artists[artist_id] = {
-                "id": artist_id,
-                "names": {
-                    "original": artist_name,
-                    "korean": "",
-                    "english": "",
-                    "romanized": ""
-                },
-                "song_count": 0,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-    
-    # 비디오 추출
-    videos = {}
-    for song in old_songs:
-        video_id = song.get("video_id")
-        if video_id and video_id not in videos:
-            videos[video_id] = {
-                "id": video_id,
-                "title": song.get("video_title", ""),
-                "channel": song.get("video_channel", ""),
-                "thumbnail_url": song.get("thumbnail", f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"),
-                "duration": None,
-                "published_at": None,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-    
-    print(f"📈 추출된 고유 데이터:")
-    print(f"  - 우타이테: {len(utaites)}명")
-    print(f"  - 아티스트: {len(artists)}명")
-    print(f"  - 비디오: {len(videos)}개")
-    
-    return list(utaites.values()), list(artists.values()), list(videos.values())
+            if artist_id not in artists:
+                artists[artist_id] = {
+                    "id": artist_id,
+                    "names": {"original": artist_name, "korean": "", "english": "", "romanized": ""},
+                    "song_count": 0,
+                    "created_at": now,
+                    "updated_at": now
+                }
+            artists[artist_id]["song_count"] += 1
 
-def migrate_songs_master(old_songs_master, artists):
-    """곡 마스터 마이그레이션"""
-    print("🎵 곡 마스터 마이그레이션 중...")
-    
-    # 아티스트 이름으로 ID 찾기 위한 매핑
-    artist_name_to_id = {}
-    for artist in artists:
-        artist_name_to_id[artist["names"]["original"]] = artist["id"]
-    
-    new_songs_master = []
-    for song in old_songs_master:
-        artist_name = song.get("artist", {}).get("original", "미상")
-        artist_id = artist_name_to_id.get(artist_name)
-        
-        new_song = {
+        songs_master.append({
             "id": song["id"],
             "titles": song.get("titles", {"original": "미상"}),
             "artist": song.get("artist", {"original": "미상"}),  # 기존 구조 유지
             "artist_id": artist_id,  # 새로운 참조 추가
             "tags": song.get("tags", []),
-            "performance_count": song.get("performance_count", 0),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-        new_songs_master.append(new_song)
-    
-    print(f"✅ {len(new_songs_master)}곡 마이그레이션 완료")
-    return new_songs_master
+            "performance_count": 0,
+            "created_at": now,
+            "updated_at": now
+        })
 
-def migrate_performances(old_songs, utaites, songs_master):
-    """부른 기록 마이그레이션"""
-    print("🎤 부른 기록 마이그레이션 중...")
-    
-    # 우타이테 이름으로 ID 찾기 위한 매핑
-    utaite_name_to_id = {}
-    for utaite in utaites:
-        utaite_name_to_id[utaite["names"]["original"]] = utaite["id"]
-    
-    # 곡 ID 존재 여부 확인을 위한 세트
-    song_ids = {song["id"] for song in songs_master}
-    
-    new_performances = []
-    for song in old_songs:
-        singer = song.get("singer", "미상")
-        utaite_id = utaite_name_to_id.get(singer, "unknown")
-        
-        # song_master_id 검증
-        song_master_id = song.get("song_master_id")
-        if song_master_id not in song_ids:
-            print(f"⚠️  존재하지 않는 song_master_id: {song_master_id}")
-            continue
-        
-        new_performance = {
-            "id": song["id"],
-            "song_master_id": song_master_id,
-            "utaite_id": utaite_id,
-            "video_id": song["video_id"],
-            "start_time": song["start_time"],
-            "start_time_seconds": time_to_seconds(song["start_time"]),
-            "date": song["date"],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-        new_performances.append(new_performance)
-    
-    print(f"✅ {len(new_performances)}개 부른 기록 마이그레이션 완료")
-    return new_performances
+    print(f"  - 아티스트: {len(artists)}명, 곡 마스터: {len(songs_master)}곡")
+    return list(artists.values()), songs_master
+
+def stream_performances(data_dir: str, songs_master, existing_utaites, now: str, progress_every: int):
+    """기존 songs.json을 한 번 훑으며 부른 기록/비디오를 바로 쓰고 우타이테/곡 통계를 누적
+
+    메모리에는 우타이테/곡 통계와 이미 쓴 비디오 ID만 남는다.
+    부른 기록은 임시 파일에 쓴 뒤 읽기가 끝나면 songs.json을 교체한다.
+    """
+    print("🎤 부른 기록 스트리밍 변환 중...")
+    utaites = {u["names"]["original"]: u for u in existing_utaites}
+    utaite_stats = {}  # utaite_id -> [count, first, latest]
+    song_counts = {song["id"]: 0 for song in songs_master}
+    seen_videos = set()
+    skipped = 0
+
+    songs_path = os.path.join(data_dir, "songs.json")
+    performances = JsonArrayWriter(songs_path)
+    videos = JsonArrayWriter(os.path.join(data_dir, "videos_master.json"))
+    progress = Progress("부른 기록", progress_every)
+    try:
+        for song in iter_json_records(songs_path):
+            progress.tick()
+            singer = song.get("singer", "미상")
+            if singer and singer != "미상" and singer not in utaites:
+                utaite_id = generate_id("utaite", singer)
+                utaites[singer] = {
+                    "id": utaite_id,
+                    "names": {"original": singer, "korean": "", "english": "", "romanized": ""},
+                    "performance_count": 0,
+                    "first_appearance": None,
+                    "latest_appearance": None,
+                    "created_at": now,
+                    "updated_at": now
+                }
+
+            video_id = song.get("video_id")
+            if video_id and video_id not in seen_videos:
+                seen_videos.add(video_id)
+                videos.write({
+                    "id": video_id,
+                    "title": song.get("video_title", ""),
+                    "channel": song.get("video_channel", ""),
+                    "thumbnail_url": song.get("thumbnail", f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"),
+                    "duration": None,
+                    "published_at": None,
+                    "created_at": now,
+                    "updated_at": now
+                })
+
+            # song_master_id 검증
+            song_master_id = song.get("song_master_id")
+            if song_master_id not in song_counts:
+                print(f"⚠️  존재하지 않는 song_master_id: {song_master_id}")
+                skipped += 1
+                continue
+
+            utaite = utaites.get(singer)
+            utaite_id = utaite["id"] if utaite else "unknown"
+            performances.write({
+                "id": song["id"],
+                "song_master_id": song_master_id,
+                "utaite_id": utaite_id,
+                "video_id": song["video_id"],
+                "start_time": song["start_time"],
+                "start_time_seconds": time_to_seconds(song["start_time"]),
+                "date": song["date"],
+                "created_at": now,
+                "updated_at": now
+            })
+
+            song_counts[song_master_id] += 1
+            date = song["date"]
+            stats = utaite_stats.get(utaite_id)
+            if stats is None:
+                utaite_stats[utaite_id] = [1, date, date]
+            else:
+                stats[0] += 1
+                if date < stats[1]:
+                    stats[1] = date
+                elif date > stats[2]:
+                    stats[2] = date
+    except BaseException:
+        performances.abort()
+        videos.abort()
+        raise
+
+    performances.close()
+    videos.close()
+    progress.report(final=True)
 
-def update_statistics(utaites, artists, songs_master, performances):
-    """통계 정보 업데이트"""
-    print("📊 통계 정보 업데이트 중...")
-    
-    # 우타이테별 부른 횟수 및 날짜
-    utaite_stats = defaultdict(lambda: {"count": 0, "dates": []})
-    for perf in performances:
-        utaite_id = perf["utaite_id"]
-        utaite_stats[utaite_id]["count"] += 1
-        utaite_stats[utaite_id]["dates"].append(perf["date"])
-    
-    for utaite in utaites:
-        stats = utaite_stats[utaite["id"]]
-        utaite["performance_count"] = stats["count"]
-        if stats["dates"]:
-            sorted_dates = sorted(stats["dates"])
-            utaite["first_appearance"] = sorted_dates[0]
-            utaite["latest_appearance"] = sorted_dates[-1]
-    
-    # 곡별 부른 횟수
-    song_counts = defaultdict(int)
-    for perf in performances:
-        song_counts[perf["song_master_id"]] += 1
-    
     for song in songs_master:
         song["performance_count"] = song_counts[song["id"]]
-    
-    # 아티스트별 곡 수
-    artist_counts = defaultdict(int)
-    for song in songs_master:
-        if song.get("artist_id"):
-            artist_counts[song["artist_id"]] += 1
-    
-    for artist in artists:
-        artist["song_count"] = artist_counts[artist["id"]]
-    
-    print("✅ 통계 정보 업데이트 완료")
+    for utaite in utaites.values():
+        stats = utaite_stats.get(utaite["id"])
+        utaite["performance_count"] = stats[0] if stats else 0
+        if stats:
+            utaite["first_appearance"], utaite["latest_appearance"] = stats[1], stats[2]
 
-def save_migrated_data(utaites, artists, songs_master, videos, performances):
-    """마이그레이션된 데이터 저장"""
-    print("💾 마이그레이션된 데이터 저장 중...")
-    
-    # 우타이테 마스터
-    with open("data/utaites_master.json", "w", encoding="utf-8") as f:
-        json.dump(utaites, f, ensure_ascii=False, indent=2)
-    print(f"✅ 우타이테 마스터 저장: {len(utaites)}명")
-    
-    # 아티스트 마스터
-    with open("data/artists_master.json", "w", encoding="utf-8") as f:
-        json.dump(artists, f, ensure_ascii=False, indent=2)
-    print(f"✅ 아티스트 마스터 저장: {len(artists)}명")
-    
-    # 곡 마스터 (새 구조로 덮어쓰기)
-    with open("data/songs_master.json", "w", encoding="utf-8") as f:
-        json.dump(songs_master, f, ensure_ascii=False, indent=2)
-    print(f"✅ 곡 마스터 저장: {len(songs_master)}곡")
-    
-    # 비디오 마스터
-    with open("data/videos_master.json", "w", encoding="utf-8") as f:
-        json.dump(videos, f, ensure_ascii=False, indent=2)
-    print(f"✅ 비디오 마스터 저장: {len(videos)}개")
-    
-    # 부른 기록 (새 구조로 덮어쓰기)
-    with open("data/songs.json", "w", encoding="utf-8") as f:
-        json.dump(performances, f, ensure_ascii=False, indent=2)
-    print(f"✅ 부른 기록 저장: {len(performances)}개")
+    print(f"  - 부른 기록: {performances.count}개 (건너뜀 {skipped}개), 비디오: {videos.count}개")
+    return list(utaites.values()), performances.count, videos.count
 
 def main():
     """메인 마이그레이션 실행"""
+    parser = argparse.ArgumentParser(description="기존 JSON 구조를 정규화된 구조로 변환 (한 번 스트리밍)")
+    parser.add_argument("--data-dir", default="data", help="데이터 디렉토리")
+    parser.add_argument("--progress-every", type=int, default=50_000, help="진행 상황 출력 간격 (건)")
+    args = parser.parse_args()
+
     print("🚀 데이터 마이그레이션 시작")
     print("=" * 50)
-    
+    started = time.perf_counter()
+    now = datetime.now().isoformat()
+
     # 1. 백업 (스킵)
     print("⚠️  백업 단계 스킵 (권한 문제)")
     print("-" * 50)
-    
-    # 2. 기존 데이터 로드
-    old_songs, old_songs_master, existing_utaites = load_old_data()
-    print("-" * 50)
-    
-    # 3. 고유 데이터 추출
-    utaites, artists, videos = extract_unique_data(old_songs, old_songs_master)
-    
-    # 기존 우타이테 정보 병합
-    if existing_utaites:
-        existing_utaite_names = {u["names"]["original"] for u in existing_utaites}
-        new_utaites = [u for u in utaites if u["names"]["original"] not in existing_utaite_names]
-        utaites = existing_utaites + new_utaites
-        print(f"🔄 기존 우타이테 {len(existing_utaites)}명과 새 우타이테 {len(new_utaites)}명 병합")
-    
-    print("-" * 50)
-    
-    # 4. 곡 마스터 마이그레이션
-    songs_master = migrate_songs_master(old_songs_master, artists)
-    print("-" * 50)
-    
-    # 5. 부른 기록 마이그레이션
-    performances = migrate_performances(old_songs, utaites, songs_master)
+
+    # 2. 마스터 로드 + 변환
+    old_songs_master, existing_utaites = load_masters(args.data_dir)
+    artists, songs_master = migrate_masters(old_songs_master, now)
+    del old_songs_master
     print("-" * 50)
-    
-    # 6. 통계 업데이트
-    update_statistics(utaites, artists, songs_master, performances)
+
+    # 3. 부른 기록 한 번 스트리밍 (부른 기록/비디오는 바로 저장, 통계 누적)
+    utaites, performance_count, video_count = stream_performances(
+        args.data_dir, songs_master, existing_utaites, now, args.progress_every
+    )
     print("-" * 50)
-    
-    # 7. 저장
-    save_migrated_data(utaites, artists, songs_master, videos, performances)
+
+    # 4. 통계가 채워진 마스터 저장
+    print("💾 마스터 데이터 저장 중...")
+    write_json(os.path.join(args.data_dir, "utaites_master.json"), utaites)
+    write_json(os.path.join(args.data_dir, "artists_master.json"), artists)
+    write_json(os.path.join(args.data_dir, "songs_master.json"), songs_master)
     print("-" * 50)
-    
+
+    elapsed = time.perf_counter() - started
     print("🎉 마이그레이션 완료!")
-    print(f"📈 최종 결과:")
+    print(f"📈 최종 결과 ({elapsed:.1f}초, {performance_count / elapsed if elapsed > 0 else 0:,.0f} 부른 기록/초):")
     print(f"  - 우타이테: {len(utaites)}명")
-    print(f"  - 아티스트: {len(artists)}명") 
+    print(f"  - 아티스트: {len(artists)}명")
     print(f"  - 곡 마스터: {len(songs_master)}곡")
-    print(f"  - 비디오: {len(videos)}개")
-    print(f"  - 부른 기록: {len(performances)}개")
+    print(f"  - 비디오: {video_count}개")
+    print(f"  - 부른 기록: {performance_count}개")
     print("✅ 마이그레이션 완료")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,19 +3,84 @@
 기존 JSON 데이터를 PostgreSQL로 마이그레이션하는 스크립트
 """
 
+import argparse
+import csv
+import io
 import json
+import multiprocessing
 import os
 import sys
-from datetime import datetime
-from typing import Dict, List, Set
+import time
+from contextlib import contextmanager
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import (
+    TIMESTAMP, Column, Integer, MetaData, String, Table, func, select, tuple_
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from database import engine, get_db, Artist, Utaite, SongMaster, Video, Performance
+from data_manager import DataManager
+from models import time_to_seconds
+from json_stream import iter_json_records
 import logging
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 벌크 모드에서 다중 행 INSERT / IN 조회 한 번에 넣는 행 수
+BULK_CHUNK_SIZE = 1000
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# 청크 마이그레이션 체크포인트: 이관이 끝난 원본(JSON) 부른 기록 ID
+migration_checkpoints = Table(
+    "migration_checkpoints", MetaData(),
+    Column("source_id", String(100), primary_key=True),
+    Column("chunk", Integer, nullable=False),
+    Column("migrated_at", TIMESTAMP, server_default=func.now()),
+)
+
+def _source_id(perf: dict) -> str:
+    """체크포인트용 원본 부른 기록 ID (ID가 없던 예전 레코드는 비디오 + 시작 시간)"""
+    return perf.get('id') or f"{perf.get('video_id')}_{perf.get('start_time')}"
+
+def _chunk_by_video(items: List[dict], chunk_size: int) -> Iterator[List[dict]]:
+    """같은 비디오의 기록은 한 청크에 모아서 청크 크기 안팎으로 나누기"""
+    by_video: Dict[str, List[dict]] = defaultdict(list)
+    for item in items:
+        by_video[item['video_id']].append(item)
+    chunk: List[dict] = []
+    for video_items in by_video.values():
+        if chunk and len(chunk) + len(video_items) > chunk_size:
+            yield chunk
+            chunk = []
+        chunk.extend(video_items)
+    if chunk:
+        yield chunk
+
+# 워커 프로세스 상태 (Pool initializer에서 한 번 설정)
+_worker_maps: Optional[Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]] = None
+
+def _init_chunk_worker(maps):
+    global _worker_maps
+    # fork로 물려받은 부모의 커넥션 풀은 쓰지 않고 워커마다 새로 연다
+    engine.dispose(close=False)
+    _worker_maps = maps
+
+def _migrate_chunk_worker(job: Tuple[int, List[dict]]) -> dict:
+    chunk_no, items = job
+    migrator = PostgreSQLMigrator()
+    migrator.song_map, migrator.utaite_map, migrator.video_map = _worker_maps
+    try:
+        return migrator.migrate_chunk(chunk_no, items)
+    finally:
+        migrator.close()
+
 class PostgreSQLMigrator:
     def __init__(self):
         self.db = next(get_db())
@@ -26,214 +91,206 @@ class PostgreSQLMigrator:
         
     def load_json_data(self, file_path: str) -> List[dict]:
         """JSON 파일에서 데이터를 로드"""
+        data = list(self.iter_json_data(file_path))
+        logger.info(f"JSON 파일 로드 완료: {len(data)}개 항목")
+        return data
+    
+    def iter_json_data(self, file_path: str) -> Iterator[dict]:
+        """JSON 배열/JSON Lines 파일의 레코드를 하나씩 반환 (파일 전체를 메모리에 올리지 않음)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"JSON 파일 로드 완료: {len(data)}개 항목")
-                return data
+            yield from iter_json_records(file_path)
         except FileNotFoundError:
             logger.error(f"파일을 찾을 수 없습니다: {file_path}")
-            return []
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, ValueError) as e:
             logger.error(f"JSON 파싱 오류: {e}")
-            return []
+    
+    def _insert_or_get_id(self, statement, lookup) -> int:
+        """INSERT ... ON CONFLICT ... RETURNING id - 충돌로 행이 돌아오지 않으면 자연 키로 조회
+        
+        유니크 제약이 중복을 막으므로 동시에 실행돼도 같은 키로 두 행이 생기지 않는다.
+        """
+        new_id = self.db.execute(statement).scalar()
+        if new_id is not None:
+            return new_id
+        return self.db.execute(lookup).scalar_one()
     
     def get_or_create_artist(self, artist_name: str) -> int:
         """아티스트를 찾거나 생성하고 ID 반환"""
         if artist_name in self.artist_map:
             return self.artist_map[artist_name]
         
-        # 기존 아티스트 확인
-        existing = self.db.query(Artist).filter(Artist.name == artist_name).first()
-        if existing:
-            self.artist_map[artist_name] = existing.id
-            return existing.id
-        
-        # 새 아티스트 생성
-        new_artist = Artist(name=artist_name)
-        self.db.add(new_artist)
+        artist_id = self._insert_or_get_id(
+            pg_insert(Artist).values(name=artist_name).on_conflict_do_nothing(index_elements=['name']).returning(Artist.id),
+            select(Artist.id).where(Artist.name == artist_name)
+        )
         self.db.commit()
-        self.db.refresh(new_artist)
         
-        self.artist_map[artist_name] = new_artist.id
-        logger.info(f"새 아티스트 생성: {artist_name} (ID: {new_artist.id})")
-        return new_artist.id
+        self.artist_map[artist_name] = artist_id
+        return artist_id
     
     def get_or_create_utaite(self, utaite_name: str) -> int:
         """우타이테를 찾거나 생성하고 ID 반환"""
         if utaite_name in self.utaite_map:
             return self.utaite_map[utaite_name]
         
-        # 기존 우타이테 확인
-        existing = self.db.query(Utaite).filter(Utaite.name == utaite_name).first()
-        if existing:
-            self.utaite_map[utaite_name] = existing.id
-            return existing.id
-        
-        # 새 우타이테 생성
-        new_utaite = Utaite(name=utaite_name)
-        self.db.add(new_utaite)
+        utaite_id = self._insert_or_get_id(
+            pg_insert(Utaite).values(name=utaite_name).on_conflict_do_nothing(index_elements=['name']).returning(Utaite.id),
+            select(Utaite.id).where(Utaite.name == utaite_name)
+        )
         self.db.commit()
-        self.db.refresh(new_utaite)
         
-        self.utaite_map[utaite_name] = new_utaite.id
-        logger.info(f"새 우타이테 생성: {utaite_name} (ID: {new_utaite.id})")
-        return new_utaite.id
+        self.utaite_map[utaite_name] = utaite_id
+        return utaite_id
     
     def get_or_create_song_master(self, title: str, artist_name: str, tags: List[str] = None, album_art_url: str = None) -> int:
-        """곡 마스터를 찾거나 생성하고 ID 반환"""
+        """곡 마스터를 찾거나 생성하고 ID 반환 (기존 곡의 앨범아트가 비어 있으면 채움)"""
         song_key = f"{title}|{artist_name}"
         if song_key in self.song_map:
             return self.song_map[song_key]
         
         artist_id = self.get_or_create_artist(artist_name)
         
-        # 기존 곡 확인
-        existing = self.db.query(SongMaster).filter(
-            SongMaster.title == title,
-            SongMaster.artist_id == artist_id
-        ).first()
-        
-        if existing:
-            self.song_map[song_key] = existing.id
-            # 앨범 아트 URL 업데이트 (없었다면)
-            if album_art_url and not existing.album_art_url:
-                existing.album_art_url = album_art_url
-                self.db.commit()
-            return existing.id
-        
-        # 새 곡 생성
-        new_song = SongMaster(
+        statement = pg_insert(SongMaster).values(
             title=title,
             artist_id=artist_id,
             tags=tags or [],
             album_art_url=album_art_url
         )
-        self.db.add(new_song)
+        song_id = self._insert_or_get_id(
+            statement.on_conflict_do_update(
+                constraint='uq_song_masters_title_artist',
+                set_={'album_art_url': statement.excluded.album_art_url},
+                where=SongMaster.album_art_url.is_(None) & statement.excluded.album_art_url.isnot(None)
+            ).returning(SongMaster.id),
+            select(SongMaster.id).where(SongMaster.title == title, SongMaster.artist_id == artist_id)
+        )
         self.db.commit()
-        self.db.refresh(new_song)
         
-        self.song_map[song_key] = new_song.id
-        logger.info(f"새 곡 생성: {title} by {artist_name} (ID: {new_song.id})")
-        return new_song.id
+        self.song_map[song_key] = song_id
+        return song_id
     
     def get_or_create_video(self, video_id: str, title: str, channel: str = None, thumbnail_url: str = None) -> int:
         """비디오를 찾거나 생성하고 ID 반환"""
         if video_id in self.video_map:
             return self.video_map[video_id]
         
-        # 기존 비디오 확인
-        existing = self.db.query(Video).filter(Video.video_id == video_id).first()
-        if existing:
-            self.video_map[video_id] = existing.id
-            return existing.id
-        
-        # 새 비디오 생성
-        new_video = Video(
-            video_id=video_id,
-            title=title,
-            channel=channel,
-            thumbnail_url=thumbnail_url
+        video_db_id = self._insert_or_get_id(
+            pg_insert(Video).values(
+                video_id=video_id,
+                title=title,
+                channel=channel,
+                thumbnail_url=thumbnail_url
+            ).on_conflict_do_nothing(index_elements=['video_id']).returning(Video.id),
+            select(Video.id).where(Video.video_id == video_id)
         )
-        self.db.add(new_video)
         self.db.commit()
-        self.db.refresh(new_video)
         
-        self.video_map[video_id] = new_video.id
-        logger.info(f"새 비디오 생성: {video_id} (ID: {new_video.id})")
-        return new_video.id
+        self.video_map[video_id] = video_db_id
+        return video_db_id
     
-    def migrate_performance_data(self, performances_data: List[dict]):
-        """공연 데이터를 마이그레이션"""
-        logger.info("공연 데이터 마이그레이션 시작...")
+    def load_masters(self) -> Dict[str, Dict[str, dict]]:
+        """필요한 마스터 데이터를 스트리밍으로 읽어 바로 딕셔너리로 변환"""
+        return {
+            'songs': {s['id']: s for s in self.iter_json_data("data/songs_master.json")},
+            'utaites': {u['id']: u for u in self.iter_json_data("data/utaites_master.json")},
+            'artists': {a['id']: a for a in self.iter_json_data("data/artists_master.json")},
+            'videos': {v['id']: v for v in self.iter_json_data("data/videos_master.json")},
+        }
+    
+    def prepare_performance(self, perf: dict, masters: Dict[str, Dict[str, dict]]) -> Optional[dict]:
+        """부른 기록 한 건을 마스터 데이터와 합쳐 이관할 값으로 변환 (누락이 있으면 None)"""
+        # 필수 필드 확인
+        required_fields = ['song_master_id', 'utaite_id', 'video_id', 'start_time', 'date']
+        if not all(field in perf for field in required_fields):
+            logger.warning(f"필수 필드 누락: {perf}")
+            return None
+        
+        # 마스터 데이터에서 정보 조회
+        song_master = masters['songs'].get(perf['song_master_id'])
+        utaite_master = masters['utaites'].get(perf['utaite_id'])
+        video_master = masters['videos'].get(perf['video_id'])
         
-        # 필요한 마스터 데이터 로드
-        songs_master = self.load_json_data("data/songs_master.json")
-        utaites_master = self.load_json_data("data/utaites_master.json")
-        artists_master = self.load_json_data("data/artists_master.json")
-        videos_master = self.load_json_data("data/videos_master.json")
+        if not song_master or not utaite_master or not video_master:
+            logger.warning(f"마스터 데이터 누락: song={bool(song_master)}, utaite={bool(utaite_master)}, video={bool(video_master)}")
+            return None
         
-        # 마스터 데이터를 딕셔너리로 변환
-        songs_dict = {s['id']: s for s in songs_master}
-        utaites_dict = {u['id']: u for u in utaites_master}
-        artists_dict = {a['id']: a for a in artists_master}
-        videos_dict = {v['id']: v for v in videos_master}
+        # 아티스트 정보 조회 (기존 구조에서)
+        artist_name = song_master.get('artist', {}).get('original', '')
+        if not artist_name:
+            logger.warning(f"아티스트 정보 누락: {song_master}")
+            return None
+        
+        # 날짜 파싱
+        if isinstance(perf['date'], str):
+            try:
+                date = datetime.fromisoformat(perf['date'].replace('Z', '+00:00'))
+            except ValueError:
+                date = datetime.fromisoformat(perf['date'])
+        else:
+            date = perf['date']
+        # 컬럼은 시간대 없는 TIMESTAMP - 행 INSERT(세션 시간대 변환)와 COPY(오프셋 무시)가 같은 값을 쓰도록
+        # 오프셋이 있는 날짜는 여기서 UTC로 바꿔 시간대 없이 넘긴다 (시간대 없는 값은 UTC로 간주)
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        return {
+            'source_id': _source_id(perf),
+            'artist_name': artist_name,
+            'title': song_master.get('titles', {}).get('original', ''),
+            'tags': song_master.get('tags', []),
+            'album_art_url': song_master.get('album_art_url'),
+            'utaite_name': utaite_master.get('names', {}).get('original', ''),
+            'video_id': perf['video_id'],
+            'video_title': video_master.get('title', ''),
+            'video_channel': video_master.get('channel', ''),
+            'thumbnail_url': video_master.get('thumbnail_url', ''),
+            'start_time': perf['start_time'],
+            'start_time_seconds': time_to_seconds(perf['start_time']),
+            'date': date,
+        }
+    
+    def migrate_performance_data(self, performances_data: Iterable[dict]):
+        """공연 데이터를 마이그레이션"""
+        logger.info("공연 데이터 마이그레이션 시작...")
+        masters = self.load_masters()
         
         migrated_count = 0
         for perf in performances_data:
             try:
-                # 필수 필드 확인
-                required_fields = ['song_master_id', 'utaite_id', 'video_id', 'start_time', 'date']
-                if not all(field in perf for field in required_fields):
-                    logger.warning(f"필수 필드 누락: {perf}")
-                    continue
-                
-                # 마스터 데이터에서 정보 조회
-                song_master = songs_dict.get(perf['song_master_id'])
-                utaite_master = utaites_dict.get(perf['utaite_id'])
-                video_master = videos_dict.get(perf['video_id'])
-                
-                if not song_master or not utaite_master or not video_master:
-                    logger.warning(f"마스터 데이터 누락: song={bool(song_master)}, utaite={bool(utaite_master)}, video={bool(video_master)}")
-                    continue
-                
-                # 아티스트 정보 조회 (기존 구조에서)
-                artist_name = song_master.get('artist', {}).get('original', '')
-                if not artist_name:
-                    logger.warning(f"아티스트 정보 누락: {song_master}")
+                item = self.prepare_performance(perf, masters)
+                if not item:
                     continue
                 
                 # PostgreSQL에 데이터 생성/조회
-                artist_id = self.get_or_create_artist(artist_name)
-                
                 song_db_id = self.get_or_create_song_master(
-                    title=song_master.get('titles', {}).get('original', ''),
-                    artist_name=artist_name,
-                    tags=song_master.get('tags', []),
-                    album_art_url=song_master.get('album_art_url')
+                    title=item['title'],
+                    artist_name=item['artist_name'],
+                    tags=item['tags'],
+                    album_art_url=item['album_art_url']
                 )
                 
-                utaite_db_id = self.get_or_create_utaite(
-                    utaite_master.get('names', {}).get('original', '')
-                )
+                utaite_db_id = self.get_or_create_utaite(item['utaite_name'])
                 
                 video_db_id = self.get_or_create_video(
-                    video_id=perf['video_id'],
-                    title=video_master.get('title', ''),
-                    channel=video_master.get('channel', ''),
-                    thumbnail_url=video_master.get('thumbnail_url', '')
+                    video_id=item['video_id'],
+                    title=item['video_title'],
+                    channel=item['video_channel'],
+                    thumbnail_url=item['thumbnail_url']
                 )
                 
-                # 날짜 파싱
-                if isinstance(perf['date'], str):
-                    try:
-                        date = datetime.fromisoformat(perf['date'].replace('Z', '+00:00'))
-                    except ValueError:
-                        date = datetime.fromisoformat(perf['date'])
-                else:
-                    date = perf['date']
-                
-                # 기존 공연 기록 확인 (중복 방지)
-                existing_performance = self.db.query(Performance).filter(
-                    Performance.song_master_id == song_db_id,
-                    Performance.utaite_id == utaite_db_id,
-                    Performance.video_id == video_db_id,
-                    Performance.start_time == perf['start_time']
-                ).first()
-                
-                if existing_performance:
-                    continue  # 이미 존재하는 기록
-                
-                # 새 공연 기록 생성
-                new_performance = Performance(
-                    song_master_id=song_db_id,
-                    utaite_id=utaite_db_id,
-                    video_id=video_db_id,
-                    start_time=perf['start_time'],
-                    date=date
+                # 새 공연 기록 생성 (이미 있는 기록은 자연 키 제약으로 건너뜀)
+                result = self.db.execute(
+                    pg_insert(Performance).values(
+                        song_master_id=song_db_id,
+                        utaite_id=utaite_db_id,
+                        video_id=video_db_id,
+                        start_time=item['start_time'],
+                        start_time_seconds=item['start_time_seconds'],
+                        date=item['date']
+                    ).on_conflict_do_nothing(constraint='uq_performances_video_start_song')
                 )
-                
-                self.db.add(new_performance)
+                if not result.rowcount:
+                    continue  # 이미 존재하는 기록
                 migrated_count += 1
                 
                 # 배치 커밋 (성능 향상)
@@ -249,13 +306,280 @@ class PostgreSQLMigrator:
         self.db.commit()
         logger.info(f"공연 데이터 마이그레이션 완료: 총 {migrated_count}개 항목")
     
+    # === Bulk Mode ===
+    def migrate_performance_data_bulk(self, performances_data: Iterable[dict]) -> Dict[str, dict]:
+        """공연 데이터를 벌크 마이그레이션
+        
+        엔티티를 모두 메모리에 모은 뒤 테이블마다 다중 행 INSERT ... ON CONFLICT ... RETURNING
+        (부른 기록은 COPY)으로 적재하고, 외래 키는 테이블 단위 조회로 한 번에 해석한다.
+        전체가 한 트랜잭션이라 실패하면 아무것도 반영되지 않는다. 반환값은 테이블별 {rows, seconds}
+        """
+        logger.info("공연 데이터 벌크 마이그레이션 시작...")
+        stage = self.stage_bulk(performances_data)
+        
+        report: Dict[str, dict] = {}
+        try:
+            self.load_master_tables(stage, report)
+            with self._timed(report, 'performances', len(stage['performances'])):
+                report['performances']['inserted'] = self._copy_performances(stage['performances'])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self._log_report(report)
+        logger.info("공연 데이터 벌크 마이그레이션 완료")
+        return report
+    
+    def stage_bulk(self, performances_data: Iterable[dict]) -> Dict[str, Any]:
+        """DB 접근 없이 필요한 엔티티와 부른 기록을 모은다 (dict로 중복 제거, 순서 유지)"""
+        masters = self.load_masters()
+        stage = {'artists': {}, 'utaites': {}, 'songs': {}, 'videos': {}, 'performances': []}
+        for perf in performances_data:
+            try:
+                item = self.prepare_performance(perf, masters)
+            except Exception as e:
+                logger.error(f"항목 스테이징 실패: {perf}, 오류: {e}")
+                continue
+            if not item:
+                continue
+            stage['artists'].setdefault(item['artist_name'])
+            stage['utaites'].setdefault(item['utaite_name'])
+            stage['songs'].setdefault((item['title'], item['artist_name']), {'tags': item['tags'], 'album_art_url': item['album_art_url']})
+            stage['videos'].setdefault(item['video_id'], {'title': item['video_title'], 'channel': item['video_channel'], 'thumbnail_url': item['thumbnail_url']})
+            stage['performances'].append(item)
+        logger.info(
+            f"스테이징 완료: 부른 기록 {len(stage['performances'])}개, 아티스트 {len(stage['artists'])}개, "
+            f"우타이테 {len(stage['utaites'])}개, 곡 {len(stage['songs'])}개, 비디오 {len(stage['videos'])}개"
+        )
+        return stage
+    
+    def load_master_tables(self, stage: Dict[str, Any], report: Dict[str, dict]):
+        """스테이징된 엔티티를 참조되는 테이블부터 적재하고 이름/키 -> ID 매핑 채우기 (커밋은 호출자)"""
+        artists, utaites, songs, videos = stage['artists'], stage['utaites'], stage['songs'], stage['videos']
+        with self._timed(report, 'artists', len(artists)):
+            self.artist_map.update(self._bulk_insert_by_key(Artist, Artist.name, [{'name': name} for name in artists]))
+        with self._timed(report, 'utaites', len(utaites)):
+            self.utaite_map.update(self._bulk_insert_by_key(Utaite, Utaite.name, [{'name': name} for name in utaites]))
+        with self._timed(report, 'song_masters', len(songs)):
+            self._bulk_insert_songs(songs)
+        with self._timed(report, 'videos', len(videos)):
+            self.video_map.update(self._bulk_insert_by_key(Video, Video.video_id, [
+                {'video_id': video_id, **fields} for video_id, fields in videos.items()
+            ]))
+    
+    def _log_report(self, report: Dict[str, dict]):
+        for table, stats in report.items():
+            rate = stats['rows'] / stats['seconds'] if stats['seconds'] else float('inf')
+            extra = f", 새로 추가 {stats['inserted']}개" if 'inserted' in stats else ""
+            logger.info(f"  - {table}: {stats['rows']}행, {stats['seconds']:.2f}초, {rate:,.0f}행/초{extra}")
+    
+    # === Chunked / Resumable Mode ===
+    def migrate_performance_data_chunked(self, performances_data: Iterable[dict], chunk_size: int = 1000,
+                                         workers: int = 1) -> Dict[str, dict]:
+        """청크 단위 재시작 가능 마이그레이션
+        
+        마스터 테이블은 먼저 한 번에 적재하고, 부른 기록은 비디오 단위로 묶은 청크마다
+        별도 트랜잭션으로 넣으면서 같은 트랜잭션에 원본 ID를 체크포인트 테이블에 기록한다.
+        중단 후 다시 실행하면 체크포인트에 있는 기록은 건너뛴다. 중복 판정 키에 비디오가 들어가므로
+        청크끼리는 독립적이라 workers > 1이면 여러 프로세스가 동시에 처리한다.
+        """
+        logger.info(f"공연 데이터 청크 마이그레이션 시작 (청크 {chunk_size}개, 워커 {workers}개)...")
+        self.ensure_checkpoint_table()
+        done = self.load_checkpoints()
+        if done:
+            logger.info(f"체크포인트: 이미 처리된 부른 기록 {len(done)}개 건너뜀")
+        
+        stage = self.stage_bulk(perf for perf in performances_data if _source_id(perf) not in done)
+        report: Dict[str, dict] = {}
+        try:
+            self.load_master_tables(stage, report)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        chunks = list(_chunk_by_video(stage['performances'], chunk_size))
+        totals = {'rows': 0, 'seconds': 0.0, 'inserted': 0}
+        report['performances'] = totals
+        started = time.perf_counter()
+        
+        def progress(result: dict):
+            totals['rows'] += result['rows']
+            totals['inserted'] += result['inserted']
+            totals['seconds'] = time.perf_counter() - started
+            rate = totals['rows'] / totals['seconds'] if totals['seconds'] else 0
+            logger.info(f"청크 {result['chunk'] + 1}/{len(chunks)} 완료: 누적 {totals['rows']}/{len(stage['performances'])}개, {rate:,.0f}행/초")
+        
+        if workers > 1 and len(chunks) > 1:
+            maps = (self.song_map, self.utaite_map, self.video_map)
+            with multiprocessing.Pool(workers, initializer=_init_chunk_worker, initargs=(maps,)) as pool:
+                for result in pool.imap_unordered(_migrate_chunk_worker, enumerate(chunks)):
+                    progress(result)
+        else:
+            for chunk_no, items in enumerate(chunks):
+                progress(self.migrate_chunk(chunk_no, items))
+        
+        self._log_report(report)
+        logger.info("공연 데이터 청크 마이그레이션 완료")
+        return report
+    
+    def migrate_chunk(self, chunk_no: int, items: List[dict]) -> dict:
+        """청크 하나를 부른 기록 + 체크포인트 한 트랜잭션으로 반영"""
+        try:
+            inserted = self._copy_performances(items)
+            for batch in _chunks([{'source_id': item['source_id'], 'chunk': chunk_no} for item in items], BULK_CHUNK_SIZE):
+                self.db.execute(pg_insert(migration_checkpoints).values(batch).on_conflict_do_nothing(index_elements=['source_id']))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return {'chunk': chunk_no, 'rows': len(items), 'inserted': inserted}
+    
+    def ensure_checkpoint_table(self):
+        migration_checkpoints.create(bind=self.db.connection(), checkfirst=True)
+        self.db.commit()
+    
+    def load_checkpoints(self) -> Set[str]:
+        """이미 이관된 원본 부른 기록 ID"""
+        return set(self.db.execute(select(migration_checkpoints.c.source_id)).scalars())
+    
+    def reset_checkpoints(self):
+        """체크포인트 비우기 (처음부터 다시 이관할 때)"""
+        self.ensure_checkpoint_table()
+        self.db.execute(migration_checkpoints.delete())
+        self.db.commit()
+        logger.info("마이그레이션 체크포인트 초기화 완료")
+    
+    @contextmanager
+    def _timed(self, report: Dict[str, dict], table: str, rows: int):
+        report[table] = {'rows': rows, 'seconds': 0.0}
+        started = time.perf_counter()
+        yield
+        report[table]['seconds'] = time.perf_counter() - started
+    
+    def _bulk_insert_by_key(self, model, key_column, rows: List[dict]) -> Dict[str, int]:
+        """고유 키 기준 다중 행 INSERT ... ON CONFLICT DO NOTHING RETURNING 후 키 -> ID 반환
+        
+        새로 들어간 행은 RETURNING으로, 이미 있던 행은 키 목록 조회 한 번으로 ID를 얻는다.
+        """
+        key = key_column.key
+        ids: Dict[str, int] = {}
+        for chunk in _chunks(rows, BULK_CHUNK_SIZE):
+            statement = (
+                pg_insert(model).values(chunk)
+                .on_conflict_do_nothing(index_elements=[key])
+                .returning(model.id, key_column)
+            )
+            ids.update({row_key: row_id for row_id, row_key in self.db.execute(statement)})
+        
+        missing = [row[key] for row in rows if row[key] not in ids]
+        for chunk in _chunks(missing, BULK_CHUNK_SIZE):
+            ids.update({row_key: row_id for row_id, row_key in self.db.execute(
+                select(model.id, key_column).where(key_column.in_(chunk))
+            )})
+        return ids
+    
+    def _bulk_insert_songs(self, songs: Dict[Tuple[str, str], dict]):
+        """(제목, 아티스트 ID) 자연 키로 다중 행 INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+        
+        새 곡과 앨범아트가 비어 있던 기존 곡은 RETURNING으로, 나머지 기존 곡은 키 목록 조회 한 번으로 ID를 얻는다.
+        """
+        keys = {(title, self.artist_map[artist_name]): (title, artist_name) for title, artist_name in songs}
+        rows = [
+            {
+                'title': title,
+                'artist_id': artist_id,
+                'tags': songs[keys[(title, artist_id)]]['tags'] or [],
+                'album_art_url': songs[keys[(title, artist_id)]]['album_art_url']
+            }
+            for title, artist_id in keys
+        ]
+        
+        found: Dict[Tuple[str, int], int] = {}
+        for chunk in _chunks(rows, BULK_CHUNK_SIZE):
+            statement = pg_insert(SongMaster).values(chunk)
+            statement = statement.on_conflict_do_update(
+                constraint='uq_song_masters_title_artist',
+                set_={'album_art_url': statement.excluded.album_art_url},
+                where=SongMaster.album_art_url.is_(None) & statement.excluded.album_art_url.isnot(None)
+            ).returning(SongMaster.id, SongMaster.title, SongMaster.artist_id)
+            found.update({(title, artist_id): song_id for song_id, title, artist_id in self.db.execute(statement)})
+        
+        missing = [key for key in keys if key not in found]
+        for chunk in _chunks(missing, BULK_CHUNK_SIZE):
+            found.update({
+                (title, artist_id): song_id for song_id, title, artist_id in self.db.execute(
+                    select(SongMaster.id, SongMaster.title, SongMaster.artist_id)
+                    .where(tuple_(SongMaster.title, SongMaster.artist_id).in_(chunk))
+                )
+            })
+        
+        for (title, artist_id), song_id in found.items():
+            self.song_map[f"{title}|{keys[(title, artist_id)][1]}"] = song_id
+    
+    def _copy_performances(self, staged: List[dict]) -> int:
+        """부른 기록을 COPY로 임시 테이블에 올린 뒤 중복을 빼고 한 번에 INSERT ... SELECT (추가된 행 수 반환)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for seq, item in enumerate(staged):
+            writer.writerow([
+                seq,
+                self.song_map[f"{item['title']}|{item['artist_name']}"],
+                self.utaite_map[item['utaite_name']],
+                self.video_map[item['video_id']],
+                item['start_time'],
+                item['start_time_seconds'],
+                item['date'].isoformat() if isinstance(item['date'], datetime) else item['date'],
+            ])
+        buffer.seek(0)
+        
+        # 세션과 같은 연결/트랜잭션의 DB-API 커서 사용 (COPY는 psycopg2 전용)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.execute("""
+                CREATE TEMP TABLE performances_staging (
+                    seq INTEGER,
+                    song_master_id INTEGER,
+                    utaite_id INTEGER,
+                    video_id INTEGER,
+                    start_time VARCHAR(20),
+                    start_time_seconds INTEGER,
+                    date TIMESTAMP
+                ) ON COMMIT DROP
+            """)
+            cursor.copy_expert(
+                "COPY performances_staging (seq, song_master_id, utaite_id, video_id, start_time, start_time_seconds, date) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            # 같은 (비디오, 시작 시간, 곡)은 처음 나온 기록만, 이미 있는 기록은 자연 키 제약으로 건너뜀
+            cursor.execute("""
+                INSERT INTO performances (song_master_id, utaite_id, video_id, start_time, start_time_seconds, date)
+                SELECT song_master_id, utaite_id, video_id, start_time, start_time_seconds, date
+                FROM performances_staging
+                ORDER BY seq
+                ON CONFLICT ON CONSTRAINT uq_performances_video_start_song DO NOTHING
+            """)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    
     def close(self):
         """데이터베이스 연결 종료"""
         self.db.close()
 
 def main():
     """메인 마이그레이션 함수"""
-    logger.info("PostgreSQL 마이그레이션 시작")
+    parser = argparse.ArgumentParser(description="JSON 데이터를 PostgreSQL로 마이그레이션")
+    parser.add_argument("--bulk", action="store_true", help="벌크 모드 (다중 행 INSERT/COPY, 한 트랜잭션)")
+    parser.add_argument("--chunked", action="store_true", help="청크 모드 (체크포인트로 중단 후 이어서 실행 가능)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="청크 모드의 청크당 부른 기록 수")
+    parser.add_argument("--workers", type=int, default=1, help="청크 모드의 병렬 워커 프로세스 수")
+    parser.add_argument("--reset-checkpoints", action="store_true", help="체크포인트를 비우고 처음부터 실행")
+    args = parser.parse_args()
+    
+    mode = " (청크 모드)" if args.chunked else " (벌크 모드)" if args.bulk else ""
+    logger.info(f"PostgreSQL 마이그레이션 시작{mode}")
     
     # 성과 데이터 파일 경로
     performances_file = "data/songs.json"
@@ -267,12 +591,17 @@ def main():
     migrator = PostgreSQLMigrator()
     
     try:
-        # 성과 데이터 로드 및 마이그레이션
+        # 성과 데이터 스트리밍 마이그레이션 (스냅샷 + 추가 저널)
         logger.info(f"파일 처리 중: {performances_file}")
-        performances_data = migrator.load_json_data(performances_file)
-        
-        if performances_data:
-            migrator.migrate_performance_data(performances_data)
+        records = DataManager("data").iter_performance_records()
+        if args.reset_checkpoints:
+            migrator.reset_checkpoints()
+        if args.chunked:
+            migrator.migrate_performance_data_chunked(records, chunk_size=args.chunk_size, workers=args.workers)
+        elif args.bulk:
+            migrator.migrate_performance_data_bulk(records)
+        else:
+            migrator.migrate_performance_data(records)
         
         logger.info("🎉 모든 마이그레이션이 완료되었습니다!")
         
@@ -0,0 +1,43 @@
+-- 자연 키 유니크 제약 추가
+-- song_masters (title, artist_id), performances (video_id, start_time, song_master_id)
+-- 기존 중복은 가장 작은 ID만 남기고 정리한 뒤 제약을 건다
+
+-- 1. 중복 곡: 부른 기록을 남길 곡(가장 작은 ID)으로 옮긴 뒤 삭제 (ON DELETE CASCADE로 기록이 지워지지 않게)
+CREATE TEMP TABLE song_master_duplicates ON COMMIT DROP AS
+SELECT id, MIN(id) OVER (PARTITION BY title, artist_id) AS keep_id
+FROM song_masters;
+
+UPDATE performances p
+SET song_master_id = d.keep_id
+FROM song_master_duplicates d
+WHERE p.song_master_id = d.id AND d.id <> d.keep_id;
+
+UPDATE song_masters sm
+SET album_art_url = dup.album_art_url
+FROM (
+    SELECT DISTINCT ON (d.keep_id) d.keep_id, s.album_art_url
+    FROM song_master_duplicates d
+    JOIN song_masters s ON s.id = d.id
+    WHERE d.id <> d.keep_id AND s.album_art_url IS NOT NULL
+    ORDER BY d.keep_id, d.id
+) dup
+WHERE sm.id = dup.keep_id AND sm.album_art_url IS NULL;
+
+DELETE FROM song_masters sm
+USING song_master_duplicates d
+WHERE sm.id = d.id AND d.id <> d.keep_id;
+
+-- 2. 중복 부른 기록: 먼저 들어간 기록만 유지
+DELETE FROM performances p
+USING performances keep
+WHERE p.video_id = keep.video_id
+  AND p.start_time = keep.start_time
+  AND p.song_master_id = keep.song_master_id
+  AND p.id > keep.id;
+
+-- 3. 제약 추가
+ALTER TABLE song_masters
+    ADD CONSTRAINT uq_song_masters_title_artist UNIQUE (title, artist_id);
+
+ALTER TABLE performances
+    ADD CONSTRAINT uq_performances_video_start_song UNIQUE (video_id, start_time, song_master_id);
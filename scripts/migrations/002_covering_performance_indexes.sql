@@ -0,0 +1,27 @@
+-- migrate:no-transaction
+-- 부른 기록 복합/커버링 인덱스
+-- 목록 쿼리(필터 키 + ORDER BY date DESC)가 정렬 없이 인덱스 순서로 읽도록 (키, date DESC, id) 인덱스를 만들고
+-- 앞 컬럼이 겹치는 단일 컬럼 인덱스는 지운다. 서비스 중에도 적용할 수 있게 CONCURRENTLY로 만든다
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performances_utaite_date
+    ON performances (utaite_id, date DESC, id) INCLUDE (song_master_id, video_id, start_time);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performances_song_master_date
+    ON performances (song_master_id, date DESC, id) INCLUDE (utaite_id, video_id, start_time);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performances_date_id
+    ON performances (date DESC, id);
+
+-- init.sql(idx_*) / SQLAlchemy create_all(ix_*)로 만들어진 단일 컬럼 인덱스
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_song_master_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_utaite_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_video_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_date;
+DROP INDEX CONCURRENTLY IF EXISTS ix_performances_song_master_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_performances_utaite_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_performances_video_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_performances_date;
+
+ALTER INDEX idx_performances_date_id RENAME TO idx_performances_date;
+
+ANALYZE performances;
@@ -0,0 +1,26 @@
+-- 부른 기록 시작 시간(초) 정수 컬럼 + 세트리스트 인덱스
+-- 기존 행은 "H:MM:SS" / "MM:SS" / "SS" 문자열에서 채우고 (형식이 다르면 0) NOT NULL로 바꾼다
+
+ALTER TABLE performances ADD COLUMN IF NOT EXISTS start_time_seconds INTEGER;
+
+UPDATE performances
+SET start_time_seconds = CASE
+    WHEN start_time ~ '^\d+:\d+:\d+$' THEN
+        split_part(start_time, ':', 1)::int * 3600
+        + split_part(start_time, ':', 2)::int * 60
+        + split_part(start_time, ':', 3)::int
+    WHEN start_time ~ '^\d+:\d+$' THEN
+        split_part(start_time, ':', 1)::int * 60
+        + split_part(start_time, ':', 2)::int
+    WHEN start_time ~ '^\d+$' THEN start_time::int
+    ELSE 0
+END
+WHERE start_time_seconds IS NULL;
+
+ALTER TABLE performances ALTER COLUMN start_time_seconds SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_performances_video_setlist
+    ON performances (video_id, start_time_seconds, id)
+    INCLUDE (song_master_id, utaite_id, start_time, date);
+
+ANALYZE performances;
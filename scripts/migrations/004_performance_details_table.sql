@@ -0,0 +1,175 @@
+-- 부른 기록 상세를 뷰에서 트리거로 동기화하는 비정규화 읽기 테이블로 교체
+-- 테이블/트리거를 만든 뒤 기존 부른 기록으로 한 번 채운다 (같은 트랜잭션이라 그 사이 변경도 놓치지 않음)
+
+DROP VIEW IF EXISTS performance_details;
+
+-- 부른 기록 상세 읽기 테이블: performances와 곡/아티스트/우타이테/비디오를 비정규화해 두고 트리거로 동기화
+-- 목록 엔드포인트는 조인 없이 이 테이블 하나만 인덱스로 읽는다
+CREATE TABLE performance_details (
+    id INTEGER PRIMARY KEY, -- performances.id
+    start_time VARCHAR(20) NOT NULL,
+    start_time_seconds INTEGER NOT NULL,
+    date TIMESTAMP NOT NULL,
+    song_master_id INTEGER NOT NULL,
+    song_title VARCHAR(500) NOT NULL,
+    song_title_korean VARCHAR(500),
+    song_title_english VARCHAR(500),
+    song_title_romanized VARCHAR(500),
+    artist_id INTEGER NOT NULL,
+    artist_name VARCHAR(255) NOT NULL,
+    artist_name_korean VARCHAR(255),
+    artist_name_english VARCHAR(255),
+    artist_name_romanized VARCHAR(255),
+    utaite_id INTEGER NOT NULL,
+    utaite_name VARCHAR(255) NOT NULL,
+    utaite_name_korean VARCHAR(255),
+    utaite_name_english VARCHAR(255),
+    utaite_name_romanized VARCHAR(255),
+    video_table_id INTEGER NOT NULL,
+    video_id VARCHAR(50) NOT NULL,
+    video_title TEXT NOT NULL,
+    video_channel VARCHAR(255),
+    thumbnail_url TEXT,
+    album_art_url TEXT,
+    tags TEXT[]
+);
+
+CREATE INDEX idx_performance_details_date ON performance_details(date DESC, id);
+CREATE INDEX idx_performance_details_song_master ON performance_details(song_master_id, date DESC, id);
+CREATE INDEX idx_performance_details_artist_name ON performance_details(artist_name, date DESC, id);
+CREATE INDEX idx_performance_details_artist_id ON performance_details(artist_id);
+CREATE INDEX idx_performance_details_utaite ON performance_details(utaite_id, date DESC, id);
+CREATE INDEX idx_performance_details_utaite_name ON performance_details(utaite_name, date DESC, id);
+CREATE INDEX idx_performance_details_video_setlist ON performance_details(video_table_id, start_time_seconds, id);
+
+-- 트리거 함수: 부른 기록 추가/수정/삭제 반영 (문장 단위 + 전이 테이블이라 COPY/다중 행 INSERT도 조인 한 번)
+CREATE OR REPLACE FUNCTION sync_performance_details() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM performance_details d USING old_rows o WHERE d.id = o.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO performance_details
+        SELECT
+            p.id, p.start_time, p.start_time_seconds, p.date,
+            sm.id, sm.title, sm.title_korean, sm.title_english, sm.title_romanized,
+            a.id, a.name, a.name_korean, a.name_english, a.name_romanized,
+            u.id, u.name, u.name_korean, u.name_english, u.name_romanized,
+            v.id, v.video_id, v.title, v.channel, v.thumbnail_url,
+            sm.album_art_url, sm.tags
+        FROM new_rows p
+        JOIN song_masters sm ON p.song_master_id = sm.id
+        JOIN artists a ON sm.artist_id = a.id
+        JOIN utaites u ON p.utaite_id = u.id
+        JOIN videos v ON p.video_id = v.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- 트리거 함수: 마스터 테이블 수정 반영 (삭제는 performances ON DELETE CASCADE -> 위 삭제 트리거로 반영)
+CREATE OR REPLACE FUNCTION sync_performance_details_song_masters() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE performance_details d SET
+        song_title = sm.title,
+        song_title_korean = sm.title_korean,
+        song_title_english = sm.title_english,
+        song_title_romanized = sm.title_romanized,
+        artist_id = a.id,
+        artist_name = a.name,
+        artist_name_korean = a.name_korean,
+        artist_name_english = a.name_english,
+        artist_name_romanized = a.name_romanized,
+        album_art_url = sm.album_art_url,
+        tags = sm.tags
+    FROM new_rows sm
+    JOIN artists a ON sm.artist_id = a.id
+    WHERE d.song_master_id = sm.id;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION sync_performance_details_artists() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE performance_details d SET
+        artist_name = a.name,
+        artist_name_korean = a.name_korean,
+        artist_name_english = a.name_english,
+        artist_name_romanized = a.name_romanized
+    FROM new_rows a
+    WHERE d.artist_id = a.id;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION sync_performance_details_utaites() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE performance_details d SET
+        utaite_name = u.name,
+        utaite_name_korean = u.name_korean,
+        utaite_name_english = u.name_english,
+        utaite_name_romanized = u.name_romanized
+    FROM new_rows u
+    WHERE d.utaite_id = u.id;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION sync_performance_details_videos() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE performance_details d SET
+        video_id = v.video_id,
+        video_title = v.title,
+        video_channel = v.channel,
+        thumbnail_url = v.thumbnail_url
+    FROM new_rows v
+    WHERE d.video_table_id = v.id;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- 트리거 생성 (전이 테이블은 이벤트 하나당 트리거 하나만 허용)
+CREATE TRIGGER sync_performance_details_on_insert AFTER INSERT ON performances
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details();
+
+CREATE TRIGGER sync_performance_details_on_update AFTER UPDATE ON performances
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details();
+
+CREATE TRIGGER sync_performance_details_on_delete AFTER DELETE ON performances
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details();
+
+CREATE TRIGGER sync_performance_details_on_song_masters AFTER UPDATE ON song_masters
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details_song_masters();
+
+CREATE TRIGGER sync_performance_details_on_artists AFTER UPDATE ON artists
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details_artists();
+
+CREATE TRIGGER sync_performance_details_on_utaites AFTER UPDATE ON utaites
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details_utaites();
+
+CREATE TRIGGER sync_performance_details_on_videos AFTER UPDATE ON videos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_performance_details_videos();
+
+-- 기존 데이터 채우기
+INSERT INTO performance_details
+SELECT
+    p.id, p.start_time, p.start_time_seconds, p.date,
+    sm.id, sm.title, sm.title_korean, sm.title_english, sm.title_romanized,
+    a.id, a.name, a.name_korean, a.name_english, a.name_romanized,
+    u.id, u.name, u.name_korean, u.name_english, u.name_romanized,
+    v.id, v.video_id, v.title, v.channel, v.thumbnail_url,
+    sm.album_art_url, sm.tags
+FROM performances p
+JOIN song_masters sm ON p.song_master_id = sm.id
+JOIN artists a ON sm.artist_id = a.id
+JOIN utaites u ON p.utaite_id = u.id
+JOIN videos v ON p.video_id = v.id;
+
+ANALYZE performance_details;
@@ -0,0 +1,13 @@
+-- migrate:no-transaction
+-- performance_details ID 기준 인덱스
+-- 아티스트/우타이테 페이지가 이름 대신 ID로 조회하므로 (artist_id, date DESC, id) 인덱스를 만들고
+-- 이름 기준 인덱스와 앞 컬럼이 겹치는 artist_id 단일 컬럼 인덱스는 지운다 (트리거의 artist_id 갱신도 새 인덱스 사용)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performance_details_artist
+    ON performance_details (artist_id, date DESC, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_performance_details_artist_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performance_details_artist_name;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performance_details_utaite_name;
+
+ANALYZE performance_details;
@@ -0,0 +1,30 @@
+-- migrate:no-transaction
+-- 부른 기록 인덱스 정리
+-- 목록/세트리스트 쿼리는 모두 performance_details를 읽으므로 performances의 (키, date DESC, id) 커버링 인덱스와
+-- 세트리스트 인덱스는 쓰이지 않고 쓰기 비용만 든다. 마스터 삭제(ON DELETE CASCADE)가 외래 키로 찾을 수 있게
+-- 좁은 utaite_id/song_master_id 인덱스만 남긴다 (video_id는 자연 키 유니크 제약이 맡는다).
+-- 세트리스트 인덱스는 SELECT 컬럼을 INCLUDE로 덮어 index-only scan이 되도록 바꾼다
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performances_utaite_id
+    ON performances (utaite_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performances_song_master_id
+    ON performances (song_master_id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_utaite_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_song_master_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_performances_video_setlist;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performance_details_video_setlist_covering
+    ON performance_details (video_table_id, start_time_seconds, id)
+    INCLUDE (start_time, date, song_master_id, song_title, artist_name, album_art_url, utaite_id, utaite_name);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_performance_details_video_setlist;
+
+ALTER INDEX idx_performance_details_video_setlist_covering RENAME TO idx_performance_details_video_setlist;
+
+-- index-only scan은 visibility map이 채워져야 힙을 건너뛴다
+VACUUM (ANALYZE) performance_details;
+
+ANALYZE performances;
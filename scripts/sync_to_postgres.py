@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+JSON 저장소 -> PostgreSQL 증분 동기화 스크립트
+레코드의 updated_at/created_at을 엔티티별 최고 수위(high-water mark)와 비교해
+바뀐 아티스트/우타이테/곡/비디오만 upsert하고, 부른 기록은 ID로 체크포인트에 없는 것만 추가한다
+(cron 등으로 자주 실행하는 용도)
+
+JSON 파일은 데이터 매니저의 쓰기 락 안에서 한 번에 읽어 저장 도중의 상태를 보지 않고,
+수위에서 --overlap초를 빼고 비교해 시계 차이나 같은 시각에 찍힌 늦은 저장을 놓치지 않는다
+(겹쳐 읽은 레코드는 upsert라 다시 반영해도 결과가 같다)
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import TIMESTAMP, Column, MetaData, String, Table, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from database import Artist, SongMaster, Utaite, Video
+from data_manager import DataManager
+from migrate_to_postgres import BULK_CHUNK_SIZE, PostgreSQLMigrator, _chunks, _source_id, migration_checkpoints
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 엔티티별 최고 수위: 마지막 동기화에서 본 가장 늦은 변경 시각
+sync_state = Table(
+    "sync_state", MetaData(),
+    Column("entity", String(50), primary_key=True),
+    Column("high_water_mark", TIMESTAMP, nullable=False),
+    Column("synced_at", TIMESTAMP, server_default=func.now()),
+)
+
+LANGUAGES = ('korean', 'english', 'romanized')
+
+# 수위 비교 시 겹쳐 읽는 구간 (초)
+DEFAULT_OVERLAP_SECONDS = 300
+
+def record_stamp(record: dict) -> Optional[datetime]:
+    """레코드 변경 시각 (updated_at > created_at 순, 시간대가 있으면 UTC 기준 naive)"""
+    for field in ('updated_at', 'created_at'):
+        value = record.get(field)
+        if not value:
+            continue
+        try:
+            stamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            continue
+        if stamp.tzinfo:
+            stamp = stamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return stamp
+    return None
+
+def _localized(names: dict, prefix: str) -> dict:
+    """다국어 dict -> name_korean 등 컬럼 값 (빈 문자열은 NULL)"""
+    return {f"{prefix}_{language}": names.get(language) or None for language in LANGUAGES}
+
+class DeltaSyncer(PostgreSQLMigrator):
+    """바뀐 레코드만 upsert하는 증분 동기화 (엔티티 적재/외래 키 해석은 벌크 마이그레이션과 공유)"""
+
+    def __init__(self, data_dir: str = "data", full: bool = False, overlap: float = DEFAULT_OVERLAP_SECONDS):
+        super().__init__()
+        self.data_manager = DataManager(data_dir)
+        self.full = full
+        self.overlap = timedelta(seconds=overlap)
+
+    def load_masters(self) -> Dict[str, Dict[str, dict]]:
+        dm = self.data_manager
+        return {
+            'songs': {s['id']: s for s in dm.iter_records(dm.songs_master_file)},
+            'utaites': {u['id']: u for u in dm.iter_records(dm.utaites_file)},
+            'artists': {a['id']: a for a in dm.iter_records(dm.artists_file)},
+            'videos': {v['id']: v for v in dm.iter_records(dm.videos_file)},
+        }
+
+    def sync(self) -> Dict[str, dict]:
+        """한 트랜잭션으로 증분 동기화 (실패하면 수위도 그대로라 다음 실행에서 다시 시도)"""
+        sync_state.create(bind=self.db.connection(), checkfirst=True)
+        self.ensure_checkpoint_table()
+        marks = {} if self.full else dict(self.db.execute(select(sync_state.c.entity, sync_state.c.high_water_mark)).all())
+        migrated = set() if self.full else self.load_checkpoints()
+        new_marks: Dict[str, datetime] = {}
+        dm = self.data_manager
+
+        # 바뀐 레코드는 쓰기 락 안에서 모두 모으고, PostgreSQL 반영은 락을 놓은 뒤에 한다
+        with dm.write_lock():
+            artists = self._changed('artists', dm.iter_records(dm.artists_file), marks, new_marks)
+            utaites = self._changed('utaites', dm.iter_records(dm.utaites_file), marks, new_marks)
+            songs = self._changed('song_masters', dm.iter_records(dm.songs_master_file), marks, new_marks)
+            videos = self._changed('videos', dm.iter_records(dm.videos_file), marks, new_marks)
+            # 부른 기록은 date가 방송 날짜라 변경 시각이 될 수 없으므로 이미 옮긴 ID인지로 고른다
+            performances = [record for record in dm.iter_performance_records() if _source_id(record) not in migrated]
+
+        report: Dict[str, dict] = {}
+        try:
+            with self._timed(report, 'artists', len(artists)):
+                self._upsert_named(Artist, artists)
+            with self._timed(report, 'utaites', len(utaites)):
+                self._upsert_named(Utaite, utaites)
+            with self._timed(report, 'song_masters', len(songs)):
+                self._upsert_songs(songs)
+            with self._timed(report, 'videos', len(videos)):
+                self._upsert_videos(videos)
+            with self._timed(report, 'performances', len(performances)):
+                report['performances']['inserted'] = self._sync_performances(performances)
+
+            if new_marks:
+                statement = pg_insert(sync_state).values([
+                    {'entity': entity, 'high_water_mark': mark} for entity, mark in new_marks.items()
+                ])
+                self.db.execute(statement.on_conflict_do_update(
+                    index_elements=['entity'],
+                    set_={'high_water_mark': statement.excluded.high_water_mark, 'synced_at': func.now()}
+                ))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self._log_report(report)
+        return report
+
+    def _changed(self, entity: str, records: Iterable[dict], marks: Dict[str, datetime],
+                 new_marks: Dict[str, datetime]) -> List[dict]:
+        """수위 - overlap 이후(경계 포함) 바뀐 레코드 - 변경 시각이 없는 레코드는 첫 동기화에서만 포함"""
+        mark = marks.get(entity)
+        since = mark - self.overlap if mark is not None else None
+        latest = mark
+        changed = []
+        for record in records:
+            stamp = record_stamp(record)
+            if stamp is None:
+                if mark is None:
+                    changed.append(record)
+                continue
+            if since is None or stamp >= since:
+                changed.append(record)
+            if latest is None or stamp > latest:
+                latest = stamp
+        if latest is not None:
+            new_marks[entity] = latest
+        return changed
+
+    def _upsert_named(self, model, records: List[dict]):
+        """아티스트/우타이테: 원어 이름 기준 upsert (다국어 이름이 실제로 바뀐 행만 UPDATE)"""
+        # 한 문장 안에서 같은 키가 두 번 갱신되면 ON CONFLICT DO UPDATE가 실패하므로 키로 중복 제거 (뒤 레코드 우선)
+        rows = list({
+            record['names']['original']: {'name': record['names']['original'], **_localized(record['names'], 'name')}
+            for record in records if record.get('names', {}).get('original')
+        }.values())
+        columns = [f"name_{language}" for language in LANGUAGES]
+        for chunk in _chunks(rows, BULK_CHUNK_SIZE):
+            statement = pg_insert(model).values(chunk)
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=['name'],
+                set_={column: statement.excluded[column] for column in columns},
+                where=or_(*[model.__table__.c[column].is_distinct_from(statement.excluded[column]) for column in columns])
+            ))
+
+    def _upsert_videos(self, records: List[dict]):
+        """비디오: 유튜브 비디오 ID 기준 upsert"""
+        rows = list({
+            record['id']: {'video_id': record['id'], 'title': record.get('title', ''), 'channel': record.get('channel', ''),
+                           'thumbnail_url': record.get('thumbnail_url', '')}
+            for record in records
+        }.values())
+        columns = ['title', 'channel', 'thumbnail_url']
+        for chunk in _chunks(rows, BULK_CHUNK_SIZE):
+            statement = pg_insert(Video).values(chunk)
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=['video_id'],
+                set_={column: statement.excluded[column] for column in columns},
+                where=or_(*[Video.__table__.c[column].is_distinct_from(statement.excluded[column]) for column in columns])
+            ))
+
+    def _upsert_songs(self, records: List[dict]):
+        """곡: (원어 제목, 아티스트 ID) 자연 키 기준 upsert"""
+        songs: Dict[tuple, dict] = {}
+        for record in records:
+            title = record.get('titles', {}).get('original')
+            artist_name = (record.get('artist') or {}).get('original')
+            if title and artist_name:
+                songs[(title, artist_name)] = record
+        if not songs:
+            return
+
+        missing_artists = [{'name': name} for name in {artist for _, artist in songs} if name not in self.artist_map]
+        self.artist_map.update(self._bulk_insert_by_key(Artist, Artist.name, missing_artists))
+        keys = {(title, self.artist_map[artist_name]): (title, artist_name) for title, artist_name in songs}
+
+        rows = []
+        for (title, artist_id), source_key in keys.items():
+            record = songs[source_key]
+            rows.append({
+                'title': title, 'artist_id': artist_id, **_localized(record.get('titles', {}), 'title'),
+                'tags': record.get('tags') or [], 'album_art_url': record.get('album_art_url')
+            })
+
+        table = SongMaster.__table__
+        columns = ['title_korean', 'title_english', 'title_romanized', 'tags', 'album_art_url']
+        for chunk in _chunks(rows, BULK_CHUNK_SIZE):
+            statement = pg_insert(SongMaster).values(chunk)
+            values = {column: statement.excluded[column] for column in columns}
+            # JSON에 앨범아트가 없으면 DB 값 유지
+            values['album_art_url'] = func.coalesce(statement.excluded.album_art_url, table.c.album_art_url)
+            self.db.execute(statement.on_conflict_do_update(
+                constraint='uq_song_masters_title_artist',
+                set_=values,
+                where=or_(*[table.c[column].is_distinct_from(values[column]) for column in columns])
+            ))
+
+    def _sync_performances(self, records: List[dict]) -> int:
+        """부른 기록: 외래 키를 테이블 단위로 해석해 없는 기록만 COPY로 추가하고 체크포인트에도 기록"""
+        if not records:
+            return 0
+        stage = self.stage_bulk(records)
+        self.load_master_tables(stage, {})
+        inserted = self._copy_performances(stage['performances'])
+        checkpoints = [{'source_id': item['source_id'], 'chunk': -1} for item in stage['performances']]
+        for chunk in _chunks(checkpoints, BULK_CHUNK_SIZE):
+            self.db.execute(pg_insert(migration_checkpoints).values(chunk).on_conflict_do_nothing(index_elements=['source_id']))
+        return inserted
+
+def main():
+    """증분 동기화 실행"""
+    parser = argparse.ArgumentParser(description="JSON 저장소의 변경분만 PostgreSQL에 동기화")
+    parser.add_argument("--data-dir", default="data", help="데이터 디렉토리")
+    parser.add_argument("--full", action="store_true", help="수위/체크포인트를 무시하고 전체 레코드를 upsert")
+    parser.add_argument("--overlap", type=float, default=DEFAULT_OVERLAP_SECONDS,
+                        help=f"수위에서 빼고 다시 읽을 구간 (초, 기본 {DEFAULT_OVERLAP_SECONDS})")
+    args = parser.parse_args()
+
+    syncer = DeltaSyncer(args.data_dir, full=args.full, overlap=args.overlap)
+    try:
+        syncer.sync()
+        logger.info("✅ 증분 동기화 완료")
+        return 0
+    except Exception as e:
+        logger.error(f"증분 동기화 실패: {e}")
+        return 1
+    finally:
+        syncer.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+JSON 저장소 데이터 검증 스크립트
+DATA_TRUSTED_LOAD=true로 검증 없이 읽는 서비스나 손으로 고쳤거나 외부에서 가져온 파일은 이 스크립트로 전체 검증한다
+"""
+
+import argparse
+import logging
+import sys
+from data_manager import DataManager
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def main():
+    """데이터 검증 실행"""
+    parser = argparse.ArgumentParser(description="데이터 파일 Pydantic 전체 검증")
+    parser.add_argument("--data-dir", default="data", help="데이터 디렉토리")
+    args = parser.parse_args()
+
+    errors = DataManager(args.data_dir).validate_data()
+
+    for item in errors:
+        location = item['file'] if item['index'] is None else f"{item['file']}[{item['index']}] ({item['id']})"
+        logger.error(f"{location}: {item['error']}")
+
+    if not errors:
+        logger.info("✅ 데이터 검증 통과")
+        return 0
+
+    logger.info(f"검증 실패 {len(errors)}건")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+JSON 저장소 통계 검증 스크립트
+저장 시에는 통계를 변화량으로만 갱신하므로, 전체 재계산 결과와 어긋난 값(drift)을 확인한다
+"""
+
+import argparse
+import logging
+import sys
+from data_manager import DataManager
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def main():
+    """통계 검증 실행"""
+    parser = argparse.ArgumentParser(description="우타이테/곡/아티스트 통계 검증")
+    parser.add_argument("--data-dir", default="data", help="데이터 디렉토리")
+    parser.add_argument("--fix", action="store_true", help="어긋난 통계를 재계산 값으로 수정")
+    args = parser.parse_args()
+
+    manager = DataManager(args.data_dir)
+    drift = manager.verify_statistics(fix=args.fix)
+
+    for item in drift:
+        logger.warning(f"{item['entity']} {item['id']} {item['field']}: 저장값={item['stored']} 재계산값={item['expected']}")
+
+    if not drift:
+        logger.info("✅ 통계 불일치 없음")
+        return 0
+
+    logger.info(f"통계 불일치 {len(drift)}건" + (" 수정 완료" if args.fix else " (--fix로 수정 가능)"))
+    return 0 if args.fix else 1
+
+if __name__ == "__main__":
+    sys.exit(main())